@@ -26,8 +26,8 @@ bl_info = {
 }
 
 
-from . import operators, ui, keymaps, prefs
-modules = (operators, ui, keymaps, prefs)
+from . import caches, group_index, selection, operators, ui, keymaps, prefs
+modules = (caches, group_index, selection, operators, ui, keymaps, prefs)
 
 
 def register():
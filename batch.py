@@ -0,0 +1,364 @@
+import bpy
+
+import numpy as np
+import fnmatch
+import re
+from collections import Counter
+
+from . import caches, interface_index, sync, utils
+
+
+if bpy.app.version >= (4, 2, 0):
+    color_tag_items = (
+        ('ANY', "Any", "Don't filter by color tag"),
+        *((i.identifier, i.name, i.description) for i in bpy.types.NodeTree.bl_rna.properties["color_tag"].enum_items),
+    )
+else:
+    color_tag_items = (
+        ('ANY', "Any", "Don't filter by color tag"),
+    )
+
+
+tree_type_items = (
+    ('SAME', "Same as Source", "Only include groups of the same type as the source group"),
+    ('ANY', "Any", "Include groups of every type"),
+    ('GeometryNodeTree', "Geometry Nodes", ""),
+    ('ShaderNodeTree', "Shader", ""),
+    ('CompositorNodeTree', "Compositor", ""),
+    ('TextureNodeTree', "Texture", ""),
+)
+
+
+in_out_items = (
+    ('ANY', "Any", "Include both inputs and outputs"),
+    ('INPUT', "Inputs", "Only include inputs"),
+    ('OUTPUT', "Outputs", "Only include outputs"),
+)
+
+
+socket_type_items = (
+    ('ANY', "Any", "Include sockets of every type"),
+    ('NodeSocketFloat', "Float", ""),
+    ('NodeSocketInt', "Integer", ""),
+    ('NodeSocketBool', "Boolean", ""),
+    ('NodeSocketVector', "Vector", ""),
+    ('NodeSocketColor', "Color", ""),
+    ('NodeSocketRotation', "Rotation", ""),
+    ('NodeSocketMatrix', "Matrix", ""),
+    ('NodeSocketString', "String", ""),
+    ('NodeSocketMenu', "Menu", ""),
+    ('NodeSocketObject', "Object", ""),
+    ('NodeSocketCollection', "Collection", ""),
+    ('NodeSocketImage', "Image", ""),
+    ('NodeSocketMaterial', "Material", ""),
+    ('NodeSocketTexture', "Texture", ""),
+    ('NodeSocketGeometry', "Geometry", ""),
+    ('NodeSocketShader', "Shader", ""),
+)
+
+
+socket_prop_items = (
+    ('default_value', "Default Value", ""),
+    ('min_value', "Min", ""),
+    ('max_value', "Max", ""),
+    ('subtype', "Subtype", ""),
+    ('hide_value', "Hide Value", ""),
+    ('hide_in_modifier', "Hide in Modifier", ""),
+)
+
+
+asset_status_items = (
+    ('ANY', "Any", "Include both assets and regular groups"),
+    ('ASSET', "Assets", "Only include groups marked as assets"),
+    ('NOT_ASSET', "Not Assets", "Only include groups that aren't marked as assets"),
+)
+
+
+def prop_owner(tree, prop):
+    if prop == "description" and (tree.asset_data is not None):
+        return tree.asset_data
+    else:
+        return tree
+
+
+def fetch_prop_values(tree, prop_names):
+    return tuple(getattr(prop_owner(tree, prop), prop) for prop in prop_names)
+
+
+def set_prop_values(tree, prop_names, prop_values):
+    changed_props = []
+
+    for prop, prop_value in zip(prop_names, prop_values):
+        owner = prop_owner(tree, prop)
+
+        # Flags such as "is_modifier" only exist on some tree types
+        if not hasattr(owner, prop):
+            continue
+
+        # Writing a value tags the tree for an update even when it stays the same
+        if getattr(owner, prop) != prop_value:
+            setattr(owner, prop, prop_value)
+            changed_props.append(prop)
+
+    return changed_props
+
+
+def name_matcher(pattern, use_regex=False, case_sensitive=True):
+    if not pattern:
+        return lambda _name: True
+
+    if use_regex:
+        regex = re.compile(pattern, 0 if case_sensitive else re.IGNORECASE)
+        return lambda name: regex.search(name) is not None
+
+    if case_sensitive:
+        return lambda name: fnmatch.fnmatchcase(name, pattern)
+    else:
+        pattern = pattern.lower()
+        return lambda name: fnmatch.fnmatchcase(name.lower(), pattern)
+
+
+def filter_node_groups(groups, *, tree_type='ANY', name_pattern="", use_regex=False, asset_status='ANY', color_tag='ANY'):
+    """
+    Yields the groups that pass every given filter.
+    The name pattern is a glob (e.g. "Utility*") unless `use_regex` is enabled.
+    """
+
+    match_name = name_matcher(name_pattern, use_regex)
+
+    for tree in groups:
+        if tree_type != 'ANY' and tree.bl_idname != tree_type:
+            continue
+
+        if asset_status == 'ASSET' and tree.asset_data is None:
+            continue
+
+        if asset_status == 'NOT_ASSET' and tree.asset_data is not None:
+            continue
+
+        if color_tag != 'ANY' and getattr(tree, "color_tag", None) != color_tag:
+            continue
+
+        if not match_name(tree.name):
+            continue
+
+        yield tree
+
+
+def copy_properties(source, targets, prop_names):
+    """
+    Copies the given properties from the source group onto every target, in a single pass.
+    Targets are deduplicated and only properties whose values differ get written.
+
+    Returns:
+        The number of groups that changed and a Counter of changes per property
+    """
+
+    prop_values = fetch_prop_values(source, prop_names)
+    prop_counts = Counter()
+    changed_groups = 0
+    visited = {source.as_pointer()}
+
+    for tree in targets:
+        key = tree.as_pointer()
+        if key in visited or not utils.is_tree_editable(tree):
+            continue
+
+        visited.add(key)
+        changes = set_prop_values(tree, prop_names, prop_values)
+
+        if changes:
+            changed_groups += 1
+            prop_counts.update(changes)
+
+    return changed_groups, prop_counts
+
+
+def format_counts(prop_counts):
+    return ", ".join(f"{prop} ({count})" for prop, count in prop_counts.most_common())
+
+
+def copy_to_matching_groups(source, prop_names, **filters):
+    """
+    Copies properties from the source group onto every group in `bpy.data.node_groups`
+    that passes the given filters (see `filter_node_groups`).
+    Meant to be usable from scripts, including ones run with `blender -b`.
+    """
+
+    if filters.get("tree_type", 'ANY') == 'SAME':
+        filters["tree_type"] = source.bl_idname
+
+    targets = filter_node_groups(bpy.data.node_groups, **filters)
+    return copy_properties(source, targets, prop_names)
+
+
+socket_name_indices = caches.TreeCache(maxsize=32)
+
+
+def socket_name_index(tree):
+    """
+    Returns the sockets of the tree's interface keyed on their name, built once per interface change
+    """
+
+    index = socket_name_indices.get(tree)
+
+    if index is None:
+        index = {}
+        for item in tree.interface.items_tree:
+            if item.item_type == 'SOCKET':
+                index.setdefault(item.name, []).append(item)
+
+        socket_name_indices.set(tree, index)
+
+    return index
+
+
+def panel_content(tree, panel_name):
+    snapshot = interface_index.fetch_snapshot(tree)
+    content = set()
+
+    for panel in snapshot.panels():
+        if panel.item.name == panel_name:
+            content.update(e.item.as_pointer() for e in snapshot.order[panel.enter + 1:panel.exit + 1])
+
+    return content
+
+
+def find_sockets(tree, *, name_pattern="", use_regex=False, socket_type='ANY', in_out='ANY', panel_name=""):
+    """
+    Returns the sockets of the tree that pass every given filter.
+    Names are matched once per distinct name, using the tree's name index.
+    The panel filter includes sockets in nested panels.
+    """
+
+    match_name = name_matcher(name_pattern, use_regex)
+    inside_panel = panel_content(tree, panel_name) if panel_name else None
+    sockets = []
+
+    for name, items in socket_name_index(tree).items():
+        if not match_name(name):
+            continue
+
+        for item in items:
+            if socket_type != 'ANY' and item.socket_type != socket_type:
+                continue
+
+            if in_out != 'ANY' and item.in_out != in_out:
+                continue
+
+            if inside_panel is not None and item.as_pointer() not in inside_panel:
+                continue
+
+            sockets.append(item)
+
+    return sockets
+
+
+def socket_prop_type(item, prop):
+    """
+    Returns the kind of value a socket property holds ('BOOLEAN', 'INT', 'FLOAT', 'VECTOR', 'ENUM' or 'STRING'),
+    or None when the socket doesn't have it
+    """
+
+    rna_prop = item.bl_rna.properties.get(prop)
+    if rna_prop is None:
+        return None
+
+    if rna_prop.type in {'FLOAT', 'INT'} and getattr(rna_prop, "is_array", False):
+        return 'VECTOR'
+
+    return rna_prop.type
+
+
+def coerce_socket_value(item, prop, values):
+    """
+    Picks the value matching the type of the socket property from a dict of values per kind,
+    e.g. {'FLOAT': 1.0, 'BOOLEAN': True, 'VECTOR': (0.0, 0.0, 0.0, 0.0), 'STRING': ""}
+    """
+
+    prop_type = socket_prop_type(item, prop)
+
+    if prop_type == 'INT':
+        return round(values['FLOAT'])
+    elif prop_type == 'VECTOR':
+        return tuple(values['VECTOR'])[:len(getattr(item, prop))]
+    elif prop_type in {'ENUM', 'STRING'}:
+        return values['STRING']
+    else:
+        return values.get(prop_type)
+
+
+def set_socket_values(items, prop, values):
+    """
+    Writes the property onto every socket in a single pass, skipping sockets that don't have it
+    and sockets whose value is already the same
+
+    Returns:
+        The number of sockets that changed and the number of sockets the value couldn't be set on
+    """
+
+    changed = 0
+    failed = 0
+
+    for item in items:
+        value = coerce_socket_value(item, prop, values)
+        if value is None:
+            failed += 1
+            continue
+
+        if sync.values_equal(getattr(item, prop), value):
+            continue
+
+        try:
+            setattr(item, prop, value)
+        except (AttributeError, TypeError, ValueError):
+            # Subtypes that don't exist for this socket type, or read-only properties
+            failed += 1
+            continue
+
+        changed += 1
+
+    return changed, failed
+
+
+def read_node_array(nodes, attr, dtype):
+    values = np.empty(len(nodes), dtype=dtype)
+    nodes.foreach_get(attr, values)
+    return values
+
+
+def fetch_group_nodes(nodes, selected_only=False):
+    """
+    Returns the indices of every group node in `nodes` (as an array usable with `foreach_get` data),
+    along with the node tree each of them uses
+    """
+
+    # Looking nodes up by index walks the whole list, so nodes are visited in a single pass,
+    # with the selection read in one call so unselected nodes are skipped right away
+    selected = read_node_array(nodes, "select", bool) if selected_only else None
+
+    indices = []
+    trees = []
+
+    for i, node in enumerate(nodes):
+        if selected is not None and not selected[i]:
+            continue
+
+        tree = getattr(node, "node_tree", None)
+        if tree is not None:
+            indices.append(i)
+            trees.append(tree)
+
+    return np.array(indices, dtype=np.int64), trees
+
+
+def fetch_default_widths(trees):
+    # Instances of the same group share one lookup of its default width
+    default_widths = {}
+
+    for tree in trees:
+        key = tree.as_pointer()
+        if key not in default_widths:
+            default_widths[key] = tree.default_group_node_width
+
+    return np.fromiter((default_widths[t.as_pointer()] for t in trees), dtype=np.float32, count=len(trees))
@@ -0,0 +1,111 @@
+import bpy
+from bpy.app.handlers import persistent
+
+from collections import OrderedDict
+
+
+# Number of observed interface changes per node tree, keyed on `session_uid`.
+# Cached data derived from an interface is stamped with this value and
+# treated as stale as soon as it no longer matches.
+interface_generations = {}
+registered_caches = []
+
+
+def interface_generation(tree):
+    return interface_generations.get(tree.session_uid, 0)
+
+
+def tag_interface_changed(tree):
+    uid = tree.session_uid
+    interface_generations[uid] = interface_generations.get(uid, 0) + 1
+
+
+def interface_stamp(tree):
+    # The item count is cheap to read and catches most changes made
+    # outside of this addon that never reach the depsgraph handler
+    return (interface_generation(tree), len(tree.interface.items_tree))
+
+
+class TreeCache:
+    def __init__(self, maxsize=32):
+        """
+        A bounded cache that stores one value per node tree.
+        Entries are invalidated when the interface of their tree changes,
+        and the least recently used trees are evicted first.
+
+        Args:
+            maxsize : Maximum number of trees that are kept in the cache
+        """
+
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        registered_caches.append(self)
+
+    def get(self, tree, default=None):
+        uid = tree.session_uid
+        entry = self.entries.get(uid)
+
+        if entry is None or entry[0] != interface_stamp(tree):
+            return default
+
+        self.entries.move_to_end(uid)
+        return entry[1]
+
+    def set(self, tree, value):
+        uid = tree.session_uid
+        self.entries[uid] = (interface_stamp(tree), value)
+        self.entries.move_to_end(uid)
+
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+        return value
+
+    def discard(self, tree):
+        self.entries.pop(tree.session_uid, None)
+
+    def clear(self):
+        self.entries.clear()
+
+
+def clear_all():
+    interface_generations.clear()
+
+    for cache in registered_caches:
+        cache.clear()
+
+
+@persistent
+def on_depsgraph_update(_scene, depsgraph):
+    for update in depsgraph.updates:
+        if isinstance(update.id, bpy.types.NodeTree):
+            tag_interface_changed(update.id.original)
+
+
+# Undo and file loading reallocate every ID,
+# which leaves any cached RNA struct pointing to freed memory
+@persistent
+def on_data_reloaded(*_):
+    clear_all()
+
+
+handlers = (
+    (bpy.app.handlers.depsgraph_update_post, on_depsgraph_update),
+    (bpy.app.handlers.undo_post, on_data_reloaded),
+    (bpy.app.handlers.redo_post, on_data_reloaded),
+    (bpy.app.handlers.load_post, on_data_reloaded),
+)
+
+
+def register():
+    for handler_list, handler in handlers:
+        if handler not in handler_list:
+            handler_list.append(handler)
+
+
+def unregister():
+    for handler_list, handler in handlers:
+        if handler in handler_list:
+            handler_list.remove(handler)
+
+    clear_all()
@@ -0,0 +1,316 @@
+"""
+Applies group edits to every .blend file in a directory, from the command line.
+
+The controller finds the files and runs one background Blender process per file,
+several at a time, each of which applies the edits and saves the file if anything changed:
+
+    blender -b --factory-startup -P group_edit_tools/cli.py -- DIRECTORY [options]
+
+    --filter "Utility*"               Only edit groups whose name matches (glob, or regex with --regex)
+    --tree-type GeometryNodeTree      Only edit groups of this type
+    --set color_tag=COLOR_03          Assign a group property (can be repeated)
+    --copy-from "Base" --props a,b    Copy properties from a group in the same file
+    --reset-instance-widths           Reset group nodes using the edited groups to their default width
+    --workers 8                       Number of files processed at once
+    --dry-run                         Report the changes without saving
+
+The controller only needs the standard library, so it can also be run with a regular Python
+interpreter by passing the Blender executable with --blender.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from multiprocessing.pool import ThreadPool
+
+
+result_prefix = "GROUP_EDIT_TOOLS_RESULT:"
+package_dir = os.path.dirname(os.path.abspath(__file__))
+
+
+def script_args(argv=None):
+    if argv is None:
+        argv = sys.argv
+
+    # Blender passes everything after "--" through to scripts
+    return argv[argv.index("--") + 1:] if "--" in argv else argv[1:]
+
+
+def default_blender_path():
+    try:
+        import bpy
+    except ImportError:
+        return "blender"
+
+    return bpy.app.binary_path or "blender"
+
+
+def parse_assignment(text):
+    prop, separator, value = text.partition("=")
+    if not separator or not prop:
+        raise argparse.ArgumentTypeError(f"Expected PROPERTY=VALUE, got \"{text}\"")
+
+    return prop.strip(), value.strip()
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="group_edit_tools.cli",
+        description="Apply group edits to every .blend file in a directory",
+    )
+
+    parser.add_argument("directory", help="Directory searched (recursively) for .blend files")
+    parser.add_argument("--filter", dest="name_pattern", default="", help="Only edit groups whose name matches this pattern")
+    parser.add_argument("--regex", dest="use_regex", action="store_true", help="Treat the filter as a regular expression")
+    parser.add_argument("--tree-type", default="ANY", help="Only edit groups of this node tree type")
+    parser.add_argument("--asset-status", default="ANY", choices=("ANY", "ASSET", "NOT_ASSET"))
+    parser.add_argument("--color-tag", default="ANY", help="Only edit groups with this color tag")
+    parser.add_argument("--set", dest="assignments", action="append", default=[], type=parse_assignment, metavar="PROPERTY=VALUE")
+    parser.add_argument("--copy-from", dest="source_group", default="", help="Copy properties from this group in each file")
+    parser.add_argument("--props", default="", help="Comma separated properties copied with --copy-from")
+    parser.add_argument("--reset-instance-widths", action="store_true", help="Reset instances of edited groups to their default width")
+    parser.add_argument("--workers", type=int, default=max(1, (os.cpu_count() or 2) // 2))
+    parser.add_argument("--blender", default=None, help="Blender executable used for the workers")
+    parser.add_argument("--timeout", type=float, default=600, help="Seconds before a file is given up on")
+    parser.add_argument("--dry-run", action="store_true", help="Report changes without saving any file")
+
+    return parser
+
+
+def find_blend_files(directory):
+    for root, _dirs, files in os.walk(directory):
+        for name in sorted(files):
+            # Backups such as ".blend1" are skipped by only matching the exact extension
+            if name.endswith(".blend"):
+                yield os.path.join(root, name)
+
+
+def worker_options(options):
+    keys = (
+        "name_pattern",
+        "use_regex",
+        "tree_type",
+        "asset_status",
+        "color_tag",
+        "assignments",
+        "source_group",
+        "props",
+        "reset_instance_widths",
+        "dry_run",
+    )
+
+    return {key: getattr(options, key) for key in keys}
+
+
+def worker_command(blender, filepath, options):
+    parent_dir, package_name = os.path.split(package_dir)
+    expression = (
+        f"import sys; sys.path.insert(0, {parent_dir!r}); "
+        f"import importlib; importlib.import_module({package_name + '.cli'!r}).worker_main()"
+    )
+
+    return [
+        blender, "-b", "--factory-startup", filepath,
+        "--python-exit-code", "1",
+        "--python-expr", expression,
+        "--", json.dumps(worker_options(options)),
+    ]
+
+
+def process_file(args):
+    blender, filepath, options = args
+    start_time = time.perf_counter()
+
+    try:
+        process = subprocess.run(
+            worker_command(blender, filepath, options),
+            capture_output=True,
+            text=True,
+            timeout=options.timeout,
+        )
+    except subprocess.TimeoutExpired:
+        return {"file": filepath, "error": "Timed out", "time": time.perf_counter() - start_time}
+
+    result = None
+    for line in process.stdout.splitlines():
+        if line.startswith(result_prefix):
+            result = json.loads(line[len(result_prefix):])
+
+    if result is None:
+        error_lines = (process.stderr or process.stdout).strip().splitlines()
+        result = {"error": error_lines[-1] if error_lines else f"Exited with code {process.returncode}"}
+
+    result["file"] = filepath
+    result["time"] = time.perf_counter() - start_time
+    return result
+
+
+def format_result(result, directory):
+    filepath = os.path.relpath(result["file"], directory)
+
+    if "error" in result:
+        return f"[error] {filepath}: {result['error']} ({result['time']:.2f} s)"
+
+    changes = ", ".join(f"{prop} ({count})" for prop, count in result["props"].items())
+    status = "saved" if result["saved"] else ("changed" if result["groups"] else "unchanged")
+    summary = f"{result['groups']} groups" + (f": {changes}" if changes else "")
+
+    if result.get("instances"):
+        summary += f", {result['instances']} instance widths"
+
+    return f"[{status}] {filepath}: {summary} ({result['time']:.2f} s)"
+
+
+def run(options):
+    blender = options.blender or default_blender_path()
+    files = list(find_blend_files(options.directory))
+
+    if not files:
+        print(f"No .blend files found in \"{options.directory}\"")
+        return 1
+
+    start_time = time.perf_counter()
+    failed = 0
+    changed = 0
+
+    # The workers are separate Blender processes, so threads are enough to keep them busy,
+    # and unlike forked processes they're safe to start from inside of Blender
+    with ThreadPool(max(1, options.workers)) as pool:
+        for result in pool.imap_unordered(process_file, ((blender, f, options) for f in files)):
+            print(format_result(result, options.directory), flush=True)
+
+            failed += "error" in result
+            changed += bool(result.get("groups") or result.get("instances"))
+
+    print(
+        f"Processed {len(files)} files in {time.perf_counter() - start_time:.2f} s: "
+        f"{changed} changed, {failed} failed"
+    )
+
+    return 1 if failed else 0
+
+
+true_values = {"1", "true", "yes", "on"}
+false_values = {"0", "false", "no", "off"}
+
+
+def coerce_value(owner, prop, text):
+    # Flags such as "is_modifier" are only defined on some tree types,
+    # so the type of the value is looked up on the tree that receives it
+    rna_prop = owner.bl_rna.properties.get(prop)
+
+    # Properties missing from the tree are skipped when setting values
+    if rna_prop is None:
+        return text
+
+    prop_type = rna_prop.type
+
+    try:
+        if prop_type == 'BOOLEAN':
+            if text.lower() not in (true_values | false_values):
+                raise ValueError(text)
+
+            return text.lower() in true_values
+        elif prop_type == 'INT':
+            return int(text)
+        elif prop_type == 'FLOAT':
+            return float(text)
+        else:
+            return text
+    except ValueError:
+        raise ValueError(f"Invalid value \"{text}\" for \"{prop}\"") from None
+
+
+def apply_edits(options):
+    """
+    Applies the edits to the groups of the currently open file
+
+    Returns:
+        The number of groups that changed, the number of changes per property
+        and the number of group nodes whose width was reset
+    """
+
+    import bpy
+    from collections import Counter
+    from . import batch, group_index, utils
+
+    filters = {key: options[key] for key in ("name_pattern", "use_regex", "tree_type", "asset_status", "color_tag")}
+    groups = [g for g in batch.filter_node_groups(bpy.data.node_groups, **filters) if utils.is_tree_editable(g)]
+
+    changed_groups = set()
+    prop_counts = Counter()
+
+    if options["source_group"]:
+        source = bpy.data.node_groups.get(options["source_group"])
+
+        if source is not None:
+            prop_names = tuple(p.strip() for p in options["props"].split(",") if p.strip())
+
+            for tree in groups:
+                if tree != source and tree.bl_idname == source.bl_idname:
+                    changes = batch.set_prop_values(tree, prop_names, batch.fetch_prop_values(source, prop_names))
+
+                    if changes:
+                        changed_groups.add(tree.name)
+                        prop_counts.update(changes)
+
+    if options["assignments"]:
+        prop_names = tuple(prop for prop, _ in options["assignments"])
+
+        for tree in groups:
+            prop_values = tuple(coerce_value(batch.prop_owner(tree, prop), prop, value) for prop, value in options["assignments"])
+            changes = batch.set_prop_values(tree, prop_names, prop_values)
+
+            if changes:
+                changed_groups.add(tree.name)
+                prop_counts.update(changes)
+
+    instance_count = 0
+    if options["reset_instance_widths"] and bpy.app.version >= (4, 3, 0):
+        for tree in groups:
+            instance_count += group_index.set_instance_widths(tree)
+
+    return len(changed_groups), prop_counts, instance_count
+
+
+def worker_main():
+    import bpy
+
+    options = json.loads(script_args()[0])
+
+    # A value that doesn't fit a property fails this file only, without saving any of its changes
+    try:
+        changed_groups, prop_counts, instance_count = apply_edits(options)
+    except (TypeError, ValueError) as error:
+        print(result_prefix + json.dumps({"error": str(error)}), flush=True)
+        return
+
+    saved = False
+    if (changed_groups or instance_count) and not options["dry_run"]:
+        bpy.ops.wm.save_mainfile()
+        saved = True
+
+    result = {
+        "groups": changed_groups,
+        "props": dict(prop_counts.most_common()),
+        "instances": instance_count,
+        "saved": saved,
+    }
+
+    print(result_prefix + json.dumps(result), flush=True)
+
+
+def main(argv=None):
+    options = build_parser().parse_args(script_args(argv))
+    return run(options)
+
+
+if __name__ == "__main__":
+    exit_code = main()
+
+    # Only exit when running as a plain Python script, Blender exits on its own in background mode
+    if "bpy" not in sys.modules:
+        sys.exit(exit_code)
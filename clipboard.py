@@ -0,0 +1,206 @@
+import io
+import json
+
+from . import interface_index, sync, utils
+
+
+# Interface items are written as JSON lines: a header line followed by one line per item,
+# listed depth-first. Items refer to their parent panel by its line number among the items,
+# and only properties that exist on the item are written, so that each line stays short.
+format_id = "group_edit_tools.interface"
+format_version = 1
+
+
+class ClipboardFormatError(ValueError):
+    pass
+
+
+def encode_value(value):
+    if isinstance(value, (bool, int, float, str)):
+        return value
+
+    # Vectors, colors and rotations
+    if hasattr(value, "__len__"):
+        values = tuple(value)
+        if all(isinstance(v, (bool, int, float)) for v in values):
+            return list(values)
+
+    # Data-blocks (objects, materials, ...) don't carry over between files, so they're left out
+    return None
+
+
+def encode_item(entry, parent_index):
+    item = entry.item
+    record = {"kind": 'PANEL' if entry.is_panel else item.in_out, "parent": parent_index}
+
+    for prop in sync.item_props(item, sync_defaults=True):
+        if hasattr(item, prop):
+            value = encode_value(getattr(item, prop))
+            if value is not None:
+                record[prop] = value
+
+    return record
+
+
+def write_items(stream, tree, entries):
+    """
+    Writes the given interface entries to a text stream, one line at a time
+    """
+
+    header = {"format": format_id, "version": format_version, "tree_type": tree.bl_idname}
+    stream.write(json.dumps(header, separators=(",", ":")))
+
+    indices = {}
+    for entry in entries:
+        indices[entry] = len(indices)
+        record = encode_item(entry, indices.get(entry.parent))
+
+        stream.write("\n")
+        stream.write(json.dumps(record, separators=(",", ":")))
+
+    return len(indices)
+
+
+def read_header(stream):
+    try:
+        header = json.loads(stream.readline())
+    except ValueError:
+        header = None
+
+    if not isinstance(header, dict) or header.get("format") != format_id:
+        raise ClipboardFormatError("Clipboard doesn't contain interface items")
+
+    if header.get("version", 0) > format_version:
+        raise ClipboardFormatError("Interface items were copied with a newer version of this addon")
+
+    return header
+
+
+def read_items(stream):
+    """
+    Yields each item record of a stream written by `write_items`, parsing one line at a time
+    """
+
+    for line_number, line in enumerate(stream, start=2):
+        if not line.strip():
+            continue
+
+        try:
+            record = json.loads(line)
+        except ValueError:
+            raise ClipboardFormatError(f"Invalid item on line {line_number}")
+
+        if not isinstance(record, dict) or "kind" not in record:
+            raise ClipboardFormatError(f"Invalid item on line {line_number}")
+
+        yield record
+
+
+def copied_entries(snapshot, items):
+    # Copying a panel includes everything inside of it
+    for entry in snapshot.outermost(snapshot.entry(i) for i in items):
+        yield from snapshot.order[entry.enter:entry.exit + 1]
+
+
+def copy_items(tree, items):
+    """
+    Encodes the given interface items (and the content of panels) as text
+
+    Returns:
+        The encoded text and the number of items in it
+    """
+
+    snapshot = interface_index.fetch_snapshot(tree, *items)
+    stream = io.StringIO()
+    count = write_items(stream, tree, copied_entries(snapshot, items))
+
+    return stream.getvalue(), count
+
+
+def create_item(transaction, record):
+    kind = record["kind"]
+    name = record.get("name", "Panel" if kind == 'PANEL' else "Socket")
+
+    if kind == 'PANEL':
+        return transaction.new_panel(name)
+    else:
+        return transaction.new_socket(name, socket_type=record.get("socket_type", "NodeSocketFloat"), in_out=kind)
+
+
+def apply_record(item, record, is_nested):
+    for prop, value in record.items():
+        if prop in {"kind", "parent", "name", "socket_type"} or not hasattr(item, prop):
+            continue
+
+        # Toggles copied without their panel become regular sockets
+        if prop == "is_panel_toggle" and not is_nested:
+            continue
+
+        try:
+            setattr(item, prop, value)
+        except (AttributeError, TypeError, ValueError):
+            # Properties that don't apply to this socket type, or this version of Blender
+            pass
+
+
+def paste_items(transaction, tree, text, parent, anchor=None):
+    """
+    Rebuilds interface items from text written by `copy_items` inside of the given panel,
+    right after the anchor item (or at the end of the panel when no anchor is given).
+    Items are created while the text is read, and placed together once everything exists.
+
+    Returns:
+        The pasted items and the number of items that couldn't be created in this tree
+    """
+
+    stream = io.StringIO(text)
+    read_header(stream)
+
+    # The anchor is picked before anything is created, since new items are added at the end of the interface
+    if anchor is None and parent is not None:
+        children = parent.interface_items
+        anchor = children[-1] if len(children) else None
+
+    created = []
+    parents = []
+    skipped = 0
+
+    try:
+        for record in read_items(stream):
+            parent_index = record.get("parent")
+            item_parent = parents[parent_index] if (parent_index is not None and parent_index < len(parents)) else None
+
+            try:
+                item = create_item(transaction, record)
+            except (TypeError, RuntimeError):
+                # Socket types that aren't supported by this tree, the content
+                # of skipped panels ends up in the panel above them instead
+                parents.append(item_parent)
+                skipped += 1
+                continue
+
+            apply_record(item, record, is_nested=(item_parent is not None))
+            created.append((item, item_parent))
+            parents.append(item if item.item_type == 'PANEL' else None)
+    except ClipboardFormatError:
+        for item, _ in reversed(created):
+            transaction.remove(item)
+        raise
+
+    if not created:
+        return [], skipped
+
+    if parent is None:
+        # An empty interface only gets a root panel once its first item is added
+        transaction.flush()
+        parent = utils.find_base_panel(tree)
+
+    layout = {parent.as_pointer(): (parent, [] if anchor is None else [anchor])}
+    for item, item_parent in created:
+        target = parent if (item_parent is None) else item_parent
+        layout.setdefault(target.as_pointer(), (target, []))[1].append(item)
+
+    items = [item for item, _ in created]
+    interface_index.apply_layout(transaction, layout.values(), {i.as_pointer() for i in items})
+
+    return items, skipped
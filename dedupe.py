@@ -0,0 +1,257 @@
+import bpy
+
+import hashlib
+import re
+import time
+from collections import defaultdict
+
+from . import sync, utils
+
+
+# Properties that only affect how nodes are drawn, or that are extracted separately
+skipped_node_props = {
+    "rna_type", "name", "label", "location", "width", "height", "dimensions", "select", "show_options",
+    "show_preview", "show_texture", "hide", "color", "use_custom_color", "parent", "inputs", "outputs",
+    "internal_links", "node_tree", "bl_idname", "bl_label", "bl_description", "bl_icon", "bl_static_type",
+    "bl_width_default", "bl_width_min", "bl_width_max", "bl_height_default", "bl_height_min", "bl_height_max",
+    "type", "is_active_output", "warning_propagation", "location_absolute",
+}
+
+# Properties of nested structs that only affect the layout or the display of the editor
+skipped_struct_props = {
+    "rna_type", "location", "location_absolute", "width", "height", "dimensions",
+    "select", "show_options", "show_preview", "show_texture", "show_expanded",
+}
+
+tree_props = ("color_tag", "description", "is_modifier", "is_tool", "default_group_node_width")
+
+# Nested structs such as color ramps and curve mappings are followed this many levels deep
+max_struct_depth = 3
+
+duplicate_suffix = re.compile(r"\.\d{3,}$")
+
+# Property definitions per node type, since reading them through RNA for every node is slow
+node_prop_cache = {}
+
+
+def node_props(node):
+    props = node_prop_cache.get(node.bl_idname)
+
+    if props is None:
+        props = node_prop_cache[node.bl_idname] = tuple(
+            p.identifier for p in node.bl_rna.properties
+            if p.identifier not in skipped_node_props and not p.identifier.startswith("bl_")
+            )
+
+    return props
+
+
+class GroupExtractor:
+    def __init__(self, tree):
+        """
+        Reads everything that affects the result of a node group into plain Python data
+        (tuples, numbers and strings), so that it can be hashed without access to Blender.
+
+        Node groups used inside of the tree are collected in `group_refs` and referred to
+        by their index, so that nested duplicates compare equal once their own hashes are known.
+        """
+
+        self.group_refs = []
+        self.data = (
+            tree.bl_idname,
+            tuple(self.plain(getattr(tree, p, None)) for p in tree_props),
+            self.extract_interface(tree),
+            self.extract_nodes(tree),
+            self.extract_links(tree),
+        )
+
+    def reference(self, data_id):
+        if isinstance(data_id, bpy.types.NodeTree):
+            self.group_refs.append(data_id.name)
+            return ("GROUP", len(self.group_refs) - 1)
+
+        library = data_id.library.filepath if data_id.library else ""
+        return ("ID", data_id.id_type, data_id.name, library)
+
+    def plain(self, value, depth=max_struct_depth):
+        if value is None or isinstance(value, (bool, int, float, str)):
+            return value
+
+        if isinstance(value, bpy.types.ID):
+            return self.reference(value)
+
+        if isinstance(value, set):
+            return tuple(sorted(value))
+
+        # Nodes pointing at other nodes (such as `paired_output`) are extracted separately,
+        # and only the name of the node they point at is part of the structure
+        if isinstance(value, bpy.types.Node):
+            return ("NODE", value.name)
+
+        if isinstance(value, bpy.types.bpy_struct):
+            return self.plain_struct(value, depth - 1) if depth > 0 else None
+
+        if hasattr(value, "__len__"):
+            return tuple(self.plain(v, depth) for v in value)
+
+        return repr(value)
+
+    def plain_struct(self, struct, depth):
+        values = []
+
+        for prop in struct.bl_rna.properties:
+            identifier = prop.identifier
+            if identifier in skipped_struct_props:
+                continue
+
+            values.append((identifier, self.plain(getattr(struct, identifier, None), depth)))
+
+        return tuple(values)
+
+    def extract_interface(self, tree):
+        items = []
+
+        for item in tree.interface.items_tree:
+            props = sync.item_props(item, sync_defaults=True)
+            items.append((
+                item.item_type,
+                getattr(item, "in_out", None),
+                item.parent.index,
+                tuple(self.plain(getattr(item, p, None)) for p in props if hasattr(item, p)),
+            ))
+
+        return tuple(items)
+
+    def extract_sockets(self, sockets):
+        return tuple(
+            (s.identifier, s.hide_value if hasattr(s, "hide_value") else None,
+             None if s.is_linked else self.plain(getattr(s, "default_value", None)))
+            for s in sockets
+            )
+
+    def extract_nodes(self, tree):
+        nodes = []
+
+        for node in sorted(tree.nodes, key=lambda n: n.name):
+            node_tree = getattr(node, "node_tree", None)
+
+            nodes.append((
+                node.bl_idname,
+                node.name,
+                node.label,
+                node.mute,
+                None if node_tree is None else self.reference(node_tree),
+                tuple((p, self.plain(getattr(node, p, None))) for p in node_props(node)),
+                self.extract_sockets(node.inputs),
+                self.extract_sockets(node.outputs),
+            ))
+
+        return tuple(nodes)
+
+    def extract_links(self, tree):
+        return tuple(sorted(
+            (link.from_node.name, link.from_socket.identifier, link.to_node.name, link.to_socket.identifier, link.is_muted)
+            for link in tree.links
+            ))
+
+
+def structural_hash(data, group_hashes):
+    """
+    Hashes plain data produced by `GroupExtractor`, along with the hashes of the groups it references.
+    Only works on plain data, so it can run outside of Blender (e.g. in a process pool).
+    """
+
+    digest = hashlib.sha1(repr(data).encode())
+
+    for group_hash in group_hashes:
+        digest.update(group_hash.encode())
+
+    return digest.hexdigest()
+
+
+def hash_node_groups(groups):
+    """
+    Returns the structural hash of every given node group, keyed on its name.
+    Nested groups are hashed first, so that trees using different copies of the same group match.
+    """
+
+    extracted = {tree.name: GroupExtractor(tree) for tree in groups}
+    hashes = {}
+    visiting = set()
+
+    def visit(name):
+        if name in hashes:
+            return hashes[name]
+
+        extractor = extracted.get(name)
+
+        # Groups outside of the given ones (and cycles, which Blender shouldn't allow) are referred to by name
+        if extractor is None or name in visiting:
+            return name
+
+        visiting.add(name)
+        group_hashes = [visit(ref) for ref in extractor.group_refs]
+        visiting.discard(name)
+
+        hashes[name] = structural_hash(extractor.data, group_hashes)
+        return hashes[name]
+
+    for name in extracted:
+        visit(name)
+
+    return hashes
+
+
+def survivor_key(tree):
+    # Assets and names without a ".001" style suffix are kept over other copies
+    return (
+        tree.asset_data is None,
+        duplicate_suffix.search(tree.name) is not None,
+        -tree.users,
+        len(tree.name),
+        tree.name,
+    )
+
+
+def find_duplicates(groups=None):
+    """
+    Returns lists of structurally identical node groups, with the group to keep listed first
+    """
+
+    if groups is None:
+        groups = bpy.data.node_groups
+
+    # Linked groups can't be removed or edited, so they're left out
+    groups = [g for g in groups if utils.is_tree_editable(g)]
+    hashes = hash_node_groups(groups)
+
+    matches = defaultdict(list)
+    for tree in groups:
+        matches[hashes[tree.name]].append(tree)
+
+    return [sorted(trees, key=survivor_key) for trees in matches.values() if len(trees) > 1]
+
+
+def merge_duplicates(duplicate_sets):
+    """
+    Remaps every user of each duplicate onto the first group of its set and removes the duplicate
+
+    Returns:
+        The number of removed groups
+    """
+
+    removed = 0
+
+    for survivor, *duplicates in duplicate_sets:
+        for tree in duplicates:
+            tree.user_remap(survivor)
+            bpy.data.node_groups.remove(tree)
+            removed += 1
+
+    return removed
+
+
+def timed(function, *args):
+    start_time = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start_time
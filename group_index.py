@@ -0,0 +1,525 @@
+import bpy
+from bpy.app.handlers import persistent
+
+from collections import deque
+
+from . import caches, utils
+
+
+# Data collections that can hold node trees with group nodes in them,
+# along with the attribute of their embedded node tree (None for node groups themselves)
+owner_sources = {
+    "node_groups": None,
+    "materials": "node_tree",
+    "worlds": "node_tree",
+    "lights": "node_tree",
+    "scenes": "node_tree",
+    "linestyles": "node_tree",
+    "textures": "node_tree",
+}
+
+id_type_sources = {
+    'NODETREE': "node_groups",
+    'MATERIAL': "materials",
+    'WORLD': "worlds",
+    'LIGHT': "lights",
+    'SCENE': "scenes",
+    'LINESTYLE': "linestyles",
+    'TEXTURE': "textures",
+}
+
+
+def owner_tree(data_id, tree_attr):
+    if tree_attr is None:
+        return data_id
+    else:
+        return getattr(data_id, tree_attr, None)
+
+
+def resolve_owner(key):
+    data_attr, name = key
+    data_id = getattr(bpy.data, data_attr).get(name)
+
+    if data_id is None:
+        return None
+
+    return owner_tree(data_id, owner_sources[data_attr])
+
+
+def iter_owners():
+    for data_attr, tree_attr in owner_sources.items():
+        for data_id in getattr(bpy.data, data_attr, ()):
+            tree = owner_tree(data_id, tree_attr)
+
+            # Nodes inside of linked data can't be edited, so they're left out
+            if tree is not None and data_id.library is None:
+                yield (data_attr, data_id.name), tree
+
+
+def data_signature():
+    return tuple(len(getattr(bpy.data, data_attr, ())) for data_attr in owner_sources)
+
+
+class GroupInstanceIndex:
+    def __init__(self):
+        """
+        Maps every node group to the group nodes that use it, across every node tree in the file.
+
+        Owner trees are referenced by data collection and name rather than by RNA struct,
+        so that stale entries can never point to freed memory. Trees reported by the depsgraph
+        are marked dirty and rescanned lazily the next time the index is queried.
+        """
+
+        self.valid = False
+        self.signature = None
+        self.instances = {}
+        self.owner_groups = {}
+        self.dirty = set()
+
+        # Increased whenever a tree starts or stops using a group, so that data derived
+        # from the index can tell whether it's still up to date
+        self.generation = 0
+        caches.registered_caches.append(self)
+
+    def clear(self):
+        self.valid = False
+        self.signature = None
+        self.instances.clear()
+        self.owner_groups.clear()
+        self.dirty.clear()
+        self.generation += 1
+
+    def forget_owner(self, key):
+        if key in self.owner_groups:
+            self.generation += 1
+
+        for group_uid in self.owner_groups.pop(key, ()):
+            owners = self.instances.get(group_uid)
+            if owners is not None:
+                owners.pop(key, None)
+
+    def scan_owner(self, key, tree):
+        groups = {}
+        for node in tree.nodes:
+            group = getattr(node, "node_tree", None)
+            if group is not None:
+                groups.setdefault(group.session_uid, []).append(node.name)
+
+        # Most updates don't add or remove group nodes, and keep the generation as it is
+        generation = self.generation
+        is_unchanged = set(self.owner_groups.get(key, ())) == groups.keys()
+
+        self.forget_owner(key)
+
+        for group_uid, node_names in groups.items():
+            self.instances.setdefault(group_uid, {})[key] = tuple(node_names)
+
+        self.owner_groups[key] = tuple(groups.keys())
+        self.generation = generation if is_unchanged else generation + 1
+
+    def rebuild(self):
+        self.clear()
+
+        for key, tree in iter_owners():
+            self.scan_owner(key, tree)
+
+        self.signature = data_signature()
+        self.valid = True
+
+    def tag_dirty(self, key):
+        self.dirty.add(key)
+
+    def ensure(self):
+        # Adding or removing data doesn't always reach the depsgraph,
+        # comparing the size of each data collection catches those cases
+        if not self.valid or self.signature != data_signature():
+            self.rebuild()
+            return
+
+        while self.dirty:
+            key = self.dirty.pop()
+            tree = resolve_owner(key)
+
+            if tree is None:
+                self.forget_owner(key)
+            else:
+                self.scan_owner(key, tree)
+
+    def lookup_instances(self, group):
+        nodes = []
+
+        for key, node_names in self.instances.get(group.session_uid, {}).items():
+            tree = resolve_owner(key)
+            if tree is None:
+                return None
+
+            for name in node_names:
+                node = tree.nodes.get(name)
+
+                # Renamed nodes or trees can't be found under their old names
+                if node is None or getattr(node, "node_tree", None) != group:
+                    return None
+
+                nodes.append(node)
+
+        return nodes
+
+    def instances_of(self, group):
+        """
+        Yields every group node in the file that uses the given group
+        """
+
+        self.ensure()
+        nodes = self.lookup_instances(group)
+
+        # Something was renamed since the last scan, so the index is rebuilt right away
+        # rather than leaving out instances from this query
+        if nodes is None:
+            self.rebuild()
+            nodes = self.lookup_instances(group) or ()
+
+        yield from nodes
+
+    def users_of(self, group):
+        self.ensure()
+        return tuple(self.instances.get(group.session_uid, {}).keys())
+
+
+instance_index = GroupInstanceIndex()
+
+
+class GroupDependencyGraph:
+    def __init__(self):
+        """
+        The nesting of node groups in the file, with an edge from each group to every group
+        it has a group node of. Built from the cached instance index, and only rebuilt
+        when a tree starts or stops using a group. Linked groups are leaves, since their
+        content isn't scanned.
+
+        Groups are ordered topologically, from the outermost groups to the innermost ones.
+        Groups that are part of a cycle (or inside of one) can't be ordered, and are kept in `cycles` instead.
+        """
+
+        self.generation = None
+        self.names = {}
+        self.children = {}
+        self.parents = {}
+        self.rank = {}
+        self.cycles = set()
+        self.closures = {}
+        caches.registered_caches.append(self)
+
+    def clear(self):
+        self.generation = None
+        self.names.clear()
+        self.children.clear()
+        self.parents.clear()
+        self.rank.clear()
+        self.cycles.clear()
+        self.closures.clear()
+
+    def rebuild(self):
+        self.clear()
+
+        self.names = {g.session_uid: g.name for g in bpy.data.node_groups}
+        uids = {name: uid for uid, name in self.names.items()}
+
+        for (data_attr, name), group_uids in instance_index.owner_groups.items():
+            if data_attr != "node_groups":
+                continue
+
+            uid = uids.get(name)
+
+            # Renamed or removed since the last scan
+            if uid is None:
+                return False
+
+            self.children[uid] = tuple(u for u in group_uids if u in self.names)
+
+            for child in self.children[uid]:
+                self.parents.setdefault(child, []).append(uid)
+
+        # Kahn's algorithm, starting from the groups that aren't used by any other group
+        in_degrees = {uid: len(self.parents.get(uid, ())) for uid in self.names}
+        queue = deque(uid for uid, degree in in_degrees.items() if degree == 0)
+
+        while queue:
+            uid = queue.popleft()
+            self.rank[uid] = len(self.rank)
+
+            for child in self.children.get(uid, ()):
+                in_degrees[child] -= 1
+                if in_degrees[child] == 0:
+                    queue.append(child)
+
+        self.cycles = {uid for uid in self.names if uid not in self.rank}
+        self.generation = instance_index.generation
+        return True
+
+    def ensure(self):
+        instance_index.ensure()
+
+        if self.generation == instance_index.generation and len(self.names) == len(bpy.data.node_groups):
+            return
+
+        if not self.rebuild():
+            # Stale names in the instance index are fixed by rescanning the whole file once
+            instance_index.rebuild()
+            self.rebuild()
+
+    def resolve(self, uid):
+        group = bpy.data.node_groups.get(self.names.get(uid, ""))
+
+        if group is None or group.session_uid != uid:
+            # Renaming a group doesn't change the graph, only the names need to be looked up again
+            self.names = {g.session_uid: g.name for g in bpy.data.node_groups}
+            group = bpy.data.node_groups.get(self.names.get(uid, ""))
+
+        return group
+
+    def closure(self, uid, direction):
+        key = (uid, direction)
+        closure = self.closures.get(key)
+        edges = self.children if (direction == 'DESCENDANTS') else self.parents
+
+        if closure is None:
+            closure = []
+            visited = {uid}
+            queue = deque(edges.get(uid, ()))
+
+            while queue:
+                other = queue.popleft()
+                if other in visited:
+                    continue
+
+                visited.add(other)
+                closure.append(other)
+                queue.extend(edges.get(other, ()))
+
+            closure = self.closures[key] = tuple(closure)
+
+        return closure
+
+    def related_groups(self, group, direction='DESCENDANTS', recursive=True):
+        """
+        Returns the groups used inside of the given group ('DESCENDANTS'), or the groups using it ('ANCESTORS'),
+        in topological order starting from the given group. Groups that are part of a cycle come last.
+        """
+
+        self.ensure()
+        uid = group.session_uid
+
+        if recursive:
+            uids = self.closure(uid, direction)
+        else:
+            edges = self.children if (direction == 'DESCENDANTS') else self.parents
+            uids = tuple(dict.fromkeys(edges.get(uid, ())))
+
+        unordered = len(self.rank)
+        rank = (lambda u: self.rank.get(u, unordered)) if (direction == 'DESCENDANTS') else (lambda u: -self.rank.get(u, -1))
+
+        groups = (self.resolve(u) for u in sorted(uids, key=rank))
+        return [g for g in groups if g is not None]
+
+    def is_cyclic(self, group):
+        self.ensure()
+        return group.session_uid in self.cycles
+
+
+dependency_graph = GroupDependencyGraph()
+
+
+@persistent
+def on_depsgraph_update(_scene, depsgraph):
+    # Groups added since subscribing need a subscription of their own. Groups are compared by
+    # session uid rather than counted, since a group can be added and another removed in one update.
+    if width_propagation_enabled:
+        subscribe_new_groups()
+
+    if not instance_index.valid:
+        return
+
+    for update in depsgraph.updates:
+        data_id = update.id.original
+        data_attr = id_type_sources.get(data_id.id_type)
+
+        if data_attr is None or getattr(data_id, "is_embedded_data", False):
+            continue
+
+        instance_index.tag_dirty((data_attr, data_id.name))
+
+
+def set_instance_widths(group, width=None):
+    """
+    Sets the width of every instance of the group in the file, in one pass.
+    When no width is given, instances are reset to the group's default width.
+
+    Returns:
+        The number of nodes whose width changed
+    """
+
+    if width is None:
+        width = group.default_group_node_width
+
+    updated_count = 0
+
+    for node in instance_index.instances_of(group):
+        if node.width != width and utils.is_tree_editable(node.id_data):
+            node.width = width
+            updated_count += 1
+
+    return updated_count
+
+
+# Seconds without further changes before edits to a default width are applied to instances,
+# so that dragging the value doesn't rewrite every instance on every mouse move
+width_propagation_delay = 0.25
+
+# Every group gets its own subscription, so that notifications say which group changed.
+# The last known default width of each group is kept, since notifications don't carry the old value.
+known_default_widths = {}
+pending_width_changes = {}
+msgbus_owner = object()
+width_propagation_enabled = False
+
+
+def find_group(uid, name):
+    group = bpy.data.node_groups.get(name)
+    if group is not None and group.session_uid == uid:
+        return group
+
+    # The group was renamed since it was subscribed to
+    for group in bpy.data.node_groups:
+        if group.session_uid == uid:
+            return group
+
+    return None
+
+
+def subscribe_group(group):
+    known_default_widths[group.session_uid] = group.default_group_node_width
+
+    bpy.msgbus.subscribe_rna(
+        key=group.path_resolve("default_group_node_width", False),
+        owner=msgbus_owner,
+        args=(group.session_uid, group.name),
+        notify=on_default_width_changed,
+    )
+
+
+def subscribe_new_groups():
+    groups = {g.session_uid: g for g in bpy.data.node_groups}
+
+    if groups.keys() == known_default_widths.keys():
+        return
+
+    for uid, group in groups.items():
+        if uid not in known_default_widths:
+            subscribe_group(group)
+
+    for uid in known_default_widths.keys() - groups.keys():
+        del known_default_widths[uid]
+
+
+def propagate_default_widths(groups):
+    """
+    Applies the default width of each group to its instances, if it changed since it was last seen
+
+    Returns:
+        The number of nodes whose width changed
+    """
+
+    updated_count = 0
+
+    for group in groups:
+        uid = group.session_uid
+        width = group.default_group_node_width
+        old_width = known_default_widths.get(uid)
+
+        if old_width is not None and old_width != width:
+            updated_count += set_instance_widths(group, width)
+
+        known_default_widths[uid] = width
+
+    return updated_count
+
+
+def apply_pending_widths():
+    pending = [find_group(uid, name) for uid, name in pending_width_changes.items()]
+    pending_width_changes.clear()
+
+    updated_count = propagate_default_widths(g for g in pending if g is not None)
+
+    # Timers run outside of any operator, so the new widths get an undo step of their own
+    if updated_count > 0 and not bpy.app.background:
+        try:
+            bpy.ops.ed.undo_push(message="Propagate Default Width")
+        except RuntimeError:
+            pass
+
+    # Returning None stops the timer from repeating
+    return None
+
+
+def on_default_width_changed(uid, name):
+    pending_width_changes[uid] = name
+
+    # Restart the timer on every notification, so it only runs once the edits have settled
+    if bpy.app.timers.is_registered(apply_pending_widths):
+        bpy.app.timers.unregister(apply_pending_widths)
+
+    bpy.app.timers.register(apply_pending_widths, first_interval=width_propagation_delay)
+
+
+def subscribe_width_propagation():
+    global width_propagation_enabled
+    width_propagation_enabled = True
+
+    bpy.msgbus.clear_by_owner(msgbus_owner)
+    known_default_widths.clear()
+    pending_width_changes.clear()
+
+    for group in bpy.data.node_groups:
+        subscribe_group(group)
+
+
+def unsubscribe_width_propagation():
+    global width_propagation_enabled
+    width_propagation_enabled = False
+
+    bpy.msgbus.clear_by_owner(msgbus_owner)
+    known_default_widths.clear()
+    pending_width_changes.clear()
+
+    if bpy.app.timers.is_registered(apply_pending_widths):
+        bpy.app.timers.unregister(apply_pending_widths)
+
+
+# Message bus subscriptions don't survive loading a file
+@persistent
+def on_data_reloaded(*_):
+    if getattr(utils.fetch_user_preferences(), "propagate_default_width", False):
+        subscribe_width_propagation()
+
+
+handlers = (
+    (bpy.app.handlers.depsgraph_update_post, on_depsgraph_update),
+    (bpy.app.handlers.load_post, on_data_reloaded),
+    (bpy.app.handlers.undo_post, on_data_reloaded),
+    (bpy.app.handlers.redo_post, on_data_reloaded),
+)
+
+
+def register():
+    for handler_list, handler in handlers:
+        if handler not in handler_list:
+            handler_list.append(handler)
+
+
+def unregister():
+    for handler_list, handler in handlers:
+        if handler in handler_list:
+            handler_list.remove(handler)
+
+    unsubscribe_width_propagation()
+    instance_index.clear()
@@ -0,0 +1,443 @@
+import bisect
+
+from . import caches
+
+
+def item_kind(item):
+    if item.item_type == 'PANEL':
+        return 'PANEL'
+    elif getattr(item, "is_panel_toggle", False):
+        return 'TOGGLE'
+    else:
+        return item.in_out
+
+
+class InterfaceEntry:
+    __slots__ = (
+        "item",
+        "kind",
+        "parent",
+        "children",
+        "position",
+        "kind_index",
+        "siblings",
+        "prev_panel",
+        "next_panel",
+        "toggle",
+        "enter",
+        "exit",
+    )
+
+    def __init__(self, item, kind, parent):
+        self.item = item
+        self.kind = kind
+        self.parent = parent
+        self.children = []
+        self.position = 0
+        self.kind_index = 0
+        self.siblings = {}
+        self.prev_panel = None
+        self.next_panel = None
+        self.toggle = None
+        self.enter = -1
+        self.exit = -1
+
+    def __repr__(self):
+        return f"<InterfaceEntry {self.kind} \"{self.item.name}\">"
+
+    @property
+    def is_panel(self):
+        return self.kind == 'PANEL'
+
+
+class InterfaceSnapshot:
+    __slots__ = ("root", "entries", "order", "_panel_paths")
+
+    def __init__(self, tree):
+        """
+        A read-only copy of the structure of a node tree interface,
+        built in a single pass over `interface.items_tree`.
+
+        Every entry stores its parent, its children, its index among siblings of the same kind
+        and the panels directly before and after it, so that neighbours can be looked up
+        without rescanning the interface. Entries also store the interval of indices
+        covered by their descendants, which makes ancestry checks constant time.
+        """
+
+        self.root = None
+        self.entries = {}
+        self.order = []
+        self._panel_paths = None
+
+        for item in tree.interface.items_tree:
+            parent_item = item.parent
+            parent = self.entries.get(parent_item.as_pointer())
+
+            # Items are listed depth-first, so the only parent
+            # that hasn't been seen yet is the root panel
+            if parent is None:
+                parent = self.root = InterfaceEntry(parent_item, 'PANEL', None)
+                self.entries[parent_item.as_pointer()] = parent
+
+            entry = InterfaceEntry(item, item_kind(item), parent)
+            entry.position = len(parent.children)
+            parent.children.append(entry)
+
+            self.entries[item.as_pointer()] = entry
+            self.order.append(entry)
+
+        for panel in self.panels(include_root=True):
+            index_children(panel)
+
+        self.index_ancestry()
+
+    def index_ancestry(self):
+        # Euler tour intervals: an item lies inside of a panel exactly when its
+        # entry index falls within the range spanned by that panel's descendants.
+        # As items are already listed depth-first, the entry index is the item's index.
+        for i, entry in enumerate(self.order):
+            entry.enter = entry.exit = i
+
+        if self.root is not None:
+            self.root.exit = len(self.order) - 1
+
+        for entry in reversed(self.order):
+            parent = entry.parent
+            if parent.exit < entry.exit:
+                parent.exit = entry.exit
+
+    def entry(self, item):
+        return self.entries.get(item.as_pointer())
+
+    def panels(self, include_root=False):
+        if include_root and self.root is not None:
+            yield self.root
+
+        for entry in self.order:
+            if entry.is_panel:
+                yield entry
+
+    def is_inside(self, entry, panel):
+        return panel.enter < entry.enter <= panel.exit
+
+    def valid_parents(self, entry):
+        for panel in self.panels(include_root=True):
+            if panel is entry.parent:
+                continue
+
+            # Panels can't be parented to themselves or to any of their descendants
+            if entry.is_panel and (panel is entry or self.is_inside(panel, entry)):
+                continue
+
+            yield panel
+
+    @property
+    def panel_paths(self):
+        if self._panel_paths is None:
+            paths = self._panel_paths = {}
+
+            for panel in self.panels(include_root=True):
+                parent_path = paths.get(panel.parent, "")
+                if panel is self.root:
+                    paths[panel] = ""
+                elif parent_path:
+                    paths[panel] = f"{parent_path} / {panel.item.name}"
+                else:
+                    paths[panel] = panel.item.name
+
+        return self._panel_paths
+
+    def outermost(self, entries):
+        """
+        Returns the given entries in interface order, leaving out the ones
+        that are inside of another given panel (they move along with it)
+        """
+
+        result = []
+
+        for entry in sorted(entries, key=lambda e: e.enter):
+            if result and result[-1].is_panel and self.is_inside(entry, result[-1]):
+                continue
+
+            result.append(entry)
+
+        return result
+
+    def matches(self, item):
+        entry = self.entry(item)
+
+        return all((
+            entry is not None,
+            entry.position == item.position,
+            entry.parent.item == item.parent,
+        ))
+
+
+def index_children(panel):
+    children = panel.children = tuple(panel.children)
+
+    siblings = {}
+    for child in children:
+        same_kind = siblings.setdefault(child.kind, [])
+        child.kind_index = len(same_kind)
+        same_kind.append(child)
+
+    panel.siblings = {kind: tuple(items) for kind, items in siblings.items()}
+    panel.toggle = children[0] if (children and children[0].kind == 'TOGGLE') else None
+
+    previous = None
+    for child in children:
+        child.prev_panel = previous
+        if child.is_panel:
+            previous = child
+
+    following = None
+    for child in reversed(children):
+        child.next_panel = following
+        if child.is_panel:
+            following = child
+
+
+snapshots = caches.TreeCache(maxsize=8)
+
+
+def fetch_snapshot(tree, *items):
+    """
+    Returns the cached snapshot of the tree's interface, rebuilding it
+    if the interface has changed or if any of the given items are out of place
+    """
+
+    snapshot = snapshots.get(tree)
+
+    if snapshot is None or not all(snapshot.matches(i) for i in items):
+        snapshot = snapshots.set(tree, InterfaceSnapshot(tree))
+
+    return snapshot
+
+
+class LayoutPlan:
+    def __init__(self, snapshot):
+        """
+        A copy-on-write view of an InterfaceSnapshot, used for planning
+        several moves in pure Python before applying the end result to the interface.
+        Panels that are left untouched keep reading from the snapshot's precomputed data.
+        """
+
+        self.snapshot = snapshot
+        self.parents = {}
+        self.children = {}
+        self.moved = {}
+
+    def parent_of(self, entry):
+        return self.parents.get(entry, entry.parent)
+
+    def children_of(self, panel):
+        return self.children.get(panel, panel.children)
+
+    def position_of(self, entry):
+        parent = self.parent_of(entry)
+
+        if parent in self.children:
+            return self.children[parent].index(entry)
+        else:
+            return entry.position
+
+    def similar_items(self, entry):
+        parent = self.parent_of(entry)
+
+        if parent in self.children:
+            return tuple(i for i in self.children[parent] if i.kind == entry.kind)
+        else:
+            return parent.siblings.get(entry.kind, ())
+
+    def kind_index(self, entry):
+        if self.parent_of(entry) in self.children:
+            return self.similar_items(entry).index(entry)
+        else:
+            return entry.kind_index
+
+    def kind_range(self, entry):
+        # Blender keeps items grouped by kind (outputs before inputs), so a move
+        # within a panel can't take an item past the first or last item of its kind
+        similar = self.similar_items(entry)
+        return self.position_of(similar[0]), self.position_of(similar[-1])
+
+    def child_panels(self, panel):
+        if panel in self.children:
+            return tuple(i for i in self.children[panel] if i.is_panel)
+        else:
+            return panel.siblings.get('PANEL', ())
+
+    def adjacent_panel(self, panel, direction):
+        parent = self.parent_of(panel)
+        if parent is None or not panel.is_panel:
+            return None
+
+        if parent not in self.children:
+            return panel.prev_panel if direction == 'UP' else panel.next_panel
+
+        panels = self.child_panels(parent)
+        index = panels.index(panel) + (-1 if direction == 'UP' else 1)
+        return panels[index] if (0 <= index < len(panels)) else None
+
+    def endpoint_panel(self, panel, direction):
+        panels = self.child_panels(panel)
+
+        if not panels:
+            return None
+
+        return panels[-1] if direction == 'UP' else panels[0]
+
+    def first_position(self, panel, entry=None):
+        # Panel toggles always have to remain as the first item of their panel
+        children = self.children_of(panel)
+        has_toggle = bool(children) and children[0].kind == 'TOGGLE' and children[0] is not entry
+        return int(has_toggle)
+
+    def last_position(self, panel, entry=None):
+        children = self.children_of(panel)
+        return len(children) - (entry in children)
+
+    def move(self, entry, parent, position):
+        old_parent = self.parent_of(entry)
+
+        old_children = self.children.get(old_parent)
+        if old_children is None:
+            old_children = self.children[old_parent] = list(old_parent.children)
+        old_children.remove(entry)
+
+        new_children = self.children.get(parent)
+        if new_children is None:
+            new_children = self.children[parent] = list(parent.children)
+
+        position = max(self.first_position(parent, entry), min(position, len(new_children)))
+        new_children.insert(position, entry)
+        self.parents[entry] = parent
+        self.moved[entry] = None
+
+    def reorder(self, panel, order):
+        """
+        Plans the given order for the children of a panel, marking as few of them as moved as possible.
+        The longest run of children that already appear in the planned order stays in place.
+        """
+
+        children = self.children_of(panel)
+        target_positions = {entry: i for i, entry in enumerate(order)}
+        kept = longest_increasing_subsequence([target_positions[e] for e in children])
+
+        self.children[panel] = list(order)
+        for i, entry in enumerate(children):
+            if i not in kept:
+                self.moved[entry] = None
+
+        return len(children) - len(kept)
+
+    def placement(self, entry):
+        return self.parent_of(entry), self.position_of(entry)
+
+    def has_moved(self, entry):
+        return self.placement(entry) != (entry.parent, entry.position)
+
+    def apply(self, transaction):
+        """
+        Applies the planned layout through the given transaction, with one move per item
+        that was moved in the plan. Every item is placed right after the item that precedes it
+        in the planned layout, which is either an item that never moved or one that was already placed.
+        """
+
+        layout = ((panel.item, [e.item for e in children]) for panel, children in self.children.items())
+        apply_layout(transaction, layout, {e.item.as_pointer() for e in self.moved})
+
+
+def place_item(interface, item, parent, position):
+    """
+    Moves an item so that it ends up at the given position inside of the given parent.
+    Unlike `interface.move`, the position refers to the layout after the move has taken place.
+    """
+
+    if item.parent == parent:
+        # Interface moves insert before the given index,
+        # which is counted before the item is taken out of its old spot
+        if position > item.position:
+            position += 1
+
+        interface.move(item, position)
+    else:
+        interface.move_to_parent(item, parent, position)
+
+
+def apply_layout(transaction, layout, moved):
+    """
+    Places items according to a planned layout, given as pairs of a panel and the items it should contain in order.
+    Only the items whose pointers are in `moved` are placed, each right after the item that precedes it.
+    Items that aren't moved have to already be in the right panel and in the right order relative to each other.
+    """
+
+    for panel, children in layout:
+        previous = None
+
+        for item in children:
+            if item.as_pointer() in moved:
+                transaction.place_after(item, panel, previous)
+
+            previous = item
+
+
+def longest_increasing_subsequence(values):
+    """
+    Returns the indices of one longest strictly increasing subsequence of the given values,
+    found in O(n log n) using patience sorting
+    """
+
+    tails = []
+    tail_indices = []
+    previous = [-1] * len(values)
+
+    for i, value in enumerate(values):
+        pile = bisect.bisect_left(tails, value)
+
+        if pile == len(tails):
+            tails.append(value)
+            tail_indices.append(i)
+        else:
+            tails[pile] = value
+            tail_indices[pile] = i
+
+        previous[i] = tail_indices[pile - 1] if pile > 0 else -1
+
+    indices = set()
+    i = tail_indices[-1] if tail_indices else -1
+
+    while i != -1:
+        indices.add(i)
+        i = previous[i]
+
+    return indices
+
+
+def place_after(interface, item, parent, anchor=None):
+    """
+    Moves an item inside of the given parent, right after the anchor item,
+    or to the start of the parent when no anchor is given.
+    Nothing is moved when the item already sits there.
+
+    Returns:
+        Whether the interface was changed
+    """
+
+    if anchor is None:
+        position = 0
+    else:
+        position = anchor.position + 1
+
+    if item.parent == parent:
+        if item.position == position:
+            return False
+
+        # Interface moves insert before the given index, which is counted
+        # before the item is taken out of its old spot, so the index works both ways
+        interface.move(item, position)
+    else:
+        interface.move_to_parent(item, parent, position)
+
+    return True
@@ -0,0 +1,313 @@
+"""
+Keeps an SQLite index of the node groups stored in a library of .blend files,
+including their flags and full interface, so that groups can be searched without opening files.
+
+    blender -b --factory-startup -P group_edit_tools/library_index.py -- ROOT [--database PATH]
+
+Files whose modification time and size haven't changed are skipped. Files that were touched
+but whose content hash is unchanged only get their modification time updated.
+"""
+
+import argparse
+import hashlib
+import importlib
+import os
+import pathlib
+import sqlite3
+import sys
+import time
+
+
+package_dir = os.path.dirname(os.path.abspath(__file__))
+database_name = "library_index.db"
+schema_version = 1
+
+schema = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    mtime REAL NOT NULL,
+    size INTEGER NOT NULL,
+    hash TEXT NOT NULL,
+    indexed_at REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS groups (
+    id INTEGER PRIMARY KEY,
+    file TEXT NOT NULL REFERENCES files(path) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    tree_type TEXT NOT NULL,
+    color_tag TEXT,
+    description TEXT,
+    is_asset INTEGER NOT NULL,
+    is_modifier INTEGER,
+    is_tool INTEGER,
+    default_width REAL
+);
+
+CREATE TABLE IF NOT EXISTS sockets (
+    group_id INTEGER NOT NULL REFERENCES groups(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    kind TEXT NOT NULL,
+    name TEXT NOT NULL,
+    socket_type TEXT,
+    panel_path TEXT NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS groups_by_name ON groups(name COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS groups_by_file ON groups(file);
+CREATE INDEX IF NOT EXISTS sockets_by_group ON sockets(group_id);
+CREATE INDEX IF NOT EXISTS sockets_by_name ON sockets(name COLLATE NOCASE);
+"""
+
+
+def default_database_path(create=True):
+    import bpy
+
+    directory = bpy.utils.user_resource('DATAFILES', path="group_edit_tools", create=create)
+    return os.path.join(directory, database_name)
+
+
+def connect(path):
+    connection = sqlite3.connect(path)
+    connection.execute("PRAGMA foreign_keys = ON")
+
+    # The index can always be rebuilt, so an outdated schema is simply dropped
+    if connection.execute("PRAGMA user_version").fetchone()[0] != schema_version:
+        connection.executescript("DROP TABLE IF EXISTS sockets; DROP TABLE IF EXISTS groups; DROP TABLE IF EXISTS files;")
+        connection.execute(f"PRAGMA user_version = {schema_version}")
+
+    connection.executescript(schema)
+    return connection
+
+
+def connect_read_only(path):
+    """
+    Opens an existing index without creating or migrating it. Returns None when the index
+    doesn't exist yet or was written with another schema, since it can't be searched then.
+    """
+
+    if not os.path.isfile(path):
+        return None
+
+    connection = sqlite3.connect(f"{pathlib.Path(path).resolve().as_uri()}?mode=ro", uri=True)
+
+    if connection.execute("PRAGMA user_version").fetchone()[0] != schema_version:
+        connection.close()
+        return None
+
+    return connection
+
+
+def file_hash(path, chunk_size=1 << 20):
+    digest = hashlib.sha1()
+
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(chunk_size), b""):
+            digest.update(chunk)
+
+    return digest.hexdigest()
+
+
+def find_blend_files(root):
+    for directory, _dirs, files in os.walk(root):
+        for name in files:
+            if name.endswith(".blend"):
+                yield os.path.normpath(os.path.join(directory, name))
+
+
+def group_record(tree):
+    return {
+        "name": tree.name,
+        "tree_type": tree.bl_idname,
+        "color_tag": getattr(tree, "color_tag", None),
+        "description": tree.asset_data.description if tree.asset_data else getattr(tree, "description", ""),
+        "is_asset": tree.asset_data is not None,
+        "is_modifier": getattr(tree, "is_modifier", None),
+        "is_tool": getattr(tree, "is_tool", None),
+        "default_width": getattr(tree, "default_group_node_width", None),
+    }
+
+
+def socket_records(tree):
+    from . import interface_index
+
+    snapshot = interface_index.InterfaceSnapshot(tree)
+    paths = snapshot.panel_paths
+
+    for position, entry in enumerate(snapshot.order):
+        item = entry.item
+        kind = 'PANEL' if entry.is_panel else item.in_out
+        yield (position, kind, item.name, getattr(item, "socket_type", None), paths[entry.parent])
+
+
+def extract_groups(filepath):
+    """
+    Links every node group of a .blend file into the current session, yields the data
+    of each one and removes the library again afterwards
+    """
+
+    import bpy
+
+    existing = set(bpy.data.libraries)
+
+    with bpy.data.libraries.load(filepath, link=True) as (data_from, data_to):
+        data_to.node_groups = list(data_from.node_groups)
+
+    try:
+        for tree in data_to.node_groups:
+            if tree is not None:
+                yield group_record(tree), tuple(socket_records(tree))
+    finally:
+        for library in set(bpy.data.libraries) - existing:
+            bpy.data.libraries.remove(library)
+
+
+def store_file(connection, path, stat, digest, groups):
+    connection.execute("DELETE FROM files WHERE path = ?", (path,))
+    connection.execute(
+        "INSERT INTO files (path, mtime, size, hash, indexed_at) VALUES (?, ?, ?, ?, ?)",
+        (path, stat.st_mtime, stat.st_size, digest, time.time()),
+    )
+
+    for group, sockets in groups:
+        cursor = connection.execute(
+            "INSERT INTO groups (file, name, tree_type, color_tag, description, is_asset, is_modifier, is_tool, default_width) "
+            "VALUES (:file, :name, :tree_type, :color_tag, :description, :is_asset, :is_modifier, :is_tool, :default_width)",
+            {"file": path, **group},
+        )
+
+        connection.executemany(
+            "INSERT INTO sockets (group_id, position, kind, name, socket_type, panel_path) VALUES (?, ?, ?, ?, ?, ?)",
+            ((cursor.lastrowid, *socket) for socket in sockets),
+        )
+
+
+def update_index(connection, root, log=print):
+    """
+    Brings the index up to date with the .blend files found under `root`
+
+    Returns:
+        The number of files that were indexed, skipped and removed
+    """
+
+    known = {path: (mtime, size, digest) for path, mtime, size, digest in connection.execute("SELECT path, mtime, size, hash FROM files")}
+    root = os.path.normpath(root)
+    indexed = skipped = 0
+    found = set()
+
+    for path in find_blend_files(root):
+        found.add(path)
+        stat = os.stat(path)
+        previous = known.get(path)
+
+        if previous is not None and previous[:2] == (stat.st_mtime, stat.st_size):
+            skipped += 1
+            continue
+
+        digest = file_hash(path)
+
+        if previous is not None and previous[2] == digest:
+            connection.execute("UPDATE files SET mtime = ?, size = ? WHERE path = ?", (stat.st_mtime, stat.st_size, path))
+            skipped += 1
+            continue
+
+        start_time = time.perf_counter()
+
+        try:
+            groups = list(extract_groups(path))
+        except (OSError, RuntimeError) as error:
+            log(f"[error] {path}: {error}")
+            continue
+
+        with connection:
+            store_file(connection, path, stat, digest, groups)
+
+        indexed += 1
+        log(f"[indexed] {path}: {len(groups)} groups ({time.perf_counter() - start_time:.2f} s)")
+
+    removed = [p for p in known if p not in found and (p == root or p.startswith(root + os.sep))]
+    with connection:
+        connection.executemany("DELETE FROM files WHERE path = ?", ((p,) for p in removed))
+
+    return indexed, skipped, len(removed)
+
+
+def escape_like(text):
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def search(connection, text, tree_type=None, limit=50):
+    """
+    Returns groups whose name, or the name of any of their sockets or panels, contains the given text,
+    as tuples of (group name, tree type, file path, matching socket names)
+    """
+
+    pattern = f"%{escape_like(text)}%"
+    query = """
+        SELECT g.name, g.tree_type, g.file,
+            (SELECT group_concat(s.name, ', ') FROM sockets s WHERE s.group_id = g.id AND s.name LIKE :pattern ESCAPE '\\')
+        FROM groups g
+        WHERE (g.name LIKE :pattern ESCAPE '\\'
+            OR EXISTS (SELECT 1 FROM sockets s WHERE s.group_id = g.id AND s.name LIKE :pattern ESCAPE '\\'))
+            AND (:tree_type IS NULL OR g.tree_type = :tree_type)
+        ORDER BY g.name COLLATE NOCASE, g.file
+        LIMIT :limit
+    """
+
+    return connection.execute(query, {"pattern": pattern, "tree_type": tree_type, "limit": limit}).fetchall()
+
+
+# Results of the last search, so that redrawing the panel doesn't query the database again
+search_cache = {}
+
+
+def cached_search(database_path, text, tree_type=None, limit=50):
+    try:
+        database_mtime = os.path.getmtime(database_path)
+    except OSError:
+        return None
+
+    key = (database_path, database_mtime, text, tree_type, limit)
+    if key not in search_cache:
+        search_cache.clear()
+
+        # Searching runs from draw code, so the index is only ever read here
+        try:
+            connection = connect_read_only(database_path)
+            if connection is None:
+                return None
+
+            try:
+                search_cache[key] = search(connection, text, tree_type, limit)
+            finally:
+                connection.close()
+        except sqlite3.Error:
+            return None
+
+    return search_cache[key]
+
+
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv
+
+    parser = argparse.ArgumentParser(prog="group_edit_tools.library_index", description="Index the node groups of a library of .blend files")
+    parser.add_argument("root", help="Directory searched (recursively) for .blend files")
+    parser.add_argument("--database", default=None, help="Path of the SQLite database")
+    options = parser.parse_args(argv[argv.index("--") + 1:] if "--" in argv else argv[1:])
+
+    start_time = time.perf_counter()
+    connection = connect(options.database or default_database_path())
+
+    try:
+        indexed, skipped, removed = update_index(connection, options.root)
+    finally:
+        connection.close()
+
+    print(f"Indexed {indexed} files, skipped {skipped} unchanged, removed {removed} in {time.perf_counter() - start_time:.2f} s")
+
+
+if __name__ == "__main__":
+    # Extracting interfaces relies on the rest of the addon, so the module is imported as part of its package
+    sys.path.insert(0, os.path.dirname(package_dir))
+    importlib.import_module(f"{os.path.basename(package_dir)}.library_index").main()
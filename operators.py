@@ -1,12 +1,14 @@
 
 import bpy
 from bpy.types import Operator
-from bpy.props import EnumProperty, IntProperty
+from bpy.props import BoolProperty, EnumProperty, FloatProperty, FloatVectorProperty, IntProperty, StringProperty
 
 from bl_operators.node import NodeInterfaceOperator
 
-import itertools
-from . import utils
+import re
+import subprocess
+import numpy as np
+from . import batch, clipboard, dedupe, group_index, interface_index, library_index, organize, rename, selection, swap_io, sync, transaction, usage_index, utils
 
 
 class GROUP_TOOLS_OT_copy_from_active(Operator):
@@ -30,34 +32,450 @@ class GROUP_TOOLS_OT_copy_from_active(Operator):
             ))
 
     @staticmethod
-    def fetch_prop_values(tree, prop_names):
-        for prop in prop_names:
-            if prop == "description" and (tree.asset_data is not None):
-                yield getattr(tree.asset_data, prop)
-            else:
-                yield getattr(tree, prop)
+    def fetch_target_groups(context, active_group):
+        # Several selected nodes can share the same group, so each tree is only visited once
+        target_groups = {}
 
-    @staticmethod
-    def set_prop_values(tree, prop_names, prop_values):
-        for prop, prop_value in zip(prop_names, prop_values):
-            if prop == "description" and (tree.asset_data is not None):
-                setattr(tree.asset_data, prop, prop_value)
-            else:
-                setattr(tree, prop, prop_value)
+        for node in context.selected_nodes:
+            tree = getattr(node, "node_tree", None)
+
+            if tree is None or tree == active_group or not utils.is_tree_editable(tree):
+                continue
+
+            target_groups.setdefault(tree.as_pointer(), tree)
+
+        return tuple(target_groups.values())
 
     def execute(self, context):
         active_group = context.active_node.node_tree
-        selected_groups = (node.node_tree for node in context.selected_nodes if hasattr(node, "node_tree"))
         prefs = utils.fetch_user_preferences()
 
         copy_props = tuple(prefs.copy_from_active.props_to_copy)
 
-        active_group_props = tuple(self.fetch_prop_values(active_group, copy_props))
-        for group in selected_groups:
-            self.set_prop_values(group, copy_props, active_group_props)
+        target_groups = self.fetch_target_groups(context, active_group)
+        changed_groups, prop_counts = batch.copy_properties(active_group, target_groups, copy_props)
+        changed_props = prop_counts.total()
+
+        if changed_groups == 0:
+            self.report({'WARNING'}, "Selected nodegroups are already up-to-date.")
+            return {'CANCELLED'}
+
+        self.report({'INFO'}, (
+            f"Successfully changed {utils.plural(changed_props, 'property', 'properties')} "
+            f"across {utils.plural(changed_groups, 'nodegroup')} from group: \"{active_group.name}\""
+            ))
+
+        return {'FINISHED'}
+
+
+class GROUP_TOOLS_OT_sync_interface_from_active(Operator):
+    bl_idname = "node.group_edit_sync_interface_from_active"
+    bl_label = "Sync Interface From Active"
+    bl_description = "Make the interface of other selected groups match the active group, keeping matching sockets and their links"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    dry_run : BoolProperty(
+        name="Dry Run",
+        description="Only report the edits that would be made, without applying them",
+        default=False,
+    )
+
+    sync_defaults : BoolProperty(
+        name="Sync Default Values",
+        description="Also copy default values onto sockets that already exist",
+        default=False,
+    )
+
+    @classmethod
+    def poll(cls, context):
+        active_node = context.active_node
+
+        return all((
+            getattr(active_node, "select", False),
+            getattr(active_node, "node_tree", None) is not None,
+            len(context.selected_nodes) > 1,
+            ))
+
+    def execute(self, context):
+        active_group = context.active_node.node_tree
+        target_groups = GROUP_TOOLS_OT_copy_from_active.fetch_target_groups(context, active_group)
+        target_groups = tuple(t for t in target_groups if t.bl_idname == active_group.bl_idname)
+
+        plans = [sync.SyncPlan(active_group, tree, self.sync_defaults) for tree in target_groups]
+        plans = [p for p in plans if p.edit_count > 0]
+
+        if not plans:
+            self.report({'WARNING'}, "Selected nodegroups already match the active group.")
+            return {'CANCELLED'}
+
+        edit_count = sum(p.edit_count for p in plans)
+
+        if self.dry_run:
+            for plan in plans:
+                for line in plan.describe():
+                    self.report({'INFO'}, f"\"{plan.target_tree.name}\": {line}")
+
+            # Finishing keeps the redo panel around, so the edits can be applied by turning off the dry run
+            self.report({'INFO'}, f"Dry run: {utils.plural(edit_count, 'edit')} planned across {utils.plural(len(plans), 'nodegroup')}.")
+            return {'FINISHED'}
+
+        for plan in plans:
+            with transaction.InterfaceTransaction(plan.target_tree, name=self.bl_label, push_undo=False) as edits:
+                plan.apply(edits)
+
+        self.report({'INFO'}, (
+            f"Succesfully synced {utils.plural(len(plans), 'nodegroup')} "
+            f"with {utils.plural(edit_count, 'edit')} from group: \"{active_group.name}\""
+            ))
+
+        return {'FINISHED'}
+
+
+class GROUP_TOOLS_OT_copy_to_matching_groups(Operator):
+    bl_idname = "node.group_edit_copy_to_matching_groups"
+    bl_label = "Copy to Matching Groups"
+    bl_description = "Apply properties from the active group onto every nodegroup in the file that matches the given filters"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    source_group : StringProperty(
+        name="Source Group",
+        description="Name of the group to copy properties from. Uses the active group when left empty",
+        default="",
+    )
+
+    prop_names : StringProperty(
+        name="Properties",
+        description="Comma-separated names of the properties to copy. Uses the add-on preferences when left empty",
+        default="",
+    )
+
+    tree_type : EnumProperty(name="Tree Type", items=batch.tree_type_items, default='SAME')
+    name_pattern : StringProperty(name="Name", description="Only include groups whose names match this pattern", default="")
+    use_regex : BoolProperty(name="Regular Expression", description="Match names with a regular expression instead of a glob pattern", default=False)
+    asset_status : EnumProperty(name="Asset Status", items=batch.asset_status_items, default='ANY')
+    color_tag : EnumProperty(name="Color Tag", description="Only include groups with this color tag", items=batch.color_tag_items, default='ANY')
+
+    @classmethod
+    def poll(cls, context):
+        # Scripts running in the background have no active node,
+        # and are expected to pass the source group by name instead
+        if bpy.app.background:
+            return True
+
+        return utils.fetch_tree_of_active_node(context) is not None
+
+    def fetch_source_group(self, context):
+        if self.source_group:
+            return bpy.data.node_groups.get(self.source_group)
+        else:
+            return utils.fetch_tree_of_active_node(context)
+
+    def fetch_prop_names(self, source):
+        if not self.prop_names:
+            prefs = utils.fetch_user_preferences()
+            return tuple(prefs.copy_from_active.props_to_copy_from(source))
+
+        return tuple(p.strip() for p in self.prop_names.split(",") if p.strip())
+
+    def draw(self, context):
+        layout = self.layout
+        layout.use_property_split = True
+        layout.use_property_decorate = False
+
+        layout.prop(self, "tree_type")
+
+        row = layout.row(align=True)
+        row.prop(self, "name_pattern")
+        row.prop(self, "use_regex", text="", icon='SORTBYEXT')
+
+        layout.prop(self, "asset_status")
+        if bpy.app.version >= (4, 2, 0):
+            layout.prop(self, "color_tag")
+
+    def invoke(self, context, event):
+        return context.window_manager.invoke_props_dialog(self)
+
+    def execute(self, context):
+        source = self.fetch_source_group(context)
+        if source is None:
+            self.report({'ERROR'}, f"Could not find source group: \"{self.source_group}\"")
+            return {'CANCELLED'}
+
+        prop_names = self.fetch_prop_names(source)
+        invalid_props = tuple(p for p in prop_names if not hasattr(batch.prop_owner(source, p), p))
+        if invalid_props:
+            self.report({'ERROR'}, f"Unknown properties: {', '.join(invalid_props)}")
+            return {'CANCELLED'}
+
+        if not prop_names:
+            self.report({'WARNING'}, "No properties were selected to copy.")
+            return {'CANCELLED'}
+
+        try:
+            changed_groups, prop_counts = batch.copy_to_matching_groups(
+                source,
+                prop_names,
+                tree_type=self.tree_type,
+                name_pattern=self.name_pattern,
+                use_regex=self.use_regex,
+                asset_status=self.asset_status,
+                color_tag=self.color_tag,
+            )
+        except re.error as error:
+            self.report({'ERROR'}, f"Invalid regular expression: {error}")
+            return {'CANCELLED'}
+
+        if changed_groups == 0:
+            self.report({'WARNING'}, "Matching nodegroups are already up-to-date.")
+            return {'CANCELLED'}
+
+        self.report({'INFO'}, (
+            f"Successfully updated {utils.plural(changed_groups, 'nodegroup')} "
+            f"from group: \"{source.name}\" - {batch.format_counts(prop_counts)}"
+            ))
+
+        return {'FINISHED'}
+
+
+class InterfaceScopeOperator:
+    # The dialog may not keep the context pointer around, so the group is stored by name
+    group_name : StringProperty(name="Group", default="", options={'SKIP_SAVE', 'HIDDEN'})
+
+    @classmethod
+    def poll(cls, context):
+        return utils.fetch_tree_of_active_node(context) is not None or getattr(context, "group_edit_tree_to_edit", None) is not None
+
+    def store_group(self, context):
+        tree = getattr(context, "group_edit_tree_to_edit", None) or utils.fetch_tree_of_active_node(context)
+        self.group_name = tree.name
+
+    def fetch_groups(self, context):
+        if self.scope == 'ALL':
+            return [g for g in bpy.data.node_groups if utils.is_tree_editable(g)]
+
+        group = bpy.data.node_groups.get(self.group_name) if self.group_name else utils.fetch_tree_of_active_node(context)
+        groups = {} if (group is None) else {group.as_pointer(): group}
+
+        if self.scope == 'SELECTED':
+            for node in (getattr(context, "selected_nodes", None) or ()):
+                tree = getattr(node, "node_tree", None)
+                if tree is not None:
+                    groups.setdefault(tree.as_pointer(), tree)
+
+        return [g for g in groups.values() if utils.is_tree_editable(g)]
+
+
+class GROUP_TOOLS_OT_interface_items_rename(InterfaceScopeOperator, Operator):
+    bl_idname = "group_edit_tools.interface_items_rename"
+    bl_label = "Find and Replace Names"
+    bl_description = "Rename sockets and panels by replacing text in their names, in one or several groups"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    scope : EnumProperty(
+        name="Scope",
+        items=(
+            ('ACTIVE', "Active Group", "Only rename items of the active group"),
+            ('SELECTED', "Selected Groups", "Rename items of the active group and of the groups of every selected node"),
+            ('ALL', "All Groups", "Rename items of every nodegroup in the file"),
+        ),
+        default='ACTIVE',
+    )
+
+    item_types : EnumProperty(
+        name="Items",
+        items=(
+            ('ALL', "Sockets and Panels", "Rename both sockets and panels"),
+            ('SOCKETS', "Sockets", "Only rename sockets"),
+            ('PANELS', "Panels", "Only rename panels, along with their toggles"),
+        ),
+        default='ALL',
+    )
+
+    find : StringProperty(name="Find", description="Text to look for in item names", default="")
+    replace : StringProperty(name="Replace", description="Text that replaces every match. Groups can be referred to as \\1 with regular expressions", default="")
+    use_regex : BoolProperty(name="Regular Expression", description="Look for a regular expression instead of plain text", default=False)
+    case_sensitive : BoolProperty(name="Case Sensitive", default=True)
+
+    def plan(self, context):
+        if not self.find:
+            return []
+
+        pattern = rename.compile_pattern(self.find, self.use_regex, self.case_sensitive)
+        return rename.plan_renames(self.fetch_groups(context), pattern, rename.replacer(self.replace, self.use_regex), self.item_types)
+
+    def draw(self, context):
+        layout = self.layout
+        layout.use_property_split = True
+        layout.use_property_decorate = False
+
+        layout.prop(self, "scope")
+        layout.prop(self, "item_types")
+
+        row = layout.row(align=True)
+        row.prop(self, "find")
+        row.prop(self, "use_regex", text="", icon='SORTBYEXT')
+        row.prop(self, "case_sensitive", text="", icon='SMALL_CAPS')
+        layout.prop(self, "replace")
+
+        try:
+            renames = self.plan(context)
+        except (re.error, IndexError) as error:
+            layout.label(text=f"Invalid expression: {error}", icon='ERROR')
+            return
+
+        layout.label(text=f"{utils.plural(len(renames), 'item')} will be renamed", icon='INFO')
+
+        col = layout.column(align=True)
+        show_groups = (self.scope != 'ACTIVE')
+
+        for tree, _item, old_name, new_name in renames[:20]:
+            prefix = f"{tree.name}: " if show_groups else ""
+            col.label(text=f"{prefix}{old_name}  \u2192  {new_name}")
+
+        if len(renames) > 20:
+            col.label(text=f"... and {len(renames) - 20} more")
+
+    def invoke(self, context, event):
+        self.store_group(context)
+        return context.window_manager.invoke_props_dialog(self, width=400)
+
+    def execute(self, context):
+        try:
+            renames = self.plan(context)
+        except (re.error, IndexError) as error:
+            self.report({'ERROR'}, f"Invalid expression: {error}")
+            return {'CANCELLED'}
+
+        if not renames:
+            self.report({'WARNING'}, "No matching names found.")
+            return {'CANCELLED'}
+
+        renamed_count, group_count = rename.apply_renames(renames)
+
+        self.report({'INFO'}, f"Succesfully renamed {utils.plural(renamed_count, 'item')} across {utils.plural(group_count, 'nodegroup')}.")
+        return {'FINISHED'}
+
+
+class GROUP_TOOLS_OT_interface_sockets_edit(InterfaceScopeOperator, Operator):
+    bl_idname = "group_edit_tools.interface_sockets_edit"
+    bl_label = "Edit Matching Sockets"
+    bl_description = "Set a property on every socket matching the given filters, in the active group or in every selected group"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    scope : EnumProperty(
+        name="Scope",
+        items=(
+            ('ACTIVE', "Active Group", "Only edit sockets of the active group"),
+            ('SELECTED', "Selected Groups", "Edit sockets of the active group and of the groups of every selected node"),
+        ),
+        default='ACTIVE',
+    )
+
+    name_pattern : StringProperty(name="Name", description="Only include sockets whose names match this pattern", default="")
+    use_regex : BoolProperty(name="Regular Expression", description="Match names with a regular expression instead of a glob pattern", default=False)
+    in_out : EnumProperty(name="Direction", items=batch.in_out_items, default='ANY')
+    socket_type : EnumProperty(name="Socket Type", items=batch.socket_type_items, default='ANY')
+    panel_name : StringProperty(name="Panel", description="Only include sockets inside of panels with this name", default="")
+
+    prop_name : EnumProperty(name="Property", items=batch.socket_prop_items, default='default_value')
+    float_value : FloatProperty(name="Value", default=0.0)
+    bool_value : BoolProperty(name="Value", default=False)
+    vector_value : FloatVectorProperty(name="Value", size=4, default=(0.0, 0.0, 0.0, 1.0))
+    string_value : StringProperty(name="Value", description="Identifier of the value, such as 'FACTOR' for subtypes", default="")
+
+    def fetch_sockets(self, context):
+        for tree in self.fetch_groups(context):
+            sockets = batch.find_sockets(
+                tree,
+                name_pattern=self.name_pattern,
+                use_regex=self.use_regex,
+                socket_type=self.socket_type,
+                in_out=self.in_out,
+                panel_name=self.panel_name,
+            )
+
+            if sockets:
+                yield tree, sockets
+
+    def values(self):
+        return {'FLOAT': self.float_value, 'BOOLEAN': self.bool_value, 'VECTOR': self.vector_value, 'STRING': self.string_value}
+
+    def draw(self, context):
+        layout = self.layout
+        layout.use_property_split = True
+        layout.use_property_decorate = False
+
+        layout.prop(self, "scope")
+
+        row = layout.row(align=True)
+        row.prop(self, "name_pattern")
+        row.prop(self, "use_regex", text="", icon='SORTBYEXT')
+
+        layout.prop(self, "in_out")
+        layout.prop(self, "socket_type")
+        layout.prop(self, "panel_name", icon='MENU_PANEL')
+        layout.separator()
+
+        try:
+            matches = list(self.fetch_sockets(context))
+        except re.error:
+            layout.label(text="Invalid regular expression", icon='ERROR')
+            return
+
+        socket_count = sum(len(sockets) for _, sockets in matches)
+        prop_types = {batch.socket_prop_type(s, self.prop_name) for _, sockets in matches for s in sockets}
+
+        layout.prop(self, "prop_name")
+
+        # Only the fields for the kinds of values the matching sockets hold are shown
+        if prop_types & {'FLOAT', 'INT'}:
+            layout.prop(self, "float_value")
+        if 'VECTOR' in prop_types:
+            layout.prop(self, "vector_value")
+        if 'BOOLEAN' in prop_types:
+            layout.prop(self, "bool_value")
+        if prop_types & {'ENUM', 'STRING'}:
+            layout.prop(self, "string_value")
+
+        layout.label(text=f"{utils.plural(socket_count, 'socket')} in {utils.plural(len(matches), 'nodegroup')}", icon='INFO')
+
+    def invoke(self, context, event):
+        self.store_group(context)
+        return context.window_manager.invoke_props_dialog(self, width=350)
+
+    def execute(self, context):
+        try:
+            matches = list(self.fetch_sockets(context))
+        except re.error as error:
+            self.report({'ERROR'}, f"Invalid regular expression: {error}")
+            return {'CANCELLED'}
 
-        prop_count = len(copy_props)
-        self.report({'INFO'}, f"Successfully copied {prop_count} {'properties' if prop_count != 1 else 'properties'} from group: \"{active_group.name}\"")
+        if not matches:
+            self.report({'WARNING'}, "No matching sockets found.")
+            return {'CANCELLED'}
+
+        values = self.values()
+        changed_count = 0
+        failed_count = 0
+        changed_groups = 0
+
+        for tree, sockets in matches:
+            changed, failed = batch.set_socket_values(sockets, self.prop_name, values)
+            changed_count += changed
+            failed_count += failed
+            changed_groups += changed > 0
+
+        if failed_count > 0:
+            self.report({'WARNING'}, f"\"{self.prop_name}\" couldn't be set on {utils.plural(failed_count, 'socket')}.")
+
+        if changed_count == 0:
+            self.report({'WARNING'}, "Matching sockets are already up-to-date.")
+            return {'CANCELLED'}
+
+        self.report({'INFO'}, (
+            f"Succesfully updated {utils.plural(changed_count, 'socket')} "
+            f"across {utils.plural(changed_groups, 'nodegroup')}."
+            ))
 
         return {'FINISHED'}
 
@@ -74,10 +492,26 @@ if bpy.app.version >= (4, 4, 0):
             description="Specifies which location the active item is moved to",
             items=(
                 ('UP', "Move Up", ""),
-                ('DOWN', "Move Down", "")
+                ('DOWN', "Move Down", ""),
+                ('TOP', "Move to Top", "Move the item to the top of its panel"),
+                ('BOTTOM', "Move to Bottom", "Move the item to the bottom of its panel"),
             ),
         )
 
+        steps: IntProperty(
+            name="Steps",
+            description="Number of times the item is moved up or down, applied as a single move",
+            default=1,
+            min=1,
+        )
+
+        use_selection: BoolProperty(
+            name="Selected Items",
+            description="Move every selected item instead of only the active one",
+            default=False,
+            options={'SKIP_SAVE'},
+        )
+
         @classmethod
         @utils.return_false_when(AttributeError)
         def poll(cls, context):
@@ -89,16 +523,12 @@ if bpy.app.version >= (4, 4, 0):
                 tree.interface.active is not None
             ))
 
-        def should_change_parents(self, active_item):
-            similar_items = utils.similar_items(active_item)
-            last_index = (len(similar_items) - 1)
-            in_base_panel = active_item.parent.parent is None
-
-            for i, item in enumerate(similar_items):
-                if item == active_item:
-                    break
+        def should_change_parents(self, plan, entry):
+            i = plan.kind_index(entry)
+            last_index = len(plan.similar_items(entry)) - 1
+            in_base_panel = plan.parent_of(plan.parent_of(entry)) is None
 
-            if utils.is_panel(active_item):
+            if entry.is_panel:
                 if self.direction == "UP":
                     return not (i == 0) or not in_base_panel
                 elif self.direction == "DOWN":
@@ -107,114 +537,133 @@ if bpy.app.version >= (4, 4, 0):
                 if self.direction == "UP":
                     return i == 0 and not in_base_panel
                 elif self.direction == "DOWN":
-                    return i == last_index 
-        
-        @staticmethod
-        def adjacent_panel(panel, direction):
-            if panel.parent is None:
-                return None
-
-            items = filter(utils.is_panel, panel.parent.interface_items)
-
-            try:
-                if direction == "UP":
-                    return next(i[0] for i in itertools.pairwise(items) if i[1] == panel)
-                elif direction == "DOWN":
-                    return next(i[1] for i in itertools.pairwise(items) if i[0] == panel)
-            except StopIteration:
-                return None
-            
-        @staticmethod
-        def endpoint_panel(panel, direction):
-            items = panel.interface_items
+                    return i == last_index
 
-            try:
-                if direction == "UP":
-                    return next(i for i in filter(utils.is_panel, reversed(items)))
-                elif direction == "DOWN":
-                    return next(i for i in filter(utils.is_panel, items))
-            except StopIteration:
-                return None
-            
-        def next_panel_up(self, panel):
+        def next_panel_up(self, plan, panel):
             while True:
                 target = panel
-                panel = self.endpoint_panel(target, self.direction)
-                
+                panel = plan.endpoint_panel(target, self.direction)
+
                 if panel is None:
                     return target
 
-        def next_panel_down(self, panel):
-            target = panel
+        def next_panel_down(self, plan, entry):
+            target = entry
             while True:
-                if target.parent is None:
+                if plan.parent_of(target) is None:
                     return None
 
-                panel = self.adjacent_panel(target, self.direction)
+                panel = plan.adjacent_panel(target, self.direction)
                 if panel is not None:
                     return panel
-                
-                target = target.parent
 
-        def get_nearest_panel_up(self, active_item):
-            if utils.is_panel(active_item):
-                target = self.adjacent_panel(active_item, self.direction)
+                target = plan.parent_of(target)
+
+        def get_nearest_panel_up(self, plan, entry):
+            parent = plan.parent_of(entry)
+
+            if entry.is_panel:
+                target = plan.adjacent_panel(entry, self.direction)
                 if target is not None:
                     return target
             else:
-                target = self.adjacent_panel(active_item.parent, self.direction)
+                target = plan.adjacent_panel(parent, self.direction)
                 if target is not None:
-                    return self.next_panel_up(target)
+                    return self.next_panel_up(plan, target)
 
-            return active_item.parent.parent
+            return plan.parent_of(parent)
 
-        def get_nearest_panel_down(self, active_item):
-            if utils.is_panel(active_item):
-                target = self.adjacent_panel(active_item, self.direction)
+        def get_nearest_panel_down(self, plan, entry):
+            if entry.is_panel:
+                target = plan.adjacent_panel(entry, self.direction)
                 if target is None:
-                    return active_item.parent.parent
+                    return plan.parent_of(plan.parent_of(entry))
             else:
-                target = self.endpoint_panel(active_item.parent, self.direction)
+                target = plan.endpoint_panel(plan.parent_of(entry), self.direction)
                 if target is None:
-                    return self.next_panel_down(active_item)
-                
+                    return self.next_panel_down(plan, entry)
+
             return target
 
-        def execute(self, context):
-            interface = context.group_edit_tree_to_edit.interface
-            active_item = interface.active
-            offset = -1 if self.direction == 'UP' else 2
+        def step(self, plan, entry):
+            parent = plan.parent_of(entry)
 
-            if not self.should_change_parents(active_item):
-                old_position = active_item.position
-                interface.move(active_item, active_item.position + offset)
+            if not self.should_change_parents(plan, entry):
+                old_position = plan.position_of(entry)
+                offset = -1 if self.direction == 'UP' else 1
+                first, last = plan.kind_range(entry)
+                new_position = min(max(first, old_position + offset), last)
 
-                if old_position == active_item.position:
-                    return {'CANCELLED'}
+                if new_position == old_position:
+                    return False
 
-                interface.active_index = active_item.index
-                return {'FINISHED'}
+                plan.move(entry, parent, new_position)
+                return True
 
             if self.direction == "UP":
-                target_panel = self.get_nearest_panel_up(active_item)
-                if utils.is_panel(active_item) and (target_panel == active_item.parent.parent):
-                    target_index = active_item.parent.position
+                target_panel = self.get_nearest_panel_up(plan, entry)
+                if target_panel is None:
+                    return False
+
+                if entry.is_panel and (target_panel == plan.parent_of(parent)):
+                    target_index = plan.position_of(parent)
                 else:
-                    target_index = len(target_panel.interface_items)
-                
+                    target_index = len(plan.children_of(target_panel))
+
             elif self.direction == "DOWN":
-                target_panel = self.get_nearest_panel_down(active_item)
-                if utils.is_panel(active_item) and (target_panel == active_item.parent.parent):
-                    target_index = active_item.parent.position + 1
+                target_panel = self.get_nearest_panel_down(plan, entry)
+                if target_panel is None:
+                    return False
+
+                if entry.is_panel and (target_panel == plan.parent_of(parent)):
+                    target_index = plan.position_of(parent) + 1
                 else:
-                    has_panel_toggle = utils.get_panel_toggle(target_panel) is not None
-                    target_index = has_panel_toggle
+                    target_index = plan.first_position(target_panel)
+
+            plan.move(entry, target_panel, target_index)
+            return True
 
-            if target_panel is None:
+        @transaction.interface_transaction
+        def execute(self, context, transaction):
+            tree = context.group_edit_tree_to_edit
+
+            items = selection.target_items(tree, self.use_selection)
+            if not items:
                 return {'CANCELLED'}
-            
-            interface.move_to_parent(active_item, target_panel, target_index)
-            interface.active_index = active_item.index
+
+            snapshot = interface_index.fetch_snapshot(tree, *items)
+            entries = snapshot.outermost(snapshot.entry(i) for i in items)
+            plan = interface_index.LayoutPlan(snapshot)
+
+            # Items are moved one after the other, starting with the one closest to
+            # where they're headed, so that they keep their order without blocking each other.
+            # Blender keeps items grouped by kind, so the top and bottom are those of the item's kind.
+            if self.direction == 'TOP':
+                for entry in reversed(entries):
+                    first, _last = plan.kind_range(entry)
+                    if plan.position_of(entry) != first:
+                        plan.move(entry, entry.parent, first)
+            elif self.direction == 'BOTTOM':
+                for entry in entries:
+                    _first, last = plan.kind_range(entry)
+                    if plan.position_of(entry) != last:
+                        plan.move(entry, entry.parent, last)
+            else:
+                ordered = entries if (self.direction == 'UP') else entries[::-1]
+
+                for _ in range(self.steps):
+                    results = [self.step(plan, entry) for entry in ordered]
+                    if not any(results):
+                        break
+
+            if not any(plan.has_moved(e) for e in entries):
+                return {'CANCELLED'}
+
+            plan.apply(transaction)
+
+            if not self.use_selection:
+                transaction.activate(items[0])
+
             return {'FINISHED'}
 
 else:
@@ -247,10 +696,9 @@ else:
         @staticmethod
         def fetch_all_parents(interface):
             # The root panel that sockets are parented to by default is not directly accessible
-            # Hence we retrieve it by creating a new socket and getting its parent
-            new_socket = interface.new_socket(name="DUMMY_SOCKET")
-            yield new_socket.parent
-            interface.remove(new_socket)
+            base_panel = utils.fetch_base_panel(interface.id_data)
+            if base_panel is not None:
+                yield base_panel
 
             # Retrieve all other panels
             for item in interface.items_tree:
@@ -283,14 +731,16 @@ else:
             
             return next_parent
 
-        def execute(self, context):
+        @transaction.interface_transaction
+        def execute(self, context, transaction):
             interface = context.group_edit_tree_to_edit.interface
             active_item = interface.active
 
             offset = -1 if self.direction == 'UP' else 2
 
             old_position = active_item.position
-            interface.move(active_item, active_item.position + offset)
+            transaction.move(active_item, active_item.position + offset)
+            transaction.flush()
 
             if old_position == active_item.position and active_item.item_type == 'SOCKET':
                 parents = tuple(self.fetch_all_parents(interface))
@@ -303,11 +753,11 @@ else:
                     new_position = 0
 
                 if new_parent != active_item.parent:
-                    interface.move_to_parent(active_item, new_parent, new_position)
+                    transaction.move_to_parent(active_item, new_parent, new_position)
                 else:
                     return {'CANCELLED'}
 
-            interface.active_index = active_item.index
+            transaction.activate(active_item)
             return {'FINISHED'}
 
 
@@ -334,15 +784,26 @@ class GROUP_TOOLS_OT_active_interface_item_new(Operator):
         tree = context.group_edit_tree_to_edit
         return not (tree is None or tree.is_embedded_data)
 
-    # Returns a valid socket type for the given tree or None.
+    # Socket types found by searching registered classes, keyed on the tree type.
+    # The number of registered socket classes is stored alongside each entry,
+    # since registering or unregistering add-ons can change the result.
+    valid_socket_types = {}
+
     @staticmethod
-    def find_valid_socket_type(tree):
-        socket_type = 'NodeSocketFloat'
-        # Socket type validation function is only available for custom
-        # node trees. Assume that 'NodeSocketFloat' is valid for
-        # built-in node tree types.
-        if not hasattr(tree, "valid_socket_type") or tree.valid_socket_type(socket_type):
-            return socket_type
+    def registered_socket_count():
+        # Same classes as the search walks, so that nested socket classes are counted too.
+        # Counting is cheap compared to calling `valid_socket_type` on every class.
+        count = 0
+        types_to_check = [bpy.types.NodeSocket]
+        while types_to_check:
+            t = types_to_check.pop()
+            count += 1
+            types_to_check.extend(t.__subclasses__())
+
+        return count
+
+    @staticmethod
+    def search_valid_socket_type(tree):
         # Custom nodes may not support float sockets, search all
         # registered socket subclasses.
         types_to_check = [bpy.types.NodeSocket]
@@ -354,7 +815,28 @@ class GROUP_TOOLS_OT_active_interface_item_new(Operator):
             # Test all subclasses
             types_to_check.extend(t.__subclasses__())
 
-    def execute(self, context):
+    # Returns a valid socket type for the given tree or None.
+    @classmethod
+    def find_valid_socket_type(cls, tree):
+        prefs = utils.fetch_user_preferences()
+        socket_type = prefs.default_socket_type(tree.bl_idname) or 'NodeSocketFloat'
+        # Socket type validation function is only available for custom
+        # node trees. Assume that the default type is valid for
+        # built-in node tree types.
+        if not hasattr(tree, "valid_socket_type") or tree.valid_socket_type(socket_type):
+            return socket_type
+
+        socket_count = cls.registered_socket_count()
+        cached_count, cached_type = cls.valid_socket_types.get(tree.bl_idname, (None, None))
+        if cached_count == socket_count:
+            return cached_type
+
+        socket_type = cls.search_valid_socket_type(tree)
+        cls.valid_socket_types[tree.bl_idname] = (socket_count, socket_type)
+        return socket_type
+
+    @transaction.interface_transaction
+    def execute(self, context, transaction):
         tree = context.group_edit_tree_to_edit
         interface = tree.interface
 
@@ -363,22 +845,60 @@ class GROUP_TOOLS_OT_active_interface_item_new(Operator):
         active_pos = active_item.position if active_item else -1
 
         if self.item_type == 'INPUT':
-            item = interface.new_socket("Socket", socket_type=self.find_valid_socket_type(tree), in_out='INPUT')
+            item = transaction.new_socket("Socket", socket_type=self.find_valid_socket_type(tree), in_out='INPUT')
         elif self.item_type == 'OUTPUT':
-            item = interface.new_socket("Socket", socket_type=self.find_valid_socket_type(tree), in_out='OUTPUT')
+            item = transaction.new_socket("Socket", socket_type=self.find_valid_socket_type(tree), in_out='OUTPUT')
         elif self.item_type == 'PANEL':
-            item = interface.new_panel("Panel")
+            item = transaction.new_panel("Panel")
         else:
             return {'CANCELLED'}
 
         if active_item is not None:
             # Insert into active panel if possible, otherwise insert after active item.
             if active_item.item_type == 'PANEL' and item.item_type != 'PANEL':
-                interface.move_to_parent(item, active_item, len(active_item.interface_items))
+                transaction.move_to_parent(item, active_item, len(active_item.interface_items))
             else:
-                interface.move_to_parent(item, active_item.parent, active_pos + 1)
+                transaction.move_to_parent(item, active_item.parent, active_pos + 1)
 
-        interface.active = item
+        transaction.activate(item)
+        return {'FINISHED'}
+
+
+class GROUP_TOOLS_OT_default_socket_type_set(Operator):
+    '''Use the type of the active socket for new sockets added to this type of node tree'''
+    bl_idname = "group_edit_tools.default_socket_type_set"
+    bl_label = "Use as Default Socket Type"
+    bl_options = {'REGISTER', 'INTERNAL'}
+
+    @classmethod
+    @utils.return_false_when(AttributeError)
+    def poll(cls, context):
+        tree = context.group_edit_tree_to_edit
+        if not (tree is None or tree.is_embedded_data) and (tree.interface.active is not None):
+            return tree.interface.active.item_type == 'SOCKET'
+
+    def execute(self, context):
+        tree = context.group_edit_tree_to_edit
+        socket_type = tree.interface.active.socket_type
+
+        prefs = utils.fetch_user_preferences()
+        prefs.set_default_socket_type(tree.bl_idname, socket_type)
+
+        self.report({'INFO'}, f"New sockets in \"{tree.bl_idname}\" trees now default to \"{socket_type}\"")
+        return {'FINISHED'}
+
+
+class GROUP_TOOLS_OT_default_socket_type_remove(Operator):
+    '''Remove this default socket type'''
+    bl_idname = "group_edit_tools.default_socket_type_remove"
+    bl_label = "Remove Default Socket Type"
+    bl_options = {'REGISTER', 'INTERNAL'}
+
+    index : IntProperty(name="Index", default=0)
+
+    def execute(self, context):
+        prefs = utils.fetch_user_preferences()
+        prefs.default_socket_types.remove(self.index)
         return {'FINISHED'}
 
 
@@ -388,6 +908,13 @@ class GROUP_TOOLS_OT_active_interface_item_duplicate(Operator):
     bl_label = "Duplicate Item"
     bl_options = {'REGISTER', 'UNDO'}
 
+    use_selection : BoolProperty(
+        name="Selected Items",
+        description="Duplicate every selected item instead of only the active one",
+        default=False,
+        options={'SKIP_SAVE'},
+    )
+
     @classmethod
     @utils.return_false_when(AttributeError)
     def poll(cls, context):
@@ -395,14 +922,22 @@ class GROUP_TOOLS_OT_active_interface_item_duplicate(Operator):
         if not (tree is None or tree.is_embedded_data):
             return (tree.interface.active is not None)
 
-    def execute(self, context):
+    @transaction.interface_transaction
+    def execute(self, context, transaction):
         tree = context.group_edit_tree_to_edit
-        interface = tree.interface
-        item = interface.active
+        items = selection.target_items(tree, self.use_selection)
+
+        if not items:
+            return {'CANCELLED'}
 
-        item_copy = interface.copy(item)
-        interface.active = item_copy
+        # Copies of panels include their content, so selected items inside of them are skipped
+        snapshot = interface_index.fetch_snapshot(tree, *items)
+        item_copies = [transaction.copy(e.item) for e in snapshot.outermost(snapshot.entry(i) for i in items)]
 
+        if self.use_selection:
+            selection.interface_selection.select(tree, item_copies)
+
+        transaction.activate(item_copies[-1])
         return {'FINISHED'}
 
 
@@ -423,26 +958,12 @@ class GROUP_TOOLS_OT_active_interface_item_swap_io_type(Operator):
             "max_value",
             )
 
-    @staticmethod
-    def relative_position(active_item):
-        base_pos = 0
-        offset = 0
-
-        inputs = (i for i in active_item.parent.interface_items if i.in_out == "INPUT")
-
-        if active_item.in_out == "INPUT":
-            base_pos = 0
-            for i, item in enumerate(inputs):
-                if item == active_item:
-                    offset = i
-                    break
-        else:
-            for item in inputs:
-                base_pos = item.position
-                break
-            offset = active_item.position
-
-        return base_pos + offset
+    use_selection : BoolProperty(
+        name="Selected Items",
+        description="Swap every selected socket instead of only the active one",
+        default=False,
+        options={'SKIP_SAVE'},
+    )
 
     @classmethod
     @utils.return_false_when(AttributeError)
@@ -452,28 +973,31 @@ class GROUP_TOOLS_OT_active_interface_item_swap_io_type(Operator):
             active_item = tree.interface.active
             return active_item.item_type == "SOCKET" and active_item.socket_type != "NodeSocketMenu"
 
-    def execute(self, context):
+    @transaction.interface_transaction
+    def execute(self, context, transaction):
         tree = context.group_edit_tree_to_edit
-        interface = tree.interface
+        active_item = tree.interface.active
+        items = [i for i in selection.target_items(tree, self.use_selection) if swap_io.can_swap(i)]
 
-        # Remember active item and position to determine target position.
-        active_item = interface.active
-
-        if active_item.in_out == "OUTPUT":
-            opposite_type = "INPUT"
-        else:
-            opposite_type = "OUTPUT"
-        item = interface.new_socket("Socket", socket_type=active_item.socket_type, in_out=opposite_type)
+        if not items:
+            self.report({'WARNING'}, "No sockets to swap.")
+            return {'CANCELLED'}
 
-        for prop in self.props:
-            if hasattr(item, prop):
-                setattr(item, prop, getattr(active_item, prop))
+        new_items, restored, dropped = swap_io.swap_items(transaction, tree, items, self.props)
 
+        active_item = new_items.get(active_item.as_pointer()) if active_item is not None else None
         if active_item is not None:
-            interface.move_to_parent(item, active_item.parent, self.relative_position(active_item))
+            transaction.activate(active_item)
+
+        if self.use_selection:
+            selection.interface_selection.clear(tree)
+
+        message = f"Succesfully swapped {utils.plural(len(new_items), 'socket')}, keeping {utils.plural(restored, 'link')}"
+        if dropped > 0:
+            self.report({'WARNING'}, f"{message}. {utils.plural(dropped, 'link')} had no matching socket to move to.")
+        else:
+            self.report({'INFO'}, f"{message}.")
 
-        interface.remove(active_item)
-        interface.active = item
         return {'FINISHED'}
 
 
@@ -483,6 +1007,13 @@ class GROUP_TOOLS_OT_active_interface_item_remove(Operator):
     bl_label = "Remove Item"
     bl_options = {'REGISTER', 'UNDO'}
 
+    use_selection : BoolProperty(
+        name="Selected Items",
+        description="Remove every selected item instead of only the active one",
+        default=False,
+        options={'SKIP_SAVE'},
+    )
+
     @classmethod
     @utils.return_false_when(AttributeError)
     def poll(cls, context):
@@ -491,19 +1022,30 @@ class GROUP_TOOLS_OT_active_interface_item_remove(Operator):
             return (tree.interface.active is not None)
 
     if bpy.app.version >= (4, 5, 0):
-        def execute(self, context):
+        @transaction.interface_transaction
+        def execute(self, context, transaction):
             tree = context.group_edit_tree_to_edit
             interface = tree.interface
-            item = interface.active
+            items = selection.target_items(tree, self.use_selection)
 
-            if item is None:
+            if not items:
                 return {'CANCELLED'}
 
-            panel_toggle = utils.get_panel_toggle(item)
-            if panel_toggle is not None:
-                interface.remove(panel_toggle)
-
-            interface.remove(item)
+            # Selected items inside of a selected panel go along with it, instead of being removed twice
+            snapshot = interface_index.fetch_snapshot(tree, *items)
+            items = [e.item for e in snapshot.outermost(snapshot.entry(i) for i in items)]
+
+            removed = set()
+            for item in items:
+                # Toggles would otherwise be left behind in the parent of their panel
+                for i in (utils.get_panel_toggle(item), item):
+                    if i is not None and i.as_pointer() not in removed:
+                        removed.add(i.as_pointer())
+                        transaction.remove(i)
+
+            transaction.flush()
+            if self.use_selection:
+                selection.interface_selection.clear(tree)
             interface.active_index = min(interface.active_index, len(interface.items_tree) - 1)
             
             # If what's about to be the active item is a toggle, 
@@ -513,33 +1055,146 @@ class GROUP_TOOLS_OT_active_interface_item_remove(Operator):
 
             return {'FINISHED'}
     else:
-        def execute(self, context):
+        @transaction.interface_transaction
+        def execute(self, context, transaction):
             tree = context.group_edit_tree_to_edit
             interface = tree.interface
-            item = interface.active
+            items = selection.target_items(tree, self.use_selection)
 
-            if item is None:
+            if not items:
                 return {'CANCELLED'}
 
-            interface.remove(item)
+            # Selected items inside of a selected panel go along with it, instead of being removed twice
+            snapshot = interface_index.fetch_snapshot(tree, *items)
+            items = [e.item for e in snapshot.outermost(snapshot.entry(i) for i in items)]
+
+            for item in items:
+                transaction.remove(item)
+
+            transaction.flush()
+            if self.use_selection:
+                selection.interface_selection.clear(tree)
             interface.active_index = min(interface.active_index, len(interface.items_tree) - 1)
 
             return {'FINISHED'}
+
+
+class GROUP_TOOLS_OT_interface_remove_unused(Operator):
+    '''Remove every socket that isn't connected inside of the group, and that no instance of the group links or overrides'''
+    bl_idname = "group_edit_tools.interface_remove_unused"
+    bl_label = "Remove Unused Sockets"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    # The dialog may not keep the context pointer around, so the group is stored by name
+    group_name : StringProperty(name="Group", default="", options={'SKIP_SAVE', 'HIDDEN'})
+
+    @classmethod
+    @utils.return_false_when(AttributeError)
+    def poll(cls, context):
+        tree = context.group_edit_tree_to_edit
+        return not (tree is None or tree.is_embedded_data)
+
+    def fetch_tree(self, context):
+        if self.group_name:
+            return bpy.data.node_groups.get(self.group_name)
+
+        return getattr(context, "group_edit_tree_to_edit", None)
+
+    def invoke(self, context, event):
+        tree = self.fetch_tree(context)
+        self.group_name = tree.name
+        unused = usage_index.unused_sockets(tree)
+
+        if unused is None:
+            self.report({'WARNING'}, f"\"{tree.name}\" is used by modifiers or as a tool, its sockets can't be checked for use.")
+            return {'CANCELLED'}
+
+        if not unused:
+            self.report({'INFO'}, "No unused sockets found.")
+            return {'CANCELLED'}
+
+        return context.window_manager.invoke_props_dialog(self, width=300)
+
+    def draw(self, context):
+        layout = self.layout
+        tree = self.fetch_tree(context)
+        unused = usage_index.unused_sockets(tree) or ()
+
+        layout.label(text=f"Remove {utils.plural(len(unused), 'socket')} from \"{tree.name}\"?")
+
+        col = layout.column(align=True)
+        for item in unused[:20]:
+            col.label(text=item.name, icon='IMPORT' if item.in_out == 'INPUT' else 'EXPORT')
+
+        if len(unused) > 20:
+            col.label(text=f"... and {len(unused) - 20} more", icon='BLANK1')
+
+    def execute(self, context):
+        tree = self.fetch_tree(context)
+        if tree is None:
+            return {'CANCELLED'}
+
+        unused = usage_index.unused_sockets(tree)
+        if not unused:
+            self.report({'INFO'}, "No unused sockets found.")
+            return {'CANCELLED'}
+
+        with transaction.InterfaceTransaction(tree, name=self.bl_label, push_undo=False) as edits:
+            for item in unused:
+                edits.remove(item)
+
+            edits.flush()
+            interface = tree.interface
+            interface.active_index = min(interface.active_index, len(interface.items_tree) - 1)
+
+        selection.interface_selection.clear(tree)
+
+        self.report({'INFO'}, f"Succesfully removed {utils.plural(len(unused), 'unused socket')} from \"{tree.name}\".")
+        return {'FINISHED'}
     
     
+def panel_search_items(self, context):
+    return GROUP_TOOLS_OT_parent_to_panel.search_items
+
+
 class GROUP_TOOLS_OT_parent_to_panel(Operator):
     '''Parents the active item to the specified panel'''
     bl_idname = "group_edit_tools.parent_to_panel"
     bl_label = "Parent to Panel"
     bl_options = {'REGISTER', 'UNDO'}
+    bl_property = "panel"
 
     parent_index : IntProperty(name="Parent Index", default=0)
 
+    use_search : BoolProperty(
+        name="Search",
+        description="Pick the panel from a search popup, filtered by panel name or path",
+        default=False,
+        options={'HIDDEN', 'SKIP_SAVE'},
+    )
+
+    use_selection : BoolProperty(
+        name="Selected Items",
+        description="Parent every selected item instead of only the active one",
+        default=False,
+        options={'SKIP_SAVE'},
+    )
+
+    panel : EnumProperty(name="Panel", items=panel_search_items)
+
+    # Search popups call back into the operator outside of the context that invoked them,
+    # so the tree and item being edited are remembered by name and index instead.
+    # The item list is kept here as well, since Blender needs the strings to outlive the callback.
+    pending_search = None
+    search_items = []
 
     if bpy.app.version >= (4, 4, 0):
         @classmethod
         @utils.return_false_when(AttributeError)
         def poll(cls, context):
+            if not hasattr(context, "group_edit_tree_to_edit"):
+                return cls.pending_search is not None
+
             tree = context.group_edit_tree_to_edit
             if not (tree is None or tree.is_embedded_data) and (tree.interface.active is not None):
                 return context.group_edit_active_item is not None
@@ -547,54 +1202,634 @@ class GROUP_TOOLS_OT_parent_to_panel(Operator):
         @classmethod
         @utils.return_false_when(AttributeError)
         def poll(cls, context):
+            if not hasattr(context, "group_edit_tree_to_edit"):
+                return cls.pending_search is not None
+
             tree = context.group_edit_tree_to_edit
             if not (tree is None or tree.is_embedded_data) and (tree.interface.active is not None):
                 return context.group_edit_active_item.item_type == 'SOCKET'
 
-    def execute(self, context):
+    @classmethod
+    def build_search_items(cls, tree, active_item):
+        snapshot = interface_index.fetch_snapshot(tree, active_item)
+        paths = snapshot.panel_paths
+
+        cls.search_items = [
+            (str(panel.item.index), paths[panel] or "(None)", "")
+            for panel in snapshot.valid_parents(snapshot.entry(active_item))
+            ]
+
+    def fetch_targets(self, context):
+        if hasattr(context, "group_edit_tree_to_edit"):
+            return context.group_edit_tree_to_edit, context.group_edit_active_item
+
+        tree_name, item_index = self.pending_search
+        tree = bpy.data.node_groups[tree_name]
+        return tree, tree.interface.items_tree[item_index]
+
+    def invoke(self, context, event):
+        if not self.use_search:
+            return self.execute(context)
+
         tree = context.group_edit_tree_to_edit
-        interface = tree.interface
         active_item = context.group_edit_active_item
+        self.build_search_items(tree, active_item)
+
+        if not self.search_items:
+            return {'CANCELLED'}
+
+        GROUP_TOOLS_OT_parent_to_panel.pending_search = (tree.name, active_item.index)
+        context.window_manager.invoke_search_popup(self)
+        return {'RUNNING_MODAL'}
+
+    def execute(self, context):
+        try:
+            tree, active_item = self.fetch_targets(context)
+        except (KeyError, IndexError, TypeError):
+            return {'CANCELLED'}
+        finally:
+            GROUP_TOOLS_OT_parent_to_panel.pending_search = None
+
+        interface = tree.interface
 
         if active_item is None:
             return {'CANCELLED'}
 
-        if self.parent_index != -1:
-            parent = interface.items_tree[self.parent_index]
+        parent_index = int(self.panel) if self.use_search else self.parent_index
+
+        if parent_index != -1:
+            parent = interface.items_tree[parent_index]
         else:
             parent = utils.fetch_base_panel(tree)
 
-        interface.move_to_parent(active_item, parent, len(parent.interface_items))
-        interface.active = active_item
+        if self.use_selection:
+            items = selection.selected_items(tree)
+        else:
+            items = (active_item,)
+
+        snapshot = interface_index.fetch_snapshot(tree, *items)
+        target = snapshot.entry(parent)
+        plan = interface_index.LayoutPlan(snapshot)
+
+        if target is None:
+            return {'CANCELLED'}
+
+        for entry in snapshot.outermost(snapshot.entry(i) for i in items):
+            if entry.is_panel and (bpy.app.version < (4, 4, 0) or entry is target or snapshot.is_inside(target, entry)):
+                continue
+
+            plan.move(entry, target, plan.last_position(target, entry))
+
+        if not plan.moved:
+            return {'CANCELLED'}
+
+        # The context pointer may be missing when called from the search popup,
+        # so the transaction is opened here rather than through the decorator
+        with transaction.InterfaceTransaction(tree, name=self.bl_label, push_undo=False) as edits:
+            plan.apply(edits)
+
+            if not self.use_selection:
+                edits.activate(active_item)
+
+        return {'FINISHED'}
+
+
+class GROUP_TOOLS_OT_interface_items_copy(Operator):
+    '''Copy the active item (or the selected items) to the clipboard, including the content of panels'''
+    bl_idname = "group_edit_tools.interface_items_copy"
+    bl_label = "Copy Items"
+    bl_options = {'REGISTER'}
+
+    use_selection : BoolProperty(
+        name="Selected Items",
+        description="Copy every selected item instead of only the active one",
+        default=False,
+        options={'SKIP_SAVE'},
+    )
+
+    @classmethod
+    @utils.return_false_when(AttributeError)
+    def poll(cls, context):
+        tree = context.group_edit_tree_to_edit
+        return tree is not None and (tree.interface.active is not None)
+
+    def execute(self, context):
+        tree = context.group_edit_tree_to_edit
+        items = selection.target_items(tree, self.use_selection)
+
+        if not items:
+            return {'CANCELLED'}
+
+        text, count = clipboard.copy_items(tree, items)
+        context.window_manager.clipboard = text
+
+        self.report({'INFO'}, f"Copied {utils.plural(count, 'item')} to the clipboard.")
+        return {'FINISHED'}
+
+
+class GROUP_TOOLS_OT_interface_items_paste(Operator):
+    '''Paste interface items from the clipboard after the active item, or inside of the active panel'''
+    bl_idname = "group_edit_tools.interface_items_paste"
+    bl_label = "Paste Items"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    @classmethod
+    @utils.return_false_when(AttributeError)
+    def poll(cls, context):
+        tree = context.group_edit_tree_to_edit
+        return not (tree is None or tree.is_embedded_data) and utils.is_tree_editable(tree)
+
+    @transaction.interface_transaction
+    def execute(self, context, transaction):
+        tree = context.group_edit_tree_to_edit
+        active_item = tree.interface.active
+
+        if active_item is None:
+            parent, anchor = utils.fetch_base_panel(tree), None
+        elif active_item.item_type == 'PANEL':
+            parent, anchor = active_item, None
+        else:
+            parent, anchor = active_item.parent, active_item
+
+        try:
+            items, skipped = clipboard.paste_items(transaction, tree, context.window_manager.clipboard, parent, anchor)
+        except clipboard.ClipboardFormatError as error:
+            self.report({'ERROR'}, str(error))
+            return {'CANCELLED'}
+
+        if skipped:
+            self.report({'WARNING'}, f"Skipped {utils.plural(skipped, 'item')} not supported by this node tree.")
+
+        if not items:
+            return {'CANCELLED'}
+
+        transaction.activate(items[0])
+        self.report({'INFO'}, f"Pasted {utils.plural(len(items), 'item')}.")
+        return {'FINISHED'}
+
+
+class GROUP_TOOLS_OT_interface_sort(Operator):
+    '''Sort the items inside of the active panel, moving as few items as possible'''
+    bl_idname = "group_edit_tools.interface_sort"
+    bl_label = "Sort Items"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    sort_by : EnumProperty(
+        name="Sort By",
+        items=(
+            ('NAME', "Name", "Sort items alphabetically"),
+            ('TYPE', "Socket Type", "Sort sockets by type, then by name"),
+        ),
+        default='NAME',
+    )
+
+    scope : EnumProperty(
+        name="Scope",
+        items=(
+            ('PANEL', "Active Panel", "Sort the panel containing the active item (or the active panel itself)"),
+            ('TREE', "Whole Tree", "Sort every panel in the interface"),
+        ),
+        default='PANEL',
+    )
+
+    reverse : BoolProperty(name="Reverse", default=False)
+
+    @classmethod
+    @utils.return_false_when(AttributeError)
+    def poll(cls, context):
+        tree = context.group_edit_tree_to_edit
+        if not (tree is None or tree.is_embedded_data):
+            return len(tree.interface.items_tree) > 1
+
+    def sort_key(self, entry):
+        name = entry.item.name.casefold()
+
+        if self.sort_by == 'TYPE' and not entry.is_panel:
+            return (entry.item.socket_type, name)
+        else:
+            return (name,)
+
+    def sorted_children(self, children):
+        # Items only trade places with items of the same kind, since Blender keeps
+        # toggles first, then outputs, then inputs, in every panel
+        groups = {}
+        for entry in children:
+            groups.setdefault(entry.kind, []).append(entry)
+
+        for kind, entries in groups.items():
+            if kind != 'TOGGLE':
+                entries.sort(key=self.sort_key, reverse=self.reverse)
+
+        slots = {kind: iter(entries) for kind, entries in groups.items()}
+        return [next(slots[e.kind]) for e in children]
+
+    def fetch_panels(self, snapshot, active_item):
+        if self.scope == 'TREE':
+            return tuple(snapshot.panels(include_root=True))
+
+        if active_item is None:
+            return (snapshot.root,)
+
+        entry = snapshot.entry(active_item)
+        return (entry if entry.is_panel else entry.parent,)
+
+    @transaction.interface_transaction
+    def execute(self, context, transaction):
+        tree = context.group_edit_tree_to_edit
+        active_item = tree.interface.active
+
+        snapshot = interface_index.fetch_snapshot(tree, *selection.target_items(tree))
+        plan = interface_index.LayoutPlan(snapshot)
+
+        moved_count = 0
+        for panel in self.fetch_panels(snapshot, active_item):
+            if panel is None or len(panel.children) < 2:
+                continue
+
+            moved_count += plan.reorder(panel, self.sorted_children(panel.children))
+
+        if moved_count == 0:
+            self.report({'INFO'}, "Items are already sorted.")
+            return {'CANCELLED'}
+
+        plan.apply(transaction)
+        transaction.flush()
+
+        # Moves that Blender doesn't allow are undone by the interface itself
+        if [i.as_pointer() for i in tree.interface.items_tree] == [e.item.as_pointer() for e in snapshot.order]:
+            self.report({'INFO'}, "Items are already sorted.")
+            return {'CANCELLED'}
+
+        self.report({'INFO'}, f"Succesfully sorted items by moving {utils.plural(moved_count, 'item')}.")
+        return {'FINISHED'}
+
+
+class GROUP_TOOLS_OT_interface_organize_by_prefix(Operator):
+    '''Move sockets into panels named after the prefixes of their names (e.g. "Noise/Scale" goes into a "Noise" panel), creating nested panels as needed'''
+    bl_idname = "group_edit_tools.interface_organize_by_prefix"
+    bl_label = "Organize into Panels"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    separator : StringProperty(name="Separator", description="Text separating panel names from the socket name", default="/")
+    strip_prefix : BoolProperty(name="Strip Prefix", description="Only keep the last part of the name on moved sockets", default=True)
+
+    @classmethod
+    @utils.return_false_when(AttributeError)
+    def poll(cls, context):
+        tree = context.group_edit_tree_to_edit
+        if not (tree is None or tree.is_embedded_data):
+            return len(tree.interface.items_tree) > 0
+
+    @transaction.interface_transaction
+    def execute(self, context, transaction):
+        tree = context.group_edit_tree_to_edit
+        active_item = tree.interface.active
+
+        if not self.separator:
+            self.report({'WARNING'}, "Separator can't be empty.")
+            return {'CANCELLED'}
+
+        # Sockets of the panel containing the active item (or of the active panel itself) are organized
+        if active_item is None:
+            panel = utils.find_base_panel(tree)
+        elif active_item.item_type == 'PANEL':
+            panel = active_item
+        else:
+            panel = active_item.parent
+
+        moved_count, created_count = organize.organize_by_prefix(transaction, tree, panel, self.separator, self.strip_prefix)
+
+        if moved_count == 0:
+            self.report({'INFO'}, f"No socket names contain \"{self.separator}\".")
+            return {'CANCELLED'}
+
+        self.report({'INFO'}, f"Succesfully moved {utils.plural(moved_count, 'socket')} into panels, creating {utils.plural(created_count, 'panel')}.")
+        return {'FINISHED'}
+
+
+class GROUP_TOOLS_OT_interface_panel_flatten(Operator):
+    '''Move every socket of the active panel and of its nested panels to where the panel is, then remove the emptied panels'''
+    bl_idname = "group_edit_tools.interface_panel_flatten"
+    bl_label = "Flatten Panel"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    add_prefix : BoolProperty(name="Add Prefix", description="Prefix socket names with the names of the panels they were in", default=False)
+    separator : StringProperty(name="Separator", description="Text separating panel names from the socket name", default="/")
+
+    @classmethod
+    @utils.return_false_when(AttributeError)
+    def poll(cls, context):
+        tree = context.group_edit_tree_to_edit
+        if tree is None or tree.is_embedded_data:
+            return False
+
+        if tree.interface.active.item_type != 'PANEL':
+            cls.poll_message_set("Active item is not a panel")
+            return False
+
+        return True
+
+    def draw(self, context):
+        layout = self.layout
+        layout.use_property_split = True
+        layout.use_property_decorate = False
+
+        layout.prop(self, "add_prefix")
+
+        row = layout.row()
+        row.active = self.add_prefix
+        row.prop(self, "separator")
+
+    @transaction.interface_transaction
+    def execute(self, context, transaction):
+        tree = context.group_edit_tree_to_edit
+        panel = tree.interface.active
+
+        items, removed_count = organize.flatten_panel(transaction, tree, panel, self.add_prefix, self.separator)
+
+        if items:
+            transaction.activate(items[0])
+
+        self.report({'INFO'}, f"Succesfully moved {utils.plural(len(items), 'socket')} out of {utils.plural(removed_count, 'panel')}.")
+        return {'FINISHED'}
+
+
+class GROUP_TOOLS_OT_library_index_update(Operator):
+    '''Index the node groups of the asset library folder in the background, skipping unchanged files'''
+    bl_idname = "group_edit_tools.library_index_update"
+    bl_label = "Update Library Index"
+    bl_options = {'REGISTER'}
+
+    # Only one indexing process runs at a time
+    process = None
+
+    @classmethod
+    def poll(cls, context):
+        if cls.process is not None and cls.process.poll() is None:
+            cls.poll_message_set("The library is already being indexed")
+            return False
+
+        return bool(utils.fetch_user_preferences("library_root"))
+
+    @classmethod
+    def check_process(cls):
+        if cls.process is not None and cls.process.poll() is None:
+            return 1.0
+
+        cls.process = None
+        for window in bpy.context.window_manager.windows:
+            for area in window.screen.areas:
+                area.tag_redraw()
+
+        return None
+
+    def execute(self, context):
+        prefs = utils.fetch_user_preferences()
+        command = [
+            bpy.app.binary_path, "-b", "--factory-startup",
+            "-P", library_index.__file__,
+            "--", bpy.path.abspath(prefs.library_root),
+            "--database", prefs.library_database_path(),
+        ]
+
+        GROUP_TOOLS_OT_library_index_update.process = subprocess.Popen(command)
+        bpy.app.timers.register(GROUP_TOOLS_OT_library_index_update.check_process, first_interval=1.0)
+
+        self.report({'INFO'}, "Indexing the asset library in the background.")
+        return {'FINISHED'}
+
+
+class GROUP_TOOLS_OT_library_group_import(Operator):
+    '''Append or link this node group from its library file'''
+    bl_idname = "group_edit_tools.library_group_import"
+    bl_label = "Import Library Group"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    filepath : StringProperty(name="File Path", subtype='FILE_PATH')
+    group_name : StringProperty(name="Group Name")
+    link : BoolProperty(name="Link", description="Link the group instead of appending a local copy", default=False)
+
+    def execute(self, context):
+        try:
+            with bpy.data.libraries.load(self.filepath, link=self.link) as (data_from, data_to):
+                if self.group_name not in data_from.node_groups:
+                    raise KeyError(self.group_name)
+
+                data_to.node_groups = [self.group_name]
+        except (OSError, KeyError):
+            self.report({'ERROR'}, f"Could not find \"{self.group_name}\" in \"{self.filepath}\", the library index may be outdated.")
+            return {'CANCELLED'}
+
+        action = "linked" if self.link else "appended"
+        self.report({'INFO'}, f"Succesfully {action} \"{self.group_name}\".")
+        return {'FINISHED'}
+
+
+nested_direction_items = (
+    ('DESCENDANTS', "Nested Groups", "Groups used inside of the group, and the groups inside of those"),
+    ('ANCESTORS', "Users", "Groups using the group, and the groups using those"),
+)
+
+
+class GROUP_TOOLS_OT_copy_to_nested_groups(Operator):
+    bl_idname = "node.group_edit_copy_to_nested_groups"
+    bl_label = "Copy to Nested Groups"
+    bl_description = "Apply properties from the active group onto every group nested inside of it, or every group using it"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    direction : EnumProperty(name="Direction", items=nested_direction_items, default='DESCENDANTS')
+
+    @classmethod
+    def poll(cls, context):
+        return utils.fetch_tree_of_active_node(context) is not None
+
+    def execute(self, context):
+        source = utils.fetch_tree_of_active_node(context)
+        prefs = utils.fetch_user_preferences()
+        prop_names = tuple(prefs.copy_from_active.props_to_copy_from(source))
+
+        graph = group_index.dependency_graph
+        targets = graph.related_groups(source, self.direction)
+
+        if not targets:
+            label = "nested groups" if (self.direction == 'DESCENDANTS') else "users"
+            self.report({'WARNING'}, f"\"{source.name}\" has no {label}.")
+            return {'CANCELLED'}
+
+        if any(graph.is_cyclic(t) for t in (source, *targets)):
+            self.report({'WARNING'}, "Some groups contain themselves, they were updated last.")
+
+        # Targets are already in topological order, starting from the groups closest to the source
+        changed_groups, prop_counts = batch.copy_properties(source, targets, prop_names)
+
+        if changed_groups == 0:
+            self.report({'WARNING'}, "Nodegroups are already up-to-date.")
+            return {'CANCELLED'}
+
+        self.report({'INFO'}, (
+            f"Successfully changed {utils.plural(prop_counts.total(), 'property', 'properties')} "
+            f"across {utils.plural(changed_groups, 'nodegroup')} from group: \"{source.name}\""
+            ))
+
+        return {'FINISHED'}
+
+
+class GROUP_TOOLS_OT_merge_duplicate_groups(Operator):
+    bl_idname = "node.group_edit_merge_duplicate_groups"
+    bl_label = "Merge Duplicate Groups"
+    bl_description = "Find nodegroups with identical interfaces, nodes, links and values, and replace every copy with a single group"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    dry_run : BoolProperty(
+        name="Dry Run",
+        description="Only report the groups that would be merged, without changing anything",
+        default=False,
+    )
+
+    def execute(self, context):
+        duplicate_sets, elapsed = dedupe.timed(dedupe.find_duplicates)
+        duplicate_count = sum(len(trees) - 1 for trees in duplicate_sets)
+
+        if duplicate_count == 0:
+            self.report({'INFO'}, f"No duplicate nodegroups found ({elapsed:.2f} s).")
+            return {'CANCELLED'}
+
+        if self.dry_run:
+            for survivor, *duplicates in duplicate_sets:
+                names = ", ".join(f"\"{t.name}\"" for t in duplicates)
+                self.report({'INFO'}, f"\"{survivor.name}\": {names}")
+
+            self.report({'INFO'}, (
+                f"Dry run: {utils.plural(duplicate_count, 'duplicate')} "
+                f"of {utils.plural(len(duplicate_sets), 'nodegroup')} found ({elapsed:.2f} s)."
+                ))
+            return {'FINISHED'}
+
+        dedupe.merge_duplicates(duplicate_sets)
+
+        self.report({'INFO'}, (
+            f"Succesfully merged {utils.plural(duplicate_count, 'duplicate')} "
+            f"into {utils.plural(len(duplicate_sets), 'nodegroup')} ({elapsed:.2f} s)."
+            ))
+        return {'FINISHED'}
+
+
+class GROUP_TOOLS_OT_interface_item_select(Operator):
+    """Select the active item (Ctrl to add or remove it from the selection, Shift to select every item up to it)"""
+    bl_idname = "group_edit_tools.interface_item_select"
+    bl_label = "Select Item"
+    bl_options = {'REGISTER', 'INTERNAL'}
+
+    mode : EnumProperty(
+        name="Mode",
+        items=(
+            ('SET', "Set", "Select only the active item"),
+            ('TOGGLE', "Toggle", "Add or remove the active item from the selection"),
+            ('RANGE', "Range", "Select every item between the last clicked item and the active one"),
+        ),
+        default='SET',
+        options={'SKIP_SAVE'},
+    )
+
+    @classmethod
+    @utils.return_false_when(AttributeError)
+    def poll(cls, context):
+        tree = context.group_edit_tree_to_edit
+        if not (tree is None or tree.is_embedded_data):
+            return (tree.interface.active is not None)
+
+    def invoke(self, context, event):
+        # Same modifiers as the outliner
+        if event.ctrl:
+            self.mode = 'TOGGLE'
+        elif event.shift:
+            self.mode = 'RANGE'
+
+        return self.execute(context)
+
+    def execute(self, context):
+        tree = context.group_edit_tree_to_edit
+        active_item = tree.interface.active
+        interface_selection = selection.interface_selection
+
+        if self.mode == 'TOGGLE':
+            interface_selection.toggle(tree, active_item)
+        elif self.mode == 'RANGE':
+            interface_selection.select_range(tree, active_item)
+        elif interface_selection.count(tree) == 1 and interface_selection.is_selected(tree, active_item):
+            interface_selection.clear(tree)
+        else:
+            interface_selection.select(tree, (active_item,))
+            interface_selection.set_anchor(tree, active_item)
+
+        if context.area is not None:
+            context.area.tag_redraw()
+
+        return {'FINISHED'}
+
+
+class GROUP_TOOLS_OT_interface_selection_clear(Operator):
+    """Deselect every item in the interface"""
+    bl_idname = "group_edit_tools.interface_selection_clear"
+    bl_label = "Clear Selection"
+    bl_options = {'REGISTER', 'INTERNAL'}
+
+    @classmethod
+    @utils.return_false_when(AttributeError)
+    def poll(cls, context):
+        return selection.interface_selection.count(context.group_edit_tree_to_edit) > 0
+
+    def execute(self, context):
+        selection.interface_selection.clear(context.group_edit_tree_to_edit)
+
+        if context.area is not None:
+            context.area.tag_redraw()
 
         return {'FINISHED'}
 
 
 if bpy.app.version >= (4, 3, 0):
+    width_scope_items = (
+        ('SELECTED', "Selected", "Only affect selected nodegroups"),
+        ('TREE', "Whole Tree", "Affect every nodegroup in the current node tree, regardless of selection"),
+    )
+
+
     class GROUP_TOOLS_OT_selected_group_default_width_set(Operator):
         '''Set the width based on the current context (applies to all selected nodegroups)'''
         bl_idname = "group_edit_tools.selected_group_default_width_set"
         bl_label = "Set Default Group Width"
         bl_options = {'REGISTER', 'UNDO'}
 
+        scope : EnumProperty(name="Scope", items=width_scope_items, default='SELECTED')
+
         @classmethod
         @utils.return_false_when(AttributeError)
         def poll(cls, context):
-            selected_nodegroups = tuple(n for n in context.selected_nodes if hasattr(n, "node_tree"))
-            return len(selected_nodegroups)
+            return context.space_data.edit_tree is not None
 
         def execute(self, context):
-            selected_nodegroups = tuple(n for n in context.selected_nodes if hasattr(n, "node_tree"))
-            old_widths = tuple(n.node_tree.default_group_node_width for n in selected_nodegroups)
+            nodes = context.space_data.edit_tree.nodes
+            indices, trees = batch.fetch_group_nodes(nodes, selected_only=(self.scope == 'SELECTED'))
 
-            for node in selected_nodegroups:
-                tree = node.node_tree
-            
-                tree.default_group_node_width = int(node.width)
+            if len(indices) == 0:
+                self.report({"WARNING"}, "No nodegroups to update.")
+                return {'CANCELLED'}
 
-            new_widths = tuple(n.node_tree.default_group_node_width for n in selected_nodegroups)
-            updated_widths = tuple(True for old_width, new_width in zip(old_widths, new_widths) if (old_width != new_width))
-            updated_count = len(updated_widths)
+            widths = batch.read_node_array(nodes, "width", np.float32)[indices]
+
+            # When a group has several instances, the last one determines its new default
+            new_widths = {tree.as_pointer(): (tree, int(width)) for tree, width in zip(trees, widths)}
+            updated_count = 0
+
+            for tree, width in new_widths.values():
+                if tree.default_group_node_width != width and utils.is_tree_editable(tree):
+                    tree.default_group_node_width = width
+                    updated_count += 1
+
+            # Propagating here keeps the new instance widths in the same undo step as the new defaults
+            if utils.fetch_user_preferences("propagate_default_width"):
+                group_index.propagate_default_widths(tree for tree, _width in new_widths.values())
 
             if updated_count > 0:
                 self.report({"INFO"}, f"Succesfully updated the default width of {updated_count} nodegroups.")
@@ -610,25 +1845,35 @@ if bpy.app.version >= (4, 3, 0):
         bl_label = "Reset to Default Width"
         bl_options = {'REGISTER', 'UNDO'}
 
+        scope : EnumProperty(name="Scope", items=width_scope_items, default='SELECTED')
+
         @classmethod
         @utils.return_false_when(AttributeError)
         def poll(cls, context):
-            selected_nodegroups = tuple(n for n in context.selected_nodes if hasattr(n, "node_tree"))
-            return len(selected_nodegroups)
+            return context.space_data.edit_tree is not None
 
         def execute(self, context):
-            selected_nodegroups = tuple(n for n in context.selected_nodes if hasattr(n, "node_tree"))
-            old_widths = tuple(n.width for n in selected_nodegroups)
+            nodes = context.space_data.edit_tree.nodes
+            indices, trees = batch.fetch_group_nodes(nodes, selected_only=(self.scope == 'SELECTED'))
+
+            if len(indices) == 0:
+                self.report({"WARNING"}, "No nodegroups to update.")
+                return {'CANCELLED'}
 
-            for node in selected_nodegroups:
-                tree = node.node_tree
-                node.width = tree.default_group_node_width
+            widths = batch.read_node_array(nodes, "width", np.float32)
+            default_widths = batch.fetch_default_widths(trees)
 
-            new_widths = tuple(n.width for n in selected_nodegroups)
-            updated_widths = tuple(True for old_width, new_width in zip(old_widths, new_widths) if (old_width != new_width))
-            updated_count = len(updated_widths)
+            changed = np.flatnonzero(widths[indices] != default_widths)
+            updated_count = len(changed)
 
+            # Nothing is written back when every width is already up to date
             if updated_count > 0:
+                widths[indices[changed]] = default_widths[changed]
+                nodes.foreach_set("width", widths)
+
+                if context.area is not None:
+                    context.area.tag_redraw()
+
                 self.report({"INFO"}, f"Succesfully updated the width of {updated_count} nodegroups.")
             else:
                 self.report({"WARNING"}, "Nodegroup widths are already up-to-date.")
@@ -636,6 +1881,100 @@ if bpy.app.version >= (4, 3, 0):
             return {'FINISHED'}
 
 
+    class GroupInstancesOperator:
+        group_name : StringProperty(
+            name="Group",
+            description="Name of the group whose instances are edited. Uses the active group when left empty",
+            default="",
+            options={'SKIP_SAVE'},
+        )
+
+        @classmethod
+        def poll(cls, context):
+            if bpy.app.background:
+                return True
+
+            return utils.fetch_tree_of_active_node(context) is not None
+
+        def fetch_group(self, context):
+            if self.group_name:
+                return bpy.data.node_groups.get(self.group_name)
+            else:
+                return utils.fetch_tree_of_active_node(context)
+
+        def report_updates(self, group, updated_count):
+            if updated_count > 0:
+                self.report({"INFO"}, f"Succesfully updated the width of {utils.plural(updated_count, 'instance')} of \"{group.name}\".")
+            else:
+                self.report({"WARNING"}, "Nodegroup widths are already up-to-date.")
+
+
+    class GROUP_TOOLS_OT_group_instances_reset_width(GroupInstancesOperator, Operator):
+        '''Set the width of every instance of the group in the file back to its default'''
+        bl_idname = "group_edit_tools.group_instances_reset_width"
+        bl_label = "Reset All Instances to Default Width"
+        bl_options = {'REGISTER', 'UNDO'}
+
+        def execute(self, context):
+            group = self.fetch_group(context)
+            if group is None:
+                return {'CANCELLED'}
+
+            updated_count = group_index.set_instance_widths(group)
+            self.report_updates(group, updated_count)
+            return {'FINISHED'}
+
+
+    class GROUP_TOOLS_OT_group_instances_width_set(GroupInstancesOperator, Operator):
+        '''Set the width of every instance of the group in the file'''
+        bl_idname = "group_edit_tools.group_instances_width_set"
+        bl_label = "Set Width of All Instances"
+        bl_options = {'REGISTER', 'UNDO'}
+
+        width : FloatProperty(name="Width", default=140.0, min=10.0, subtype='PIXEL')
+
+        def invoke(self, context, event):
+            # Start from the width of the active node, if it is an instance of the group
+            active_node = context.active_node
+            if not self.properties.is_property_set("width") and hasattr(active_node, "node_tree"):
+                self.width = active_node.width
+
+            return context.window_manager.invoke_props_dialog(self)
+
+        def execute(self, context):
+            group = self.fetch_group(context)
+            if group is None:
+                return {'CANCELLED'}
+
+            updated_count = group_index.set_instance_widths(group, self.width)
+            self.report_updates(group, updated_count)
+            return {'FINISHED'}
+
+
+    class GROUP_TOOLS_OT_nested_group_instances_reset_width(GroupInstancesOperator, Operator):
+        '''Set the width of every instance of the group, and of the groups nested in it or using it, back to their defaults'''
+        bl_idname = "group_edit_tools.nested_group_instances_reset_width"
+        bl_label = "Reset Nested Instances to Default Width"
+        bl_options = {'REGISTER', 'UNDO'}
+
+        direction : EnumProperty(name="Direction", items=nested_direction_items, default='DESCENDANTS')
+
+        def execute(self, context):
+            group = self.fetch_group(context)
+            if group is None:
+                return {'CANCELLED'}
+
+            groups = (group, *group_index.dependency_graph.related_groups(group, self.direction))
+            updated_count = sum(group_index.set_instance_widths(g) for g in groups)
+
+            if updated_count > 0:
+                self.report({"INFO"}, f"Succesfully updated the width of {utils.plural(updated_count, 'instance')} across {utils.plural(len(groups), 'nodegroup')}.")
+            else:
+                self.report({"WARNING"}, "Nodegroup widths are already up-to-date.")
+
+            return {'FINISHED'}
+
+
 if bpy.app.version >= (4, 5, 0):
     class GROUP_TOOLS_OT_active_interface_item_new_panel_toggle(Operator):
         '''Add a new panel toggle to the currently selected panel'''
@@ -661,14 +2000,15 @@ if bpy.app.version >= (4, 5, 0):
             
             return True
 
-        def execute(self, context):
+        @transaction.interface_transaction
+        def execute(self, context, transaction):
             tree = context.group_edit_tree_to_edit
             interface = tree.interface
             active_panel = interface.active
 
-            item = interface.new_socket(active_panel.name, socket_type='NodeSocketBool', in_out='INPUT')
+            item = transaction.new_socket(active_panel.name, socket_type='NodeSocketBool', in_out='INPUT')
             item.is_panel_toggle = True
-            interface.move_to_parent(item, active_panel, 0)
+            transaction.move_to_parent(item, active_panel, 0)
             return {'FINISHED'}
 
 
@@ -700,7 +2040,8 @@ if bpy.app.version >= (4, 5, 0):
                 
             return True
 
-        def execute(self, context):
+        @transaction.interface_transaction
+        def execute(self, context, transaction):
             tree = context.group_edit_tree_to_edit
             interface = tree.interface
 
@@ -710,8 +2051,8 @@ if bpy.app.version >= (4, 5, 0):
             active_item.is_panel_toggle = True
             active_item.name = panel.name
 
-            interface.move_to_parent(active_item, panel, 0)
-            interface.active = panel
+            transaction.move_to_parent(active_item, panel, 0)
+            transaction.activate(panel)
             return {'FINISHED'}
 
 
@@ -737,7 +2078,8 @@ if bpy.app.version >= (4, 5, 0):
             
             return True
 
-        def execute(self, context):
+        @transaction.interface_transaction
+        def execute(self, context, transaction):
             tree = context.group_edit_tree_to_edit
             interface = tree.interface
             active_item = interface.active
@@ -746,7 +2088,7 @@ if bpy.app.version >= (4, 5, 0):
             panel_toggle.is_panel_toggle = False
             panel_toggle.name = active_item.name
 
-            interface.active = panel_toggle
+            transaction.activate(panel_toggle)
             return {'FINISHED'}
 
 
@@ -755,6 +2097,9 @@ if bpy.app.version >= (4, 5, 0):
         GROUP_TOOLS_OT_active_interface_item_new_panel_toggle,
         GROUP_TOOLS_OT_selected_group_default_width_set,
         GROUP_TOOLS_OT_selected_group_reset_to_default_width,
+        GROUP_TOOLS_OT_group_instances_reset_width,
+        GROUP_TOOLS_OT_group_instances_width_set,
+        GROUP_TOOLS_OT_nested_group_instances_reset_width,
         GROUP_TOOLS_OT_interface_item_make_panel_toggle,
         GROUP_TOOLS_OT_interface_unlink_panel_toggle,
     )
@@ -762,6 +2107,9 @@ elif bpy.app.version >= (4, 3, 0):
     version_specific_classes = (
         GROUP_TOOLS_OT_selected_group_default_width_set,
         GROUP_TOOLS_OT_selected_group_reset_to_default_width,
+        GROUP_TOOLS_OT_group_instances_reset_width,
+        GROUP_TOOLS_OT_group_instances_width_set,
+        GROUP_TOOLS_OT_nested_group_instances_reset_width,
     )
 else:
     version_specific_classes = (
@@ -771,12 +2119,30 @@ else:
 classes = (
     *version_specific_classes,
     GROUP_TOOLS_OT_active_interface_item_new,
+    GROUP_TOOLS_OT_default_socket_type_set,
+    GROUP_TOOLS_OT_default_socket_type_remove,
     GROUP_TOOLS_OT_active_interface_item_duplicate,
     GROUP_TOOLS_OT_active_interface_item_remove,
+    GROUP_TOOLS_OT_interface_remove_unused,
+    GROUP_TOOLS_OT_interface_sockets_edit,
+    GROUP_TOOLS_OT_interface_items_rename,
     GROUP_TOOLS_OT_active_interface_item_swap_io_type,
     GROUP_TOOLS_OT_copy_from_active,
+    GROUP_TOOLS_OT_copy_to_matching_groups,
+    GROUP_TOOLS_OT_sync_interface_from_active,
     GROUP_TOOLS_OT_interface_item_move,
     GROUP_TOOLS_OT_parent_to_panel,
+    GROUP_TOOLS_OT_interface_sort,
+    GROUP_TOOLS_OT_interface_organize_by_prefix,
+    GROUP_TOOLS_OT_interface_panel_flatten,
+    GROUP_TOOLS_OT_interface_items_copy,
+    GROUP_TOOLS_OT_interface_items_paste,
+    GROUP_TOOLS_OT_interface_item_select,
+    GROUP_TOOLS_OT_interface_selection_clear,
+    GROUP_TOOLS_OT_library_index_update,
+    GROUP_TOOLS_OT_library_group_import,
+    GROUP_TOOLS_OT_merge_duplicate_groups,
+    GROUP_TOOLS_OT_copy_to_nested_groups,
 
 )
 
@@ -0,0 +1,185 @@
+from . import interface_index
+
+
+# Order of sockets inside of a panel, panels always come after sockets
+socket_kind_order = {'TOGGLE': 0, 'OUTPUT': 1, 'INPUT': 2}
+
+
+def split_prefix(name, separator):
+    """
+    Splits a name such as "Noise/Scale" into its panel path and its own name, ignoring empty parts
+    """
+
+    parts = [p.strip() for p in name.split(separator)]
+    parts = [p for p in parts if p]
+
+    if len(parts) < 2:
+        return (), name
+
+    return tuple(parts[:-1]), parts[-1]
+
+
+class PanelPlan:
+    def __init__(self, entry=None, name=""):
+        """
+        The planned content of a panel, starting from its current content.
+        Panels that don't exist yet have no entry, and are created when the plan is applied.
+        """
+
+        self.entry = entry
+        self.item = None if (entry is None) else entry.item
+        self.name = name if (entry is None) else entry.item.name
+        self.sockets = []
+        self.panels = []
+        self.panels_by_name = {}
+
+        for child in (() if entry is None else entry.children):
+            if child.is_panel:
+                self.add_panel(PanelPlan(child))
+            else:
+                self.sockets.append(child)
+
+    def add_panel(self, plan):
+        self.panels.append(plan)
+        self.panels_by_name.setdefault(plan.name, plan)
+        return plan
+
+    def child(self, name):
+        plan = self.panels_by_name.get(name)
+        return self.add_panel(PanelPlan(name=name)) if (plan is None) else plan
+
+    def walk(self):
+        yield self
+        for panel in self.panels:
+            yield from panel.walk()
+
+    def children(self, moved_out):
+        sockets = [e for e in self.sockets if e.item.as_pointer() not in moved_out]
+        sockets.sort(key=lambda e: socket_kind_order.get(e.kind, len(socket_kind_order)))
+        return [e.item for e in sockets] + [p.item for p in self.panels]
+
+
+def organize_by_prefix(transaction, tree, panel, separator="/", strip_prefix=True):
+    """
+    Moves every socket directly inside of the panel whose name
+    has a prefix such as "Noise/" into a panel of that name, creating nested panels as needed
+    and reusing panels that already exist. Everything is placed in a single planned pass.
+
+    Returns:
+        The number of moved sockets and the number of created panels
+    """
+
+    snapshot = interface_index.InterfaceSnapshot(tree)
+    parent_entry = snapshot.entry(panel)
+
+    if parent_entry is None or not parent_entry.is_panel:
+        return 0, 0
+
+    root = PanelPlan(parent_entry)
+    moved_out = set()
+
+    for entry in parent_entry.children:
+        if entry.is_panel or entry.kind == 'TOGGLE':
+            continue
+
+        path, name = split_prefix(entry.item.name, separator)
+        if not path:
+            continue
+
+        target = root
+        for panel_name in path:
+            target = target.child(panel_name)
+
+        target.sockets.append(entry)
+        moved_out.add(entry.item.as_pointer())
+
+        if strip_prefix:
+            entry.item.name = name
+
+    if not moved_out:
+        return 0, 0
+
+    created = []
+    for plan in root.walk():
+        if plan.item is None:
+            plan.item = transaction.new_panel(plan.name)
+            created.append(plan.item)
+
+    moved = moved_out | {p.as_pointer() for p in created}
+    layout = []
+
+    for plan in root.walk():
+        # Sockets moving into a panel are only taken out of their old parent's list
+        kept_out = moved_out if (plan is root) else set()
+        layout.append((plan.item, plan.children(kept_out)))
+
+    interface_index.apply_layout(transaction, layout, moved)
+    return len(moved_out), len(created)
+
+
+def end_of_kinds(entries, kinds):
+    # Index right after the last entry of the given kinds
+    index = 0
+    for i, entry in enumerate(entries):
+        if entry.kind in kinds:
+            index = i + 1
+
+    return index
+
+
+def flatten_panel(transaction, tree, panel, add_prefix=False, separator="/"):
+    """
+    Moves every socket inside of the panel and its nested panels to the panel's parent,
+    where the panel was, and removes the emptied panels. Panel toggles become regular inputs.
+    With `add_prefix`, sockets are renamed after the panels they were in (e.g. "Noise/Scale").
+
+    Returns:
+        The moved sockets and the number of removed panels
+    """
+
+    snapshot = interface_index.InterfaceSnapshot(tree)
+    entry = snapshot.entry(panel)
+    parent = entry.parent
+
+    subtree = snapshot.order[entry.enter:entry.exit + 1]
+    sockets = [e for e in subtree if not e.is_panel]
+    panels = [e for e in subtree if e.is_panel]
+
+    for socket in sockets:
+        if add_prefix:
+            path = []
+            ancestor = socket.parent.parent if (socket.kind == 'TOGGLE') else socket.parent
+
+            while ancestor is not parent:
+                path.append(ancestor.item.name)
+                ancestor = ancestor.parent
+
+            socket.item.name = separator.join((*reversed(path), socket.item.name))
+
+        if socket.kind == 'TOGGLE':
+            socket.item.is_panel_toggle = False
+
+    # Blender keeps outputs ahead of inputs, so each kind is planned where it will actually land:
+    # outputs after the last output of the parent, inputs where the panel sits among the inputs.
+    # Toggles become regular inputs, and are placed along with them.
+    outputs = [e.item for e in sockets if e.kind == 'OUTPUT']
+    inputs = [e.item for e in sockets if e.kind != 'OUTPUT']
+
+    siblings = [c for c in parent.children if c is not entry]
+    output_kinds = {'TOGGLE', 'OUTPUT'}
+
+    input_index = max(end_of_kinds(parent.children[:entry.position], output_kinds | {'INPUT'}), end_of_kinds(siblings, output_kinds))
+    children = [c.item for c in siblings]
+    children[input_index:input_index] = inputs
+
+    output_index = end_of_kinds(siblings, output_kinds)
+    children[output_index:output_index] = outputs
+
+    items = outputs + inputs
+    interface_index.apply_layout(transaction, ((parent.item, children),), {i.as_pointer() for i in items})
+
+    # Nested panels are removed first, so that nothing is left to move into the parent
+    for panel_entry in reversed(panels):
+        transaction.remove(panel_entry.item)
+
+    return items, len(panels)
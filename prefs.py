@@ -1,9 +1,9 @@
 import bpy
-from bpy.props import BoolProperty, PointerProperty, StringProperty
+from bpy.props import BoolProperty, CollectionProperty, PointerProperty, StringProperty
 from bpy.types import AddonPreferences, PropertyGroup
 
 from .keymaps import keymap_layout
-from . import utils
+from . import group_index, library_index, utils
 from .ui import (
     refreshable_classes,
     register_overriding_classes, 
@@ -24,6 +24,13 @@ def refresh_ui(self=None, _context=None):
         bpy.utils.register_class(cls)
 
 
+def toggle_width_propagation(self, _context):
+    if self.propagate_default_width:
+        group_index.subscribe_width_propagation()
+    else:
+        group_index.unsubscribe_width_propagation()
+
+
 def toggle_overriding_ui(self, _context):
     if self.override_default_ui:
         register_overriding_classes()
@@ -45,8 +52,9 @@ class CopyFromActiveGroupProps(PropertyGroup):
     is_tool     : BoolProperty(name="Tool Flag", default=True)
     
 
-    def properties(self):
-        tree = utils.fetch_tree_of_active_node()
+    def properties(self, tree=None):
+        if tree is None:
+            tree = utils.fetch_tree_of_active_node()
 
         props = self.__annotations__
         if (tree is None) or (tree.bl_idname != "GeometryNodeTree"):
@@ -59,12 +67,23 @@ class CopyFromActiveGroupProps(PropertyGroup):
         for prop in self.properties():
             if getattr(self, prop):
                 yield prop
+
+    def props_to_copy_from(self, tree):
+        for prop in self.properties(tree):
+            if getattr(self, prop):
+                yield prop
     
 
+class DefaultSocketType(PropertyGroup):
+    tree_type   : StringProperty(name="Tree Type", description="Identifier of the node tree type")
+    socket_type : StringProperty(name="Socket Type", description="Identifier of the socket type used for new sockets")
+
+
 class GroupEditToolsPrefs(AddonPreferences):
     bl_idname = __package__
 
     copy_from_active : PointerProperty(type=CopyFromActiveGroupProps)
+    default_socket_types : CollectionProperty(type=DefaultSocketType)
 
     override_default_ui: BoolProperty(
         name="Override Default UI",
@@ -73,6 +92,32 @@ class GroupEditToolsPrefs(AddonPreferences):
         update=toggle_overriding_ui,
     )
 
+    if bpy.app.version >= (4, 3, 0):
+        propagate_default_width : BoolProperty(
+            name="Propagate Default Width",
+            default=False,
+            description="Update the width of every instance of a nodegroup when its default width is changed",
+            update=toggle_width_propagation,
+        )
+
+    report_transaction_timing : BoolProperty(
+        name="Report Edit Timing",
+        default=False,
+        description="Print how many edits and interface calls each interface operation made, and how long it took, to the system console",
+    )
+
+    library_root : StringProperty(
+        name="Asset Library Folder",
+        subtype='DIR_PATH',
+        description="Folder whose .blend files are indexed for the library search",
+    )
+
+    library_index_path : StringProperty(
+        name="Library Index File",
+        subtype='FILE_PATH',
+        description="Database file for the library index (uses the user data folder when empty)",
+    )
+
     panel_category : StringProperty(
         name="Panel Category",
         default=RefreshableBaseClass.default_bl_category,
@@ -80,13 +125,57 @@ class GroupEditToolsPrefs(AddonPreferences):
         update=refresh_ui,
     )
 
+    def library_database_path(self, create=True):
+        return bpy.path.abspath(self.library_index_path) if self.library_index_path else library_index.default_database_path(create)
+
+    def default_socket_type(self, tree_type):
+        for item in self.default_socket_types:
+            if item.tree_type == tree_type:
+                return item.socket_type
+
+        return None
+
+    def set_default_socket_type(self, tree_type, socket_type):
+        for item in self.default_socket_types:
+            if item.tree_type == tree_type:
+                break
+        else:
+            item = self.default_socket_types.add()
+            item.tree_type = tree_type
+
+        item.socket_type = socket_type
+
+    def draw_default_socket_types(self, layout):
+        col = layout.column(align=True)
+        col.label(text="Default Socket Types:")
+
+        if not self.default_socket_types:
+            col.label(text="Use \"Use as Default Socket Type\" on a socket to add one.", icon='INFO')
+
+        for i, item in enumerate(self.default_socket_types):
+            row = col.row(align=True)
+            row.prop(item, "tree_type", text="")
+            row.prop(item, "socket_type", text="")
+            row.operator("group_edit_tools.default_socket_type_remove", text="", icon='X').index = i
+
     def draw(self, context):
         layout = self.layout
         layout.prop(self, "panel_category")
         layout.prop(self, "override_default_ui")
         if not self.override_default_ui and should_display_warning():
             layout.label(text="For changes to fully apply, please restart Blender.", icon="ERROR")
+
+        if bpy.app.version >= (4, 3, 0):
+            layout.prop(self, "propagate_default_width")
         
+        layout.prop(self, "report_transaction_timing")
+
+        col = layout.column(align=True)
+        col.prop(self, "library_root")
+        col.prop(self, "library_index_path")
+
+        self.draw_default_socket_types(layout)
+
         keymap_layout.draw_keyboard_shorcuts(self, layout, context)
 
 
@@ -95,6 +184,7 @@ keymap_layout.register_properties(preferences=GroupEditToolsPrefs)
 
 classes = (
     CopyFromActiveGroupProps,
+    DefaultSocketType,
     GroupEditToolsPrefs,
     )
 
@@ -108,6 +198,9 @@ def register():
     if prefs.override_default_ui:
         register_overriding_classes()
 
+    if getattr(prefs, "propagate_default_width", False):
+        group_index.subscribe_width_propagation()
+
     refresh_ui()
 
 
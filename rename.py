@@ -0,0 +1,62 @@
+import re
+
+from . import utils
+
+
+def compile_pattern(find, use_regex=False, case_sensitive=True):
+    flags = 0 if case_sensitive else re.IGNORECASE
+    return re.compile(find if use_regex else re.escape(find), flags)
+
+
+def replacer(replace, use_regex=False):
+    # Without regular expressions, backslashes in the replacement are kept as they are
+    return replace if use_regex else (lambda _match: replace)
+
+
+def plan_renames(trees, pattern, replace, item_types='ALL'):
+    """
+    Returns the renames needed across the given trees, as tuples of (tree, item, old name, new name).
+
+    Panel toggles aren't renamed on their own. They take the new name of their panel instead,
+    the same way a socket turned into a toggle takes the name of its panel.
+    """
+
+    renames = []
+
+    for tree in trees:
+        for item in tree.interface.items_tree:
+            if utils.is_panel_toggle(item):
+                continue
+
+            is_panel = (item.item_type == 'PANEL')
+            if (item_types == 'SOCKETS' and is_panel) or (item_types == 'PANELS' and not is_panel):
+                continue
+
+            new_name = pattern.sub(replace, item.name)
+            if not new_name or new_name == item.name:
+                continue
+
+            renames.append((tree, item, item.name, new_name))
+
+            toggle = utils.get_panel_toggle(item) if is_panel else None
+            if toggle is not None and toggle.name != new_name:
+                renames.append((tree, toggle, toggle.name, new_name))
+
+    return renames
+
+
+def apply_renames(renames):
+    """
+    Renames every item in a single pass
+
+    Returns:
+        The number of renamed items and the number of trees they're in
+    """
+
+    trees = set()
+
+    for tree, item, _old_name, new_name in renames:
+        item.name = new_name
+        trees.add(tree.as_pointer())
+
+    return len(renames), len(trees)
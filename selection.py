@@ -0,0 +1,140 @@
+import bpy
+from bpy.app.handlers import persistent
+
+
+def item_key(item):
+    # Socket identifiers survive moves and renames. Panels don't have identifiers,
+    # so their persistent ID is used where available, falling back to their index.
+    if item.item_type == 'SOCKET':
+        return ('SOCKET', item.identifier)
+    else:
+        return ('PANEL', getattr(item, "persistent_uid", item.index))
+
+
+class InterfaceSelection:
+    def __init__(self):
+        """
+        A set of selected interface items per node tree, kept by the addon since
+        Blender's interface tree view only supports a single active item.
+
+        Trees are keyed on `session_uid` and items on `item_key`, so that selections
+        survive moving items around and never hold on to RNA structs.
+        """
+
+        self.selected = {}
+        self.anchors = {}
+
+    def clear(self, tree=None):
+        if tree is None:
+            self.selected.clear()
+            self.anchors.clear()
+        else:
+            self.selected.pop(tree.session_uid, None)
+            self.anchors.pop(tree.session_uid, None)
+
+    def keys(self, tree):
+        return self.selected.get(tree.session_uid, set())
+
+    def count(self, tree):
+        return len(self.keys(tree))
+
+    def is_selected(self, tree, item):
+        return item is not None and item_key(item) in self.keys(tree)
+
+    def items(self, tree):
+        """
+        Returns the selected items of the tree in interface order.
+        Keys of items that no longer exist are dropped along the way.
+        """
+
+        keys = self.keys(tree)
+        if not keys:
+            return ()
+
+        items = tuple(i for i in tree.interface.items_tree if item_key(i) in keys)
+
+        if len(items) != len(keys):
+            self.selected[tree.session_uid] = {item_key(i) for i in items}
+
+        return items
+
+    def select(self, tree, items, extend=False):
+        keys = {item_key(i) for i in items}
+
+        if extend:
+            keys |= self.keys(tree)
+
+        self.selected[tree.session_uid] = keys
+
+    def toggle(self, tree, item):
+        keys = self.selected.setdefault(tree.session_uid, set())
+        key = item_key(item)
+
+        if key in keys:
+            keys.remove(key)
+        else:
+            keys.add(key)
+
+        self.anchors[tree.session_uid] = key
+
+    def select_range(self, tree, item):
+        """
+        Adds every item between the last clicked item and the given one to the selection
+        """
+
+        anchor = self.anchors.get(tree.session_uid)
+        items_tree = tree.interface.items_tree
+        end = item.index
+
+        start = next((i.index for i in items_tree if item_key(i) == anchor), end)
+        if start > end:
+            start, end = end, start
+
+        self.select(tree, (items_tree[i] for i in range(start, end + 1)), extend=True)
+
+    def set_anchor(self, tree, item):
+        self.anchors[tree.session_uid] = item_key(item)
+
+
+interface_selection = InterfaceSelection()
+
+
+def selected_items(tree):
+    return interface_selection.items(tree)
+
+
+def target_items(tree, use_selection=False):
+    """
+    Returns the items an operator acts on, either the selected items or only the active one
+    """
+
+    if use_selection:
+        return selected_items(tree)
+
+    active_item = tree.interface.active
+    return () if (active_item is None) else (active_item,)
+
+
+# Selections refer to trees by their session ID, which doesn't carry over to other files
+@persistent
+def on_file_loaded(*_):
+    interface_selection.clear()
+
+
+handlers = (
+    (bpy.app.handlers.load_post, on_file_loaded),
+)
+
+
+def register():
+    for handler_list, handler in handlers:
+        if handler not in handler_list:
+            handler_list.append(handler)
+
+
+def unregister():
+    for handler_list, handler in handlers:
+        if handler in handler_list:
+            handler_list.remove(handler)
+
+    interface_selection.clear()
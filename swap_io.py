@@ -0,0 +1,275 @@
+import bpy
+
+from . import group_index, interface_index
+
+
+opposite_kinds = {'INPUT': 'OUTPUT', 'OUTPUT': 'INPUT'}
+
+
+def can_swap(item):
+    return item.item_type == 'SOCKET' and item.socket_type != "NodeSocketMenu" and not getattr(item, "is_panel_toggle", False)
+
+
+def peer_socket(node, socket):
+    """
+    Returns the socket on the other side of the node that has the same name and type as the given socket,
+    which is where a link to that socket can be moved to once the group socket changes direction
+    """
+
+    opposite = node.inputs if socket.is_output else node.outputs
+
+    # Reroutes pass their single input straight through
+    if node.bl_idname == "NodeReroute":
+        return opposite[0] if len(opposite) else None
+
+    for other in opposite:
+        if other.enabled and other.name == socket.name and other.type == socket.type:
+            return other
+
+    return None
+
+
+def find_socket(sockets, identifier):
+    for socket in sockets:
+        if socket.identifier == identifier:
+            return socket
+
+    return None
+
+
+def first_node(tree, bl_idname):
+    nodes = [n for n in tree.nodes if n.bl_idname == bl_idname]
+
+    # The active output is the one that's actually evaluated
+    for node in nodes:
+        if getattr(node, "is_active_output", False):
+            return node
+
+    return nodes[0] if nodes else None
+
+
+def nearest_group_input(group_inputs, fed_by, node):
+    """
+    Returns the Group Input node that should feed the given node: one that already feeds it if there is one,
+    otherwise the closest one, so that restored links don't come from a far-away Group Input node
+    """
+
+    if not group_inputs:
+        return None
+
+    group_input = fed_by.get(node.name)
+    if group_input is not None:
+        return group_input
+
+    location = node.location
+    return min(group_inputs, key=lambda n: (n.location - location).length_squared)
+
+
+def record_links(tree, swapped):
+    """
+    Reads, in a pass over the links of the group and of every tree holding one of its instances,
+    which links can be kept once the given sockets are swapped.
+
+    Each record stores the tree, the node that gets the swapped socket, the identifier of the original socket,
+    whether the swapped socket will be an output on that node, and the peer socket on the other end.
+    Links whose other end has no peer socket are counted as dropped.
+    """
+
+    records = []
+    dropped = 0
+
+    group_inputs = [n for n in tree.nodes if n.bl_idname == "NodeGroupInput"]
+    fed_by = {}
+
+    if 'OUTPUT' in swapped.values():
+        for link in tree.links:
+            if link.from_node.bl_idname == "NodeGroupInput":
+                fed_by.setdefault(link.to_node.name, link.from_node)
+    group_output = first_node(tree, "NodeGroupOutput")
+
+    for link in tree.links:
+        from_node, to_node = link.from_node, link.to_node
+
+        # Inputs become outputs, so whatever read them now feeds the Group Output node
+        if from_node.bl_idname == "NodeGroupInput" and swapped.get(link.from_socket.identifier) == 'INPUT':
+            peer = peer_socket(to_node, link.to_socket)
+            if peer is None or group_output is None or to_node.bl_idname == "NodeGroupOutput":
+                dropped += 1
+            else:
+                records.append((tree, group_output.name, link.from_socket.identifier, False, to_node.name, peer.identifier))
+
+        # Outputs become inputs, so whatever fed them now reads from the Group Input node
+        if to_node.bl_idname == "NodeGroupOutput" and swapped.get(link.to_socket.identifier) == 'OUTPUT':
+            peer = peer_socket(from_node, link.from_socket)
+            group_input = None if (peer is None) else nearest_group_input(group_inputs, fed_by, from_node)
+
+            if group_input is None or from_node.bl_idname == "NodeGroupInput":
+                dropped += 1
+            else:
+                records.append((tree, group_input.name, link.to_socket.identifier, True, from_node.name, peer.identifier))
+
+    owners = {}
+    for node in group_index.instance_index.instances_of(tree):
+        owner = node.id_data
+        owners.setdefault(owner.as_pointer(), (owner, set()))[1].add(node.name)
+
+    for owner, names in owners.values():
+        for link in owner.links:
+            from_node, to_node = link.from_node, link.to_node
+
+            if to_node.name in names and swapped.get(link.to_socket.identifier) == 'INPUT':
+                peer = peer_socket(from_node, link.from_socket)
+                if peer is None:
+                    dropped += 1
+                else:
+                    records.append((owner, to_node.name, link.to_socket.identifier, True, from_node.name, peer.identifier))
+
+            if from_node.name in names and swapped.get(link.from_socket.identifier) == 'OUTPUT':
+                peer = peer_socket(to_node, link.to_socket)
+                if peer is None:
+                    dropped += 1
+                else:
+                    records.append((owner, from_node.name, link.from_socket.identifier, False, to_node.name, peer.identifier))
+
+    return records, dropped
+
+
+def restore_links(records, new_identifiers):
+    """
+    Links the swapped sockets to the peer sockets found by `record_links`.
+    Inputs that are already linked are left alone, since linking them again would replace that link.
+    An input that was read by several nodes is only linked to the first of them, the others are dropped.
+
+    Returns:
+        The number of links that were restored and the number that couldn't be
+    """
+
+    restored = 0
+    dropped = 0
+    linked_inputs = set()
+
+    for tree, node_name, identifier, is_output, peer_node_name, peer_identifier in records:
+        node = tree.nodes.get(node_name)
+        peer_node = tree.nodes.get(peer_node_name)
+
+        if node is None or peer_node is None:
+            dropped += 1
+            continue
+
+        socket = find_socket(node.outputs if is_output else node.inputs, new_identifiers[identifier])
+        peer = find_socket(peer_node.inputs if is_output else peer_node.outputs, peer_identifier)
+
+        if socket is None or peer is None:
+            dropped += 1
+            continue
+
+        if is_output:
+            if peer.is_linked and not peer.is_multi_input:
+                dropped += 1
+                continue
+
+            tree.links.new(socket, peer)
+        else:
+            key = (tree.as_pointer(), node_name, socket.identifier)
+            if key in linked_inputs:
+                dropped += 1
+                continue
+
+            linked_inputs.add(key)
+            tree.links.new(peer, socket)
+
+        restored += 1
+
+    return restored, dropped
+
+
+def insert_index(planned, kind, rank):
+    last = None
+
+    for index, (entry_kind, entry_rank, is_new, _item) in enumerate(planned):
+        if entry_kind != kind:
+            continue
+
+        # A swapped socket takes the spot of the socket that had its rank on the other side
+        if entry_rank > rank or (entry_rank == rank and not is_new):
+            return index
+
+        last = index
+
+    if last is not None:
+        return last + 1
+
+    # Outputs come first (after a panel toggle), inputs come after outputs
+    index = 0
+    for i, (entry_kind, _rank, _is_new, _item) in enumerate(planned):
+        if entry_kind == 'TOGGLE' or (kind == 'INPUT' and entry_kind == 'OUTPUT'):
+            index = i + 1
+
+    return index
+
+
+def planned_children(panel, new_items):
+    """
+    Returns the items of the panel in their order after the swap, with every swapped socket
+    keeping its rank among the sockets of its new side
+    """
+
+    planned = [(c.kind, c.kind_index, False, c.item) for c in panel.children if c.item.as_pointer() not in new_items]
+
+    for child in panel.children:
+        new_item = new_items.get(child.item.as_pointer())
+
+        if new_item is not None:
+            kind = opposite_kinds[child.kind]
+            planned.insert(insert_index(planned, kind, child.kind_index), (kind, child.kind_index, True, new_item))
+
+    return [item for _kind, _rank, _is_new, item in planned]
+
+
+def swap_items(transaction, tree, items, prop_names):
+    """
+    Replaces each socket with a socket of the opposite direction, keeping its properties and its rank
+    among the sockets of its panel. Links inside of the group and on its instances are moved onto peer sockets
+    (sockets with the same name and type on the other side of the linked node) wherever one exists.
+
+    Returns:
+        The new sockets keyed on the pointer of the socket they replace,
+        the number of restored links and the number of links that couldn't be kept
+    """
+
+    snapshot = interface_index.InterfaceSnapshot(tree)
+    entries = [snapshot.entry(i) for i in items if can_swap(i)]
+    swapped = {e.item.identifier: e.kind for e in entries}
+
+    records, dropped = record_links(tree, swapped)
+
+    new_items = {}
+    new_identifiers = {}
+    for entry in entries:
+        item = entry.item
+        new_item = transaction.new_socket(item.name, socket_type=item.socket_type, in_out=opposite_kinds[entry.kind])
+
+        for prop in prop_names:
+            if hasattr(new_item, prop) and hasattr(item, prop):
+                try:
+                    setattr(new_item, prop, getattr(item, prop))
+                except (AttributeError, TypeError, ValueError):
+                    pass
+
+        new_items[item.as_pointer()] = new_item
+        new_identifiers[item.identifier] = new_item.identifier
+
+    for entry in entries:
+        transaction.remove(entry.item)
+
+    panels = {e.parent.item.as_pointer(): e.parent for e in entries}
+    layout = ((panel.item, planned_children(panel, new_items)) for panel in panels.values())
+    interface_index.apply_layout(transaction, layout, {i.as_pointer() for i in new_items.values()})
+
+    # Group nodes only get the new sockets once the interface update has run
+    transaction.flush()
+    tree.interface_update(bpy.context)
+
+    restored, failed = restore_links(records, new_identifiers)
+
+    return new_items, restored, dropped + failed
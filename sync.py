@@ -0,0 +1,235 @@
+from collections import deque
+
+from . import interface_index, utils
+
+
+# Properties are listed in the order they're applied, the socket type
+# comes first since changing it resets the value related properties
+socket_props = (
+    "name",
+    "socket_type",
+    "subtype",
+    "description",
+    "is_panel_toggle",
+    "hide_value",
+    "hide_in_modifier",
+    "force_non_field",
+    "layer_selection_field",
+    "attribute_domain",
+    "default_attribute_name",
+    "min_value",
+    "max_value",
+)
+
+panel_props = (
+    "name",
+    "description",
+    "default_closed",
+)
+
+
+def values_equal(a, b):
+    # Vectors and colors are returned as property arrays, which don't compare equal to each other
+    if hasattr(a, "__len__") and not isinstance(a, str):
+        return tuple(a) == tuple(b)
+
+    return a == b
+
+
+def item_props(item, sync_defaults=False):
+    if item.item_type == 'PANEL':
+        return panel_props
+
+    return (*socket_props, "default_value") if sync_defaults else socket_props
+
+
+def changed_props(source, target, prop_names):
+    for prop in prop_names:
+        if hasattr(source, prop) and hasattr(target, prop):
+            if not values_equal(getattr(source, prop), getattr(target, prop)):
+                yield prop
+
+
+def copy_item_props(source, target, prop_names):
+    for prop in prop_names:
+        if not hasattr(target, prop):
+            continue
+
+        try:
+            setattr(target, prop, getattr(source, prop))
+        except (AttributeError, TypeError, ValueError):
+            # Read-only in this version, or not valid for the new socket type
+            pass
+
+
+def match_kind(entry):
+    return 'PANEL' if entry.is_panel else entry.item.in_out
+
+
+def identifier_key(entry):
+    if entry.is_panel:
+        identifier = getattr(entry.item, "persistent_uid", None)
+    else:
+        identifier = entry.item.identifier
+
+    return None if (identifier is None) else (match_kind(entry), identifier)
+
+
+def name_key(entry):
+    return (match_kind(entry), entry.item.name)
+
+
+def type_key(entry):
+    return (match_kind(entry), getattr(entry.item, "socket_type", None))
+
+
+match_keys = (identifier_key, name_key, type_key)
+
+
+def match_entries(source, target):
+    """
+    Pairs every item of the source interface with an item of the target interface,
+    first by identifier, then by name, then by type. Items of the same direction
+    (or panels) are only paired with each other, in interface order.
+    """
+
+    matches = {source.root: target.root} if (source.root and target.root) else {}
+    matched_targets = set(matches.values())
+
+    for key in match_keys:
+        available = {}
+
+        for entry in target.order:
+            if entry not in matched_targets:
+                available.setdefault(key(entry), deque()).append(entry)
+
+        for entry in source.order:
+            if entry in matches:
+                continue
+
+            candidates = available.get(key(entry))
+            if candidates:
+                match = candidates.popleft()
+                matches[entry] = match
+                matched_targets.add(match)
+
+    return matches
+
+
+class SyncPlan:
+    def __init__(self, source_tree, target_tree, sync_defaults=False):
+        """
+        The edits needed for the interface of the target tree to match the one of the source tree.
+
+        Matched items are kept, so that links to them and values set on group nodes survive.
+        Items without a match are removed or inserted, matched items whose properties differ are updated,
+        and items are only moved when they're in the wrong panel or outside of the longest run of items
+        that are already in the right order.
+        """
+
+        self.source_tree = source_tree
+        self.target_tree = target_tree
+        self.sync_defaults = sync_defaults
+
+        self.source = interface_index.InterfaceSnapshot(source_tree)
+        self.target = interface_index.InterfaceSnapshot(target_tree)
+        self.matches = match_entries(self.source, self.target)
+
+        matched_targets = set(self.matches.values())
+        self.removals = [e for e in self.target.order if e not in matched_targets]
+        self.insertions = [e for e in self.source.order if e not in self.matches]
+
+        self.updates = []
+        for source_entry in self.source.order:
+            target_entry = self.matches.get(source_entry)
+
+            if target_entry is not None:
+                prop_names = item_props(source_entry.item, sync_defaults)
+                changes = tuple(changed_props(source_entry.item, target_entry.item, prop_names))
+
+                if changes:
+                    self.updates.append((source_entry, target_entry, changes))
+
+        self.moves = self.plan_moves()
+
+    def plan_moves(self):
+        moves = []
+
+        for panel in self.source.panels(include_root=True):
+            target_panel = self.matches.get(panel)
+            staying = []
+
+            for child in panel.children:
+                target_entry = self.matches.get(child)
+
+                if target_entry is None:
+                    continue
+
+                if target_panel is None or target_entry.parent is not target_panel:
+                    moves.append(child)
+                else:
+                    staying.append(child)
+
+            kept = interface_index.longest_increasing_subsequence([self.matches[e].position for e in staying])
+            moves.extend(e for i, e in enumerate(staying) if i not in kept)
+
+        return moves
+
+    @property
+    def edit_count(self):
+        return len(self.removals) + len(self.insertions) + len(self.updates) + len(self.moves)
+
+    @staticmethod
+    def describe_item(entry):
+        kind = "panel" if entry.is_panel else entry.item.in_out.lower()
+        return f"{kind} \"{entry.item.name}\""
+
+    def describe(self):
+        for entry in self.removals:
+            yield f"Remove {self.describe_item(entry)}"
+
+        for entry in self.insertions:
+            yield f"Add {self.describe_item(entry)}"
+
+        for source_entry, target_entry, changes in self.updates:
+            yield f"Update {self.describe_item(target_entry)}: {', '.join(changes)}"
+
+        for entry in self.moves:
+            yield f"Move {self.describe_item(self.matches[entry])}"
+
+    def apply(self, transaction):
+        for entry in self.removals:
+            transaction.remove(entry.item)
+
+        items = {source: target.item for source, target in self.matches.items()}
+
+        # Items are listed depth-first, so new panels exist before anything is placed in them
+        for entry in self.insertions:
+            source_item = entry.item
+
+            if entry.is_panel:
+                item = transaction.new_panel(source_item.name)
+            else:
+                item = transaction.new_socket(source_item.name, socket_type=source_item.socket_type, in_out=source_item.in_out)
+
+            copy_item_props(source_item, item, item_props(source_item, sync_defaults=True))
+            items[entry] = item
+
+        for source_entry, target_entry, changes in self.updates:
+            copy_item_props(source_entry.item, target_entry.item, changes)
+
+        if self.source.root is None:
+            return
+
+        if self.source.root not in items:
+            # An empty target only gets a root panel once its first item is added
+            transaction.flush()
+            items[self.source.root] = utils.find_base_panel(self.target_tree)
+
+        moved = {items[e].as_pointer() for e in (*self.moves, *self.insertions)}
+        layout = (
+            (items[panel], [items[c] for c in panel.children])
+            for panel in self.source.panels(include_root=True)
+            )
+
+        interface_index.apply_layout(transaction, layout, moved)
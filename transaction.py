@@ -0,0 +1,193 @@
+import bpy
+
+import functools
+import time
+
+from . import caches, group_index, interface_index, utils
+
+
+# Edits that only change where an item sits. The final position of a PLACE edit
+# doesn't depend on where the item was beforehand, so consecutive ones can be merged.
+moving_edits = {'MOVE', 'MOVE_TO_PARENT', 'PLACE', 'PLACE_AFTER'}
+
+
+class InterfaceTransaction:
+    def __init__(self, tree, name="Edit Interface", push_undo=True):
+        """
+        Batches edits to the interface of a node tree.
+
+        Moves, removals and changes of the active item are queued and applied in order
+        when the transaction is flushed or committed, dropping edits that the following ones
+        make redundant. Creating items (`new_socket`, `new_panel`, `copy`) flushes the queue first
+        and runs immediately, since the new item is needed right away.
+
+        On commit, caches derived from the interface are invalidated once, users of the group
+        are tagged for an update once, and (when `push_undo` is enabled) a single undo step is pushed.
+        Operators already get their own undo step, so they should leave `push_undo` disabled.
+
+        Reading the interface while edits are queued returns the state before those edits,
+        call `flush()` first when up-to-date positions are needed.
+
+        Args:
+            tree : The node tree whose interface is edited
+            name : Label used for the undo step and for timing reports
+            push_undo : Whether committing the transaction pushes an undo step
+        """
+
+        self.tree = tree
+        self.interface = tree.interface
+        self.name = name
+        self.push_undo = push_undo
+
+        self.queue = []
+        self.requested_edits = 0
+        self.interface_calls = 0
+        self.start_time = None
+        self.elapsed = 0.0
+
+    def __enter__(self):
+        self.start_time = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.commit()
+        else:
+            # Edits that already ran can't be taken back, but queued ones are dropped
+            self.queue.clear()
+            caches.tag_interface_changed(self.tree)
+
+        return False
+
+    def queue_edit(self, edit, item, *args):
+        self.requested_edits += 1
+
+        if edit == 'REMOVE':
+            # The position of an item stops mattering once it is removed
+            while self.queue and self.queue[-1][1] == item and self.queue[-1][0] in moving_edits:
+                self.queue.pop()
+
+        elif edit == 'PLACE':
+            while self.queue and self.queue[-1][1] == item and self.queue[-1][0] == 'PLACE':
+                self.queue.pop()
+
+        self.queue.append((edit, item, args))
+
+    def move(self, item, position):
+        self.queue_edit('MOVE', item, position)
+
+    def move_to_parent(self, item, parent, position):
+        self.queue_edit('MOVE_TO_PARENT', item, parent, position)
+
+    def place(self, item, parent, position):
+        """
+        Moves the item so that it ends up at the given position inside of the given parent
+        (see `interface_index.place_item`)
+        """
+
+        self.queue_edit('PLACE', item, parent, position)
+
+    def place_after(self, item, parent, anchor=None):
+        """
+        Moves the item right after the anchor item inside of the given parent
+        (see `interface_index.place_after`). The anchor's position is read when the edit is applied.
+        """
+
+        self.queue_edit('PLACE_AFTER', item, parent, anchor)
+
+    def remove(self, item):
+        self.queue_edit('REMOVE', item)
+
+    def activate(self, item):
+        self.queue_edit('ACTIVATE', item)
+
+    def new_socket(self, *args, **kwargs):
+        self.flush()
+        self.requested_edits += 1
+        self.interface_calls += 1
+        return self.interface.new_socket(*args, **kwargs)
+
+    def new_panel(self, *args, **kwargs):
+        self.flush()
+        self.requested_edits += 1
+        self.interface_calls += 1
+        return self.interface.new_panel(*args, **kwargs)
+
+    def copy(self, item):
+        self.flush()
+        self.requested_edits += 1
+        self.interface_calls += 1
+        return self.interface.copy(item)
+
+    def flush(self):
+        queue, self.queue = self.queue, []
+        interface = self.interface
+
+        for edit, item, args in queue:
+            if edit == 'MOVE':
+                interface.move(item, *args)
+            elif edit == 'MOVE_TO_PARENT':
+                interface.move_to_parent(item, *args)
+            elif edit == 'PLACE':
+                interface_index.place_item(interface, item, *args)
+            elif edit == 'PLACE_AFTER':
+                if not interface_index.place_after(interface, item, *args):
+                    continue
+            elif edit == 'REMOVE':
+                interface.remove(item)
+            elif edit == 'ACTIVATE':
+                interface.active = item
+                continue
+
+            self.interface_calls += 1
+
+    def tag_users(self):
+        # The instance index is kept up to date incrementally, unlike `bpy.data.user_map`
+        # which scans the whole file and would do so on every single move
+        for key in group_index.instance_index.users_of(self.tree):
+            owner = group_index.resolve_owner(key)
+            if owner is not None:
+                owner.update_tag()
+
+    def commit(self):
+        self.flush()
+
+        # Flags such as `is_panel_toggle` can be changed directly on items
+        # without going through the transaction, so caches are always tagged
+        caches.tag_interface_changed(self.tree)
+
+        if self.interface_calls > 0:
+            self.tag_users()
+
+            if self.push_undo and not bpy.app.background:
+                try:
+                    bpy.ops.ed.undo_push(message=self.name)
+                except RuntimeError:
+                    pass
+
+        self.elapsed = time.perf_counter() - self.start_time
+
+        if getattr(utils.fetch_user_preferences(), "report_transaction_timing", False):
+            print(f"Group Edit Tools: {self.summary}")
+
+    @property
+    def summary(self):
+        return (
+            f"{self.name} on \"{self.tree.name}\" - "
+            f"{utils.plural(self.requested_edits, 'edit')}, "
+            f"{utils.plural(self.interface_calls, 'interface call')} "
+            f"in {self.elapsed * 1000:.2f} ms"
+        )
+
+
+# Decorator for operators that edit the interface of `context.group_edit_tree_to_edit`.
+# The wrapped execute function receives the transaction as an extra argument.
+def interface_transaction(execute):
+    @functools.wraps(execute)
+    def wrapper(self, context):
+        tree = context.group_edit_tree_to_edit
+
+        with InterfaceTransaction(tree, name=self.bl_label, push_undo=False) as transaction:
+            return execute(self, context, transaction)
+
+    return wrapper
@@ -1,5 +1,7 @@
 import bpy
-from bpy.types import Menu, Panel
+import itertools
+from bpy.types import Menu, Panel, PropertyGroup, UIList
+from bpy.props import BoolProperty, EnumProperty, PointerProperty, StringProperty
 
 from bl_ui import space_node
 from bl_ui.space_node import NODE_PT_node_tree_interface, NODE_PT_node_tree_properties
@@ -8,7 +10,7 @@ if bpy.app.version >= (4, 5, 0):
     from bl_ui.space_node import NODE_PT_node_tree_interface_panel_toggle
 
 from . import draw
-from .. import utils
+from .. import interface_index, usage_index, utils
 
 
 has_ui_been_overridden = False
@@ -53,6 +55,131 @@ class GROUP_TOOLS_PT_active_group_properties(RefreshableBaseClass, Panel):
         draw.active_group_properties(group, self.layout, context)
         return
 
+class GROUP_TOOLS_PT_group_dependencies(RefreshableBaseClass, Panel):
+    bl_label = "Dependencies"
+    bl_space_type = 'NODE_EDITOR'
+    bl_region_type = 'UI'
+    bl_order = 3
+    bl_options = {'DEFAULT_CLOSED'}
+
+    poll = classmethod(utils.active_group_poll)
+
+    def draw(self, context):
+        group = utils.fetch_tree_of_active_node(context)
+        draw.group_dependencies(group, self.layout)
+        return
+
+
+class GROUP_TOOLS_UL_socket_usage(UIList):
+    sort_by : EnumProperty(
+        name="Sort By",
+        items=(
+            ('ORDER', "Interface Order", "Keep the order of the interface"),
+            ('NAME', "Name", "Sort sockets by name"),
+            ('LINKED', "Linked", "Sort sockets by the number of instances linking them"),
+            ('OVERRIDDEN', "Overridden", "Sort sockets by the number of instances overriding their value"),
+            ('UNUSED', "Unused", "Sort sockets by the number of instances leaving them untouched"),
+        ),
+        default='ORDER',
+    )
+
+    def draw_item(self, context, layout, data, item, icon, active_data, active_property, index, flt_flag):
+        item_usage = usage_index.fetch_usage(item.id_data).socket_usage(item)
+
+        row = layout.row(align=True)
+        row.label(text=item.name, icon='IMPORT' if item.in_out == 'INPUT' else 'EXPORT')
+
+        if item_usage is None:
+            return
+
+        sub = row.row(align=True)
+        sub.alignment = 'RIGHT'
+        sub.label(text=str(item_usage.linked), icon='LINKED')
+        sub.label(text=str(item_usage.overridden) if item.in_out == 'INPUT' else "-", icon='MODIFIER')
+        sub.label(text=str(item_usage.untouched), icon='BLANK1' if item_usage.is_used else 'ERROR')
+
+    def draw_filter(self, context, layout):
+        row = layout.row(align=True)
+        row.prop(self, "filter_name", text="")
+        row.prop(self, "use_filter_invert", text="", icon='ARROW_LEFTRIGHT')
+
+        row = layout.row(align=True)
+        row.prop(self, "sort_by", text="")
+        row.prop(self, "use_filter_sort_reverse", text="", icon='SORT_DESC' if self.use_filter_sort_reverse else 'SORT_ASC')
+
+    def filter_items(self, context, data, propname):
+        items = getattr(data, propname)
+        helpers = bpy.types.UI_UL_list
+
+        if self.filter_name:
+            flags = helpers.filter_items_by_name(self.filter_name, self.bitflag_filter_item, items, "name")
+        else:
+            flags = [self.bitflag_filter_item] * len(items)
+
+        # Panels have no usage of their own, and are always hidden
+        for index, item in enumerate(items):
+            if item.item_type != 'SOCKET':
+                flags[index] &= ~self.bitflag_filter_item
+
+        if self.sort_by == 'ORDER':
+            return flags, []
+
+        if self.sort_by == 'NAME':
+            return flags, helpers.sort_items_by_name(items, "name")
+
+        usage = usage_index.fetch_usage(data.id_data)
+        attr = self.sort_by.lower() if (self.sort_by != 'UNUSED') else "untouched"
+
+        def sort_key(index):
+            item_usage = usage.socket_usage(items[index])
+            return (-getattr(item_usage, attr, -1), index)
+
+        # Higher counts come first, the order is reversed through the list's own sort toggle
+        order = sorted(range(len(items)), key=sort_key)
+        new_order = [0] * len(items)
+        for position, index in enumerate(order):
+            new_order[index] = position
+
+        return flags, new_order
+
+
+class GROUP_TOOLS_PT_socket_usage(RefreshableBaseClass, Panel):
+    bl_label = "Socket Usage"
+    bl_space_type = 'NODE_EDITOR'
+    bl_region_type = 'UI'
+    bl_order = 4
+    bl_options = {'DEFAULT_CLOSED'}
+
+    poll = classmethod(utils.active_group_poll)
+
+    def draw(self, context):
+        group = utils.fetch_tree_of_active_node(context)
+        draw.usage_list(group, self.layout)
+        return
+
+
+class LibrarySearchProps(PropertyGroup):
+    query : StringProperty(name="Search", description="Text contained in the name of a group, or in the name of one of its sockets or panels")
+    current_type_only : BoolProperty(name="Current Tree Type Only", description="Only show groups of the same type as the edited node tree", default=True)
+
+
+class GROUP_TOOLS_PT_library_search(RefreshableBaseClass, Panel):
+    bl_label = "Library"
+    bl_space_type = 'NODE_EDITOR'
+    bl_region_type = 'UI'
+    bl_order = 5
+    bl_options = {'DEFAULT_CLOSED'}
+
+    @classmethod
+    @utils.return_false_when(AttributeError)
+    def poll(cls, context):
+        return bool(utils.fetch_user_preferences("library_root"))
+
+    def draw(self, context):
+        draw.library_search(self.layout, context)
+        return
+
+
 if bpy.app.version >= (4, 5, 0):
     class GROUP_TOOLS_PT_active_group_panel_toggle(RefreshableBaseClass, Panel):
         bl_label = "Panel Toggle"
@@ -145,21 +272,71 @@ class GROUP_TOOLS_MT_active_interface_context_menu(Menu):
             layout.operator("group_edit_tools.active_interface_item_duplicate", icon='DUPLICATE')
             layout.operator("group_edit_tools.active_interface_item_swap_io_type", icon='ARROW_LEFTRIGHT')
             layout.menu("GROUP_TOOLS_MT_parent_to_panel", icon="DOWNARROW_HLT")
+            layout.operator_menu_enum("group_edit_tools.interface_sort", "sort_by", icon='SORTALPHA')
+            layout.operator("group_edit_tools.interface_remove_unused", icon='TRASH')
+            layout.operator("group_edit_tools.interface_sockets_edit", icon='PROPERTIES')
+            layout.operator("group_edit_tools.interface_items_rename", icon='OUTLINER_DATA_FONT')
+            layout.operator("group_edit_tools.interface_organize_by_prefix", icon='NEWFOLDER')
+            layout.operator("group_edit_tools.interface_panel_flatten", icon='FILE_PARENT')
+            layout.separator()
+            layout.operator("group_edit_tools.interface_items_copy", icon='COPYDOWN')
+            layout.operator("group_edit_tools.interface_items_paste", icon='PASTEDOWN')
+            layout.separator()
+            layout.operator("group_edit_tools.active_interface_item_move", text="Move to Top", icon='TRIA_UP_BAR').direction = 'TOP'
+            layout.operator("group_edit_tools.active_interface_item_move", text="Move to Bottom", icon='TRIA_DOWN_BAR').direction = 'BOTTOM'
             layout.separator()
             if active_item.item_type == 'SOCKET':
                 layout.operator("group_edit_tools.interface_item_make_panel_toggle", icon="NODE_SOCKET_BOOLEAN")
+                layout.operator("group_edit_tools.default_socket_type_set", icon="NODE_SOCKET_FLOAT")
             elif active_item.item_type == 'PANEL':
                 layout.operator("group_edit_tools.interface_item_unlink_panel_toggle", icon="NODE_SOCKET_BOOLEAN")
 
+    elif bpy.app.version >= (4, 4, 0):
+        def draw(self, _context):
+            layout = self.layout
+            layout.operator("group_edit_tools.active_interface_item_duplicate", icon='DUPLICATE')
+            layout.operator("group_edit_tools.active_interface_item_swap_io_type", icon='ARROW_LEFTRIGHT')
+            layout.menu("GROUP_TOOLS_MT_parent_to_panel", icon="DOWNARROW_HLT")
+            layout.operator_menu_enum("group_edit_tools.interface_sort", "sort_by", icon='SORTALPHA')
+            layout.operator("group_edit_tools.interface_remove_unused", icon='TRASH')
+            layout.operator("group_edit_tools.interface_sockets_edit", icon='PROPERTIES')
+            layout.operator("group_edit_tools.interface_items_rename", icon='OUTLINER_DATA_FONT')
+            layout.operator("group_edit_tools.interface_organize_by_prefix", icon='NEWFOLDER')
+            layout.operator("group_edit_tools.interface_panel_flatten", icon='FILE_PARENT')
+            layout.separator()
+            layout.operator("group_edit_tools.interface_items_copy", icon='COPYDOWN')
+            layout.operator("group_edit_tools.interface_items_paste", icon='PASTEDOWN')
+            layout.separator()
+            layout.operator("group_edit_tools.active_interface_item_move", text="Move to Top", icon='TRIA_UP_BAR').direction = 'TOP'
+            layout.operator("group_edit_tools.active_interface_item_move", text="Move to Bottom", icon='TRIA_DOWN_BAR').direction = 'BOTTOM'
+            layout.separator()
+            layout.operator("group_edit_tools.default_socket_type_set", icon="NODE_SOCKET_FLOAT")
+            return
+
     else:
         def draw(self, _context):
             layout = self.layout
             layout.operator("group_edit_tools.active_interface_item_duplicate", icon='DUPLICATE')
             layout.operator("group_edit_tools.active_interface_item_swap_io_type", icon='ARROW_LEFTRIGHT')
             layout.menu("GROUP_TOOLS_MT_parent_to_panel", icon="DOWNARROW_HLT")
+            layout.operator_menu_enum("group_edit_tools.interface_sort", "sort_by", icon='SORTALPHA')
+            layout.operator("group_edit_tools.interface_remove_unused", icon='TRASH')
+            layout.operator("group_edit_tools.interface_sockets_edit", icon='PROPERTIES')
+            layout.operator("group_edit_tools.interface_items_rename", icon='OUTLINER_DATA_FONT')
+            layout.operator("group_edit_tools.interface_organize_by_prefix", icon='NEWFOLDER')
+            layout.operator("group_edit_tools.interface_panel_flatten", icon='FILE_PARENT')
+            layout.separator()
+            layout.operator("group_edit_tools.interface_items_copy", icon='COPYDOWN')
+            layout.operator("group_edit_tools.interface_items_paste", icon='PASTEDOWN')
+            layout.separator()
+            layout.operator("group_edit_tools.default_socket_type_set", icon="NODE_SOCKET_FLOAT")
             return
     
 
+# Beyond this many panels, the menu only offers the search popup
+max_menu_panels = 30
+
+
 if bpy.app.version >= (4, 4, 0):
     class GROUP_TOOLS_MT_parent_to_panel(Menu):
         bl_label = "Parent to Panel"
@@ -169,28 +346,27 @@ if bpy.app.version >= (4, 4, 0):
             tree = context.group_edit_tree_to_edit
             active_item = context.group_edit_active_item
 
-            if active_item.item_type == "PANEL": 
-                for panel in utils.fetch_group_items(tree, item_type="PANEL", include_base_panel=True):
-                    if panel != active_item.parent:
-                        if panel != active_item and not utils.is_child_of(panel, active_item):
-                            yield panel
+            snapshot = interface_index.fetch_snapshot(tree, active_item)
+            active_entry = snapshot.entry(active_item)
 
-            else:
-                for panel in utils.fetch_group_items(tree, item_type="PANEL", include_base_panel=True):
-                    if panel != active_item.parent:
-                        yield panel
+            for panel in snapshot.valid_parents(active_entry):
+                yield panel.item
 
         @classmethod
         def poll(self, context):
-            return context.group_edit_active_item is not None and len(tuple(self.valid_panels(context))) > 0
+            return context.group_edit_active_item is not None and next(self.valid_panels(context), None) is not None
 
         def draw(self, context):
             layout = self.layout
 
-            # Don't let cache persist between menu draws
-            utils.is_child_of.cache_clear()
+            panels = tuple(itertools.islice(self.valid_panels(context), max_menu_panels + 1))
+            draw.panel_search(layout)
 
-            for panel in self.valid_panels(context):
+            if len(panels) > max_menu_panels:
+                return
+
+            layout.separator()
+            for panel in panels:
                 panel_name = panel.name if (panel.index != -1) else "(None)"
                 
                 props = layout.operator("group_edit_tools.parent_to_panel", text=panel_name)
@@ -213,12 +389,19 @@ else:
         @classmethod
         @utils.return_false_when(AttributeError)
         def poll(self, context):
-            return context.group_edit_active_item.item_type == 'SOCKET' and len(tuple(self.valid_panels(context))) > 0
+            return context.group_edit_active_item.item_type == 'SOCKET' and next(self.valid_panels(context), None) is not None
 
         def draw(self, context):
             layout = self.layout
 
-            for panel in self.valid_panels(context):
+            panels = tuple(itertools.islice(self.valid_panels(context), max_menu_panels + 1))
+            draw.panel_search(layout)
+
+            if len(panels) > max_menu_panels:
+                return
+
+            layout.separator()
+            for panel in panels:
                 panel_name = panel.name if (panel.index != -1) else "(None)"
                 
                 props = layout.operator("group_edit_tools.parent_to_panel", text=panel_name)
@@ -334,6 +517,9 @@ else:
 refreshable_classes = (
     GROUP_TOOLS_PT_PANEL,
     GROUP_TOOLS_PT_active_group_properties,
+    GROUP_TOOLS_PT_group_dependencies,
+    GROUP_TOOLS_PT_socket_usage,
+    GROUP_TOOLS_PT_library_search,
     *version_specific_classes
 )
 
@@ -353,6 +539,11 @@ else:
 
 
 def register():
+    bpy.utils.register_class(LibrarySearchProps)
+    bpy.types.WindowManager.group_edit_library_search = PointerProperty(type=LibrarySearchProps)
+
+    bpy.utils.register_class(GROUP_TOOLS_UL_socket_usage)
+
     for cls in classes:
         bpy.utils.register_class(cls)
 
@@ -361,5 +552,10 @@ def unregister():
     for cls in classes:
         bpy.utils.unregister_class(cls)
 
+    bpy.utils.unregister_class(GROUP_TOOLS_UL_socket_usage)
+
+    del bpy.types.WindowManager.group_edit_library_search
+    bpy.utils.unregister_class(LibrarySearchProps)
+
     for cls in refreshable_classes:
         cls.reset_bl_category()
\ No newline at end of file
@@ -1,6 +1,8 @@
 import bpy
 
-from .. import utils
+import os
+
+from .. import group_index, library_index, selection, usage_index, utils
 
 
 field_socket_types = {
@@ -20,6 +22,17 @@ else:
         layout.operator_menu_enum("group_edit_tools.interface_item_new", "item_type", icon='ADD', text="")
 
 
+def panel_search(layout, text="Search...", use_selection=False):
+    operator_context = layout.operator_context
+    layout.operator_context = 'INVOKE_DEFAULT'
+
+    props = layout.operator("group_edit_tools.parent_to_panel", text=text, icon='VIEWZOOM')
+    props.use_search = True
+    props.use_selection = use_selection
+
+    layout.operator_context = operator_context
+
+
 def side_buttons(tree, layout):
     col = layout.column(align=True)
     col.enabled = utils.is_tree_editable(tree)
@@ -37,6 +50,37 @@ def side_buttons(tree, layout):
     col.operator("group_edit_tools.active_interface_item_move", icon='TRIA_DOWN', text="").direction = "DOWN"
     col.separator()
 
+    is_selected = selection.interface_selection.is_selected(tree, tree.interface.active)
+    select_icon = 'RESTRICT_SELECT_OFF' if is_selected else 'RESTRICT_SELECT_ON'
+    col.operator("group_edit_tools.interface_item_select", icon=select_icon, text="", depress=is_selected)
+
+
+def selection_buttons(tree, layout):
+    selected_count = selection.interface_selection.count(tree)
+    if selected_count == 0:
+        return
+
+    row = layout.row(align=True)
+    row.enabled = utils.is_tree_editable(tree)
+
+    row.context_pointer_set("group_edit_tree_to_edit", tree)
+    row.context_pointer_set("group_edit_active_item", tree.interface.active)
+
+    row.label(text=f"{utils.plural(selected_count, 'Item')} Selected")
+
+    if bpy.app.version >= (4, 4, 0):
+        for direction, icon in (('UP', 'TRIA_UP'), ('DOWN', 'TRIA_DOWN')):
+            props = row.operator("group_edit_tools.active_interface_item_move", icon=icon, text="")
+            props.direction = direction
+            props.use_selection = True
+
+    panel_search(row, text="", use_selection=True)
+    row.operator("group_edit_tools.interface_items_copy", icon='COPYDOWN', text="").use_selection = True
+    row.operator("group_edit_tools.active_interface_item_duplicate", icon='DUPLICATE', text="").use_selection = True
+    row.operator("group_edit_tools.active_interface_item_swap_io_type", icon='ARROW_LEFTRIGHT', text="").use_selection = True
+    row.operator("group_edit_tools.interface_item_remove", icon='REMOVE', text="").use_selection = True
+    row.operator("group_edit_tools.interface_selection_clear", icon='X', text="")
+
 
 def group_sockets(tree, layout, context):
     layout.use_property_split = True
@@ -47,6 +91,7 @@ def group_sockets(tree, layout, context):
     row.template_node_tree_interface(tree.interface)
 
     side_buttons(tree, layout=row)
+    selection_buttons(tree, layout)
 
     active_item = tree.interface.active
     if active_item is None:
@@ -63,6 +108,8 @@ def group_sockets(tree, layout, context):
                 layout.prop(active_item, "default_attribute_name")
         active_item.draw(context, layout)
 
+        socket_usage(tree, active_item, layout)
+
     if active_item.item_type == 'PANEL':
         layout.prop(active_item, "description")
         layout.prop(active_item, "default_closed", text="Closed by Default")
@@ -87,6 +134,7 @@ if bpy.app.version >= (4, 3, 0):
         row = col.row(align=True)
         row.prop(tree, "default_group_node_width", text="Default Width")
         row.operator(default_width_operator, text="", icon='NODE')
+        row.operator("group_edit_tools.group_instances_reset_width", text="", icon='NODETREE').group_name = tree.name
 
         if is_active_group:
             row = col.row(align=True)
@@ -168,6 +216,31 @@ else:
         group_properties(tree, layout, context)
 
 
+def socket_usage(tree, item, layout):
+    usage = usage_index.fetch_usage(tree)
+    item_usage = usage.socket_usage(item)
+
+    if item_usage is None or usage.instance_count == 0:
+        return
+
+    row = layout.row(align=True)
+    row.alignment = 'RIGHT'
+    row.label(text=f"Linked: {item_usage.linked}", icon='LINKED')
+    if item.in_out == 'INPUT':
+        row.label(text=f"Overridden: {item_usage.overridden}", icon='MODIFIER')
+    row.label(text=f"Unused: {item_usage.untouched}", icon='BLANK1' if item_usage.is_used else 'ERROR')
+
+
+def usage_list(tree, layout):
+    usage = usage_index.fetch_usage(tree)
+    layout.label(text=f"Used by {utils.plural(usage.instance_count, 'instance')}")
+    layout.template_list("GROUP_TOOLS_UL_socket_usage", "", tree.interface, "items_tree", tree.interface, "active_index", rows=6)
+
+    row = layout.row()
+    row.context_pointer_set("group_edit_tree_to_edit", tree)
+    row.operator("group_edit_tools.interface_remove_unused", icon='TRASH')
+
+
 def copy_properties(layout):
     layout.use_property_split = True
     layout.use_property_decorate = False
@@ -177,4 +250,105 @@ def copy_properties(layout):
     for prop_name in copy_props.properties():
         col.prop(copy_props, prop_name)
 
-    layout.operator("node.group_edit_copy_from_active")
\ No newline at end of file
+    row = layout.row(align=True)
+    row.operator("node.group_edit_copy_from_active")
+    row.operator("node.group_edit_copy_to_matching_groups", text="", icon='FILE_BLEND')
+
+    layout.operator("node.group_edit_sync_interface_from_active", icon='UV_SYNC_SELECT')
+    layout.operator("node.group_edit_merge_duplicate_groups", icon='AUTOMERGE_OFF')
+
+def library_search(layout, context):
+    prefs = utils.fetch_user_preferences()
+    search_props = context.window_manager.group_edit_library_search
+
+    row = layout.row(align=True)
+    row.prop(search_props, "query", text="", icon='VIEWZOOM')
+    row.prop(search_props, "current_type_only", text="", icon='NODETREE')
+    row.operator("group_edit_tools.library_index_update", text="", icon='FILE_REFRESH')
+
+    tree = context.space_data.edit_tree
+    tree_type = tree.bl_idname if (search_props.current_type_only and tree is not None) else None
+    results = library_index.cached_search(prefs.library_database_path(create=False), search_props.query, tree_type)
+
+    if results is None:
+        layout.label(text="The library hasn't been indexed yet.", icon='INFO')
+        return
+
+    if not results:
+        layout.label(text="No matching groups.")
+        return
+
+    col = layout.column(align=True)
+    for name, _tree_type, filepath, matching_sockets in results:
+        box = col.box()
+        row = box.row(align=True)
+        row.label(text=name, icon='NODETREE')
+
+        props = row.operator("group_edit_tools.library_group_import", text="", icon='APPEND_BLEND')
+        props.filepath, props.group_name, props.link = filepath, name, False
+        props = row.operator("group_edit_tools.library_group_import", text="", icon='LINK_BLEND')
+        props.filepath, props.group_name, props.link = filepath, name, True
+
+        sub = box.column(align=True)
+        sub.scale_y = 0.8
+        sub.label(text=os.path.basename(filepath), icon='FILE_BLEND')
+        if matching_sockets:
+            sub.label(text=matching_sockets, icon='NODE_SOCKET_FLOAT')
+
+
+owner_icons = {
+    "node_groups": 'NODETREE',
+    "materials": 'MATERIAL',
+    "worlds": 'WORLD',
+    "lights": 'LIGHT',
+    "scenes": 'SCENE_DATA',
+    "linestyles": 'LINE_DATA',
+    "textures": 'TEXTURE',
+}
+
+# Long lists of dependencies are cut off, so that drawing stays fast on large files
+max_listed_groups = 20
+
+
+def listed_names(layout, label, names):
+    col = layout.column(align=True)
+    col.label(text=f"{label} ({len(names)})")
+
+    if not names:
+        col.label(text="None", icon='BLANK1')
+        return
+
+    for icon, name in names[:max_listed_groups]:
+        col.label(text=name, icon=icon)
+
+    if len(names) > max_listed_groups:
+        col.label(text=f"... and {len(names) - max_listed_groups} more", icon='BLANK1')
+
+
+def group_dependencies(tree, layout):
+    graph = group_index.dependency_graph
+
+    if graph.is_cyclic(tree):
+        layout.label(text="Group is nested inside of itself", icon='ERROR')
+
+    users = [(owner_icons.get(data_attr, 'NODETREE'), name) for data_attr, name in group_index.instance_index.users_of(tree)]
+    nested_users = [('NODETREE', g.name) for g in graph.related_groups(tree, 'ANCESTORS')]
+    dependencies = [('NODETREE', g.name) for g in graph.related_groups(tree, 'DESCENDANTS', recursive=False)]
+    nested_dependencies = [('NODETREE', g.name) for g in graph.related_groups(tree, 'DESCENDANTS')]
+
+    listed_names(layout, "Used By", sorted(users, key=lambda u: u[1].lower()))
+    listed_names(layout, "Used By (All Levels)", nested_users)
+    listed_names(layout, "Uses", dependencies)
+    listed_names(layout, "Uses (All Levels)", nested_dependencies)
+
+    col = layout.column(align=True)
+    row = col.row(align=True)
+    row.operator("node.group_edit_copy_to_nested_groups", text="Copy to Nested", icon='OUTLINER').direction = 'DESCENDANTS'
+    row.operator("node.group_edit_copy_to_nested_groups", text="Copy to Users", icon='LINKED').direction = 'ANCESTORS'
+
+    if bpy.app.version >= (4, 3, 0):
+        row = col.row(align=True)
+        props = row.operator("group_edit_tools.nested_group_instances_reset_width", text="Reset Nested Widths", icon='NODE')
+        props.direction, props.group_name = 'DESCENDANTS', tree.name
+        props = row.operator("group_edit_tools.nested_group_instances_reset_width", text="Reset User Widths", icon='NODE')
+        props.direction, props.group_name = 'ANCESTORS', tree.name
@@ -0,0 +1,186 @@
+import bpy
+
+from . import caches, group_index, sync, utils
+
+
+class SocketUsage:
+    __slots__ = ("linked", "overridden", "untouched")
+
+    def __init__(self):
+        """
+        How the instances of a group use one of its sockets. Inputs count as overridden when
+        their value differs from the default of the interface socket, outputs are never overridden.
+        """
+
+        self.linked = 0
+        self.overridden = 0
+        self.untouched = 0
+
+    @property
+    def is_used(self):
+        return (self.linked + self.overridden) > 0
+
+
+class GroupUsage:
+    def __init__(self, group):
+        """
+        Counts of how every socket of the group is used by its instances across the file.
+        The links of each tree holding instances are only read once, no matter how many instances it holds.
+        """
+
+        self.instance_count = 0
+        self.sockets = {}
+
+        interface_defaults = {}
+        for item in group.interface.items_tree:
+            if item.item_type != 'SOCKET':
+                continue
+
+            self.sockets[item.identifier] = SocketUsage()
+            if item.in_out == 'INPUT' and hasattr(item, "default_value"):
+                interface_defaults[item.identifier] = item.default_value
+
+        nodes_by_owner = {}
+        for node in group_index.instance_index.instances_of(group):
+            owner = node.id_data
+            nodes_by_owner.setdefault(owner.as_pointer(), (owner, []))[1].append(node)
+
+        for owner, nodes in nodes_by_owner.values():
+            self.count_instances(owner, nodes, interface_defaults)
+
+    def count_instances(self, owner, nodes, interface_defaults):
+        names = {node.name for node in nodes}
+        linked = set()
+
+        for link in owner.links:
+            to_name = link.to_node.name
+            if to_name in names:
+                linked.add((to_name, link.to_socket.identifier))
+
+            from_name = link.from_node.name
+            if from_name in names:
+                linked.add((from_name, link.from_socket.identifier))
+
+        for node in nodes:
+            self.instance_count += 1
+
+            for socket in (*node.inputs, *node.outputs):
+                usage = self.sockets.get(socket.identifier)
+
+                # Virtual sockets for adding new items aren't part of the interface
+                if usage is None:
+                    continue
+
+                if (node.name, socket.identifier) in linked:
+                    usage.linked += 1
+                elif self.is_overridden(socket, interface_defaults):
+                    usage.overridden += 1
+                else:
+                    usage.untouched += 1
+
+    @staticmethod
+    def is_overridden(socket, interface_defaults):
+        if socket.is_output or socket.identifier not in interface_defaults:
+            return False
+
+        return not sync.values_equal(getattr(socket, "default_value", None), interface_defaults[socket.identifier])
+
+    def socket_usage(self, item):
+        return self.sockets.get(getattr(item, "identifier", None))
+
+
+def owner_stamp(group):
+    # Links and values on instances only change through their own tree,
+    # so the usage stays valid as long as none of those trees changed
+    stamps = []
+
+    for key in group_index.instance_index.users_of(group):
+        owner = group_index.resolve_owner(key)
+        stamps.append(None if owner is None else (caches.interface_generation(owner), len(owner.links), len(owner.nodes)))
+
+    return (group_index.instance_index.generation, tuple(stamps))
+
+
+usage_cache = caches.TreeCache(maxsize=16)
+
+
+def fetch_usage(group):
+    """
+    Returns the cached usage of the sockets of the group, counting them again if any tree using the group changed
+    """
+
+    stamp = owner_stamp(group)
+    entry = usage_cache.get(group)
+
+    if entry is None or entry[0] != stamp:
+        entry = usage_cache.set(group, (stamp, GroupUsage(group)))
+
+    return entry[1]
+
+
+def internally_linked(group):
+    """
+    Returns the identifiers of interface sockets connected to a Group Input or Group Output node inside of the group
+    """
+
+    linked = set()
+
+    for link in group.links:
+        if link.from_node.bl_idname == "NodeGroupInput":
+            linked.add(link.from_socket.identifier)
+
+        if link.to_node.bl_idname == "NodeGroupOutput":
+            linked.add(link.to_socket.identifier)
+
+    return linked
+
+
+def has_external_users(group):
+    # Modifiers and tools expose the sockets of a group without any group node
+    if getattr(group, "is_tool", False):
+        return True
+
+    for obj in bpy.data.objects:
+        for modifier in obj.modifiers:
+            if modifier.type == 'NODES' and modifier.node_group == group:
+                return True
+
+    return False
+
+
+def unused_sockets(group):
+    """
+    Returns the sockets that aren't connected inside of the group, and that no instance links or overrides.
+    Panel toggles are only included once nothing else is left in their panel.
+    Groups used by modifiers or as tools can't be checked, and return None instead.
+    """
+
+    if has_external_users(group):
+        return None
+
+    usage = fetch_usage(group)
+    linked = internally_linked(group)
+
+    def is_unused(item):
+        item_usage = usage.socket_usage(item)
+        return item.identifier not in linked and (item_usage is None or not item_usage.is_used)
+
+    unused = {}
+    toggles = []
+
+    for item in group.interface.items_tree:
+        if item.item_type == 'PANEL':
+            toggle = utils.get_panel_toggle(item)
+            if toggle is not None:
+                toggles.append((item, toggle))
+
+        elif not utils.is_panel_toggle(item) and is_unused(item):
+            unused[item.as_pointer()] = item
+
+    for panel, toggle in toggles:
+        content = (i for i in panel.interface_items if i.as_pointer() != toggle.as_pointer())
+
+        if is_unused(toggle) and all(i.as_pointer() in unused for i in content):
+            unused[toggle.as_pointer()] = toggle
+
+    return list(unused.values())
@@ -1,6 +1,8 @@
 import bpy
 import functools
 
+from . import caches
+
 
 def rsetattr(obj, attr, val):
     pre, _, post = attr.rpartition('.')
@@ -13,6 +15,13 @@ def rgetattr(obj, attr, *args):
     return functools.reduce(_getattr, [obj] + attr.split('.'))
 
 
+def plural(count, singular, plural=None):
+    if plural is None:
+        plural = f"{singular}s"
+
+    return f"{count} {singular if count == 1 else plural}"
+
+
 def fetch_user_preferences(attr_id=None):
     prefs = bpy.context.preferences.addons[__package__].preferences
 
@@ -33,16 +42,6 @@ def fetch_tree_of_active_node(context=None):
 
     return tree
 
-if bpy.app.version >= (4, 4, 0):
-    @functools.cache
-    def is_child_of(child, parent):
-        if child.parent is None:
-            return False
-        elif child.parent == parent:
-            return True
-        else:
-            return is_child_of(child.parent, parent)
-        
 
 def compare_attributes(item, *_, **keywords):
     for key, value in keywords.items():
@@ -107,10 +106,31 @@ def get_panel_toggle(panel):
         return None
 
 
+root_panels = caches.TreeCache()
+
+
+def find_base_panel(group):
+    # The root panel is not directly exposed by the API,
+    # but every top-level item has it as its parent
+    items = group.interface.items_tree
+    if len(items) == 0:
+        return None
+
+    panel = items[0].parent
+    while panel.parent is not None:
+        panel = panel.parent
+
+    return panel
+
+
 def fetch_base_panel(group):
-    new_socket = group.interface.new_socket(name="DUMMY_SOCKET")
-    panel =  new_socket.parent
-    group.interface.remove(new_socket)
+    panel = root_panels.get(group)
+
+    if panel is None:
+        panel = find_base_panel(group)
+        if panel is not None:
+            root_panels.set(group, panel)
+
     return panel
 
 
@@ -119,7 +139,9 @@ def fetch_group_items(group, item_type=None, include_base_panel=False):
         return group.interface.items_tree
     else:
         if include_base_panel:
-            yield fetch_base_panel(group)
+            base_panel = fetch_base_panel(group)
+            if base_panel is not None:
+                yield base_panel
 
         panels = (i for i in group.interface.items_tree if i.item_type == item_type)
         for item in panels: